@@ -0,0 +1,202 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from habit_tracker_logic import HabitTrackerLogic, get_clean_time
+from habit_log_parser import iter_day_records
+from habit_time_parser import clean_time, clean_times
+from habit_scoring import SCORER, SCORING_RULES, Scorer, rescore_log
+
+# --- Benchmark Suite ---
+# Generates synthetic habit_log.txt files in the exact format the process_*
+# methods write, times the hot paths on them and prints the results as JSON
+# (ops/sec and peak traced memory) so regressions show up as numbers.
+#
+#     python habit_benchmark.py                      # 1k, 100k and 1M days
+#     python habit_benchmark.py --sizes 1000 100000 --output bench.json
+
+TIME_INPUTS = ("2311", "23", "23.30", "7:30", "07:05", "7", "0", "25", "abc", "")
+START_DATE = datetime.date(1900, 1, 1)
+
+
+def legacy_get_clean_time(user_input):
+    """The strptime-based get_clean_time this project used before habit_time_parser.py, kept for comparison."""
+    user_input = user_input.strip()
+    if len(user_input) == 4 and user_input.isdigit():
+        user_input = user_input[:2] + ":" + user_input[2:]
+    for fmt in ("%H:%M", "%H", "%H.%M"):
+        try:
+            parsed = datetime.datetime.strptime(user_input, fmt)
+            return parsed.strftime("%H:%M")
+        except ValueError:
+            continue
+    return None
+
+
+def fill_random_day(logic, day, rng):
+    """Runs one random day through the logic's process_* methods, like the GUI would."""
+    logic.reset_for_new_day(day)
+    logic.process_sleep_data(f"{rng.choice((21, 22, 23, 0, 1)):02d}:{rng.randrange(0, 60, 5):02d}",
+                             f"{rng.randint(5, 9):02d}:{rng.randrange(0, 60, 5):02d}",
+                             rng.choice(("Good", "Restless", "ok", "Woke up twice")))
+    logic.process_morning_walk(rng.randint(0, 1))
+    logic.process_breakfast_data(rng.randint(0, 1))
+    logic.process_pomodoro_data(rng.randint(0, 12))
+    junk = rng.random() < 0.3
+    logic.process_junk_food_data(int(junk), rng.choice(("chips", "chocolate", "pizza")) if junk else None)
+    logic.process_daily_steps_data(rng.randint(0, 12000))
+    logic.get_final_points()
+
+
+def generate_synthetic_log(path, days, start=START_DATE, seed=0):
+    """Writes a habit log of `days` consecutive random days starting at `start`."""
+    rng = random.Random(seed)
+    logic = HabitTrackerLogic(log_dir=os.path.dirname(path)) # Only renders lines; nothing is saved there
+    with open(path, "w", encoding="utf-8") as log:
+        chunk = []
+        for i in range(days):
+            fill_random_day(logic, start + datetime.timedelta(days=i), rng)
+            chunk.append(f"\n=== {logic.today} ===\n")
+            chunk.extend(line + "\n" for line in logic.get_log_lines())
+            if len(chunk) >= 80000:
+                log.writelines(chunk)
+                chunk = []
+        log.writelines(chunk)
+
+
+def measure(name, days, func, ops):
+    """
+    Times func() (which performs `ops` operations), then runs it once more under
+    tracemalloc for the peak memory. Returns one result dict.
+    """
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"name": name, "days": days, "ops": ops, "seconds": round(seconds, 6),
+            "ops_per_sec": round(ops / seconds, 1) if seconds else None, "peak_memory_bytes": peak}
+
+
+def bench_log_size(work_dir, days, writes):
+    """Runs every benchmark that depends on the size of the log."""
+    results = []
+    log_dir = os.path.join(work_dir, str(days))
+    os.makedirs(log_dir)
+    logic = HabitTrackerLogic(log_dir=log_dir)
+    generate_synthetic_log(logic.log_path, days)
+    rng = random.Random(1)
+
+    results.append(measure("index_build", days, logic.log_store.rebuild_index, 1))
+    results.append(measure("parse_log", days, lambda: sum(1 for _ in iter_day_records(logic.log_path)), days))
+    def rebuild_stats():
+        logic.stats = None
+        if os.path.exists(logic.stats_path):
+            os.remove(logic.stats_path)
+        logic.get_stats()
+    results.append(measure("stats_rebuild", days, rebuild_stats, 1))
+    # Alternates between the real rules and one with a different steps rule, so every run rewrites the points lines
+    other_rules = [rule for rule in SCORING_RULES if rule["field"] != "daily_steps"] + [{"field": "daily_steps", "tiers": ((6000, 3),)}]
+    scorers = [Scorer(other_rules), SCORER]
+    def rescore():
+        rescore_log(logic.log_store, scorers[0])
+        scorers.reverse()
+    results.append(measure("rescore_history", days, rescore, days))
+
+    # The first save of a session loads (or rebuilds) the sidecars; that one-off cost
+    # is measured by stats_rebuild above, so they're loaded before the writes are timed
+    logic.get_stats()
+    logic.get_search_index()
+    try:
+        logic.get_history() # Needed when a past day is saved
+    except ImportError:
+        pass # No NumPy, so there's no summary cache
+
+    last_day = START_DATE + datetime.timedelta(days=days - 1)
+    new_days = iter(last_day + datetime.timedelta(days=i) for i in range(1, 2 * writes + 1))
+    cases = (
+        ("write_today_new", lambda: next(new_days)),
+        ("write_today_middle", lambda: START_DATE + datetime.timedelta(days=days // 2)),
+        ("write_today_end", lambda: last_day + datetime.timedelta(days=2 * writes)),
+    )
+    for name, pick_day in cases:
+        def run_writes(pick_day=pick_day):
+            for _ in range(writes):
+                fill_random_day(logic, pick_day(), rng)
+                if not logic.write_final_log_to_file():
+                    raise RuntimeError("write_final_log_to_file failed")
+        results.append(measure(name, days, run_writes, writes))
+    shutil.rmtree(log_dir)
+    return results
+
+
+def bench_size_independent(work_dir, repeat):
+    """Benchmarks that don't depend on the log size."""
+    results = []
+
+    def parse_times(parse):
+        def run():
+            for _ in range(repeat):
+                for text in TIME_INPUTS:
+                    parse(text)
+        return run
+    ops = repeat * len(TIME_INPUTS)
+    legacy = measure("get_clean_time_legacy_strptime", 0, parse_times(legacy_get_clean_time), ops)
+    current = measure("get_clean_time", 0, parse_times(get_clean_time), ops)
+    current["speedup_vs_legacy"] = round(current["ops_per_sec"] / legacy["ops_per_sec"], 1)
+    results.extend([legacy, current])
+    for text in TIME_INPUTS:
+        results.append(measure(f"get_clean_time[{text!r}]", 0,
+                               lambda text=text: [get_clean_time(text) for _ in range(repeat)], repeat))
+
+    # Uncached parsing shows the regex fast path on its own, without the LRU cache
+    uncached = measure("get_clean_time_uncached", 0, parse_times(clean_time.__wrapped__), ops)
+    uncached["speedup_vs_legacy"] = round(uncached["ops_per_sec"] / legacy["ops_per_sec"], 1)
+    results.append(uncached)
+    column = [TIME_INPUTS[i % len(TIME_INPUTS)] for i in range(ops)]
+    results.append(measure("clean_times_batch", 0, lambda: clean_times(column), ops))
+
+    logic = HabitTrackerLogic(log_dir=work_dir)
+    fill_random_day(logic, datetime.date.today(), random.Random(0))
+    def final_points():
+        for _ in range(repeat):
+            logic.get_final_points()
+    results.append(measure("get_final_points", 0, final_points, repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the habit tracker's hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000],
+                        help="Synthetic log sizes in days")
+    parser.add_argument("--writes", type=int, default=20, help="write_final_log_to_file calls per case")
+    parser.add_argument("--repeat", type=int, default=20000, help="Iterations for the size-independent benchmarks")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="habit_bench_")
+    try:
+        report = {"python": platform.python_version(), "platform": platform.platform(),
+                  "benchmarks": bench_size_independent(work_dir, args.repeat)}
+        for days in args.sizes:
+            report["benchmarks"].extend(bench_log_size(work_dir, days, args.writes))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import datetime
+import json
+import mmap
+import os
+import struct
+import sys
+from habit_log_parser import DayRecord, format_day_lines, iter_day_records
+from habit_log_store import LogStore, discard_summary_cache, format_day_block
+from habit_time_parser import time_to_minutes
+
+# --- Binary Day Log ---
+# A compact companion to habit_log.txt: every day is one fixed-size record,
+# sorted by date, so record N sits at byte N * RECORD.size. Reading a range of
+# days is a slice of a memory map (numpy.frombuffer gives every column without
+# copying), and finding a day is a binary search over the date column.
+#
+# Record layout (little-endian, 28 bytes):
+#     uint32 date ordinal    int32 daily steps
+#     int16 bed minutes      int16 wake minutes     int16 pomodoros
+#     uint8 flags            int8 points            uint8 max points    3 bytes padding
+#     uint32 sleep quality   uint32 what junk food  (ids in the string table)
+#
+# Missing numbers are -1 (max points 0), a missing string is id 0. The flags
+# hold each yes/no answer and whether it was answered at all. The free-text
+# answers repeat a lot ("Good", "chips"), so they are interned in a string table
+# stored next to the records (habit_log.bin.strings.json).
+#
+#     python habit_binary_log.py to-binary habit_log.txt habit_log.bin
+#     python habit_binary_log.py to-text habit_log.bin habit_log_copy.txt
+
+RECORD = struct.Struct("<IihhhBbB3xII")
+MISSING = -1
+
+# flag bit of a "yes" answer, flag bit of "this answer is in the log"
+FLAG_BITS = {"morning_walk": (1, 2), "healthy_breakfast": (4, 8), "junk_food": (16, 32)}
+
+
+def minutes_to_time(minutes):
+    return None if minutes == MISSING else f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def record_dtype():
+    """The NumPy structured dtype matching RECORD, for zero-copy column access."""
+    import numpy as np # Only needed for column access
+    return np.dtype({
+        "names": ["date_ordinal", "daily_steps", "bed_minutes", "wake_minutes", "pomodoro_done",
+                  "flags", "points", "max_points", "sleep_quality", "what_junk_food"],
+        "formats": ["<u4", "<i4", "<i2", "<i2", "<i2", "u1", "i1", "u1", "<u4", "<u4"],
+        "offsets": [0, 4, 8, 10, 12, 14, 15, 16, 20, 24],
+        "itemsize": RECORD.size,
+    })
+
+
+class StringTable:
+    """Interned strings: each distinct text is stored once and referred to by its id (0 = None)."""
+
+    def __init__(self, strings=None):
+        self.strings = strings or [None]
+        self.ids = {text: i for i, text in enumerate(self.strings) if i}
+
+    def intern(self, text):
+        if text is None:
+            return 0
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.strings, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+def pack_record(record, strings):
+    """Returns the RECORD bytes of a DayRecord, interning its text answers in `strings`."""
+    flags = 0
+    for field, (yes_bit, known_bit) in FLAG_BITS.items():
+        value = getattr(record, field)
+        if value is not None:
+            flags |= known_bit | (yes_bit if value == 1 else 0)
+    def number(value):
+        return MISSING if value is None else value
+    try:
+        return RECORD.pack(record.day.toordinal(), number(record.daily_steps),
+                           time_to_minutes(record.bed_time), time_to_minutes(record.wake_time),
+                           number(record.pomodoro_done), flags, number(record.points), record.max_points or 0,
+                           strings.intern(record.sleep_quality), strings.intern(record.what_junk_food))
+    except struct.error as e:
+        raise ValueError(f"{record.day}: a value doesn't fit the binary format ({e})")
+
+
+def unpack_record(data, strings):
+    """Builds a DayRecord from RECORD bytes."""
+    (ordinal, steps, bed, wake, pomodoros, flags, points, max_points,
+     sleep_quality, what_junk_food) = RECORD.unpack(data)
+    answers = {}
+    for field, (yes_bit, known_bit) in FLAG_BITS.items():
+        answers[field] = (1 if flags & yes_bit else 0) if flags & known_bit else None
+    def number(value):
+        return None if value == MISSING else value
+    return DayRecord(datetime.date.fromordinal(ordinal), minutes_to_time(bed), minutes_to_time(wake),
+                     strings.strings[sleep_quality], answers["morning_walk"], answers["healthy_breakfast"],
+                     number(pomodoros), answers["junk_food"], strings.strings[what_junk_food],
+                     number(steps), number(points), max_points or None)
+
+
+class BinaryDayLog:
+    """Reads and writes the fixed-size record file and its string table."""
+
+    def __init__(self, path):
+        self.path = path
+        self.strings_path = path + ".strings.json"
+        self.strings = StringTable.load(self.strings_path)
+        self.log_map = None
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self.path) // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def _close_map(self):
+        if self.log_map is not None:
+            self.log_map.close()
+            self.log_map = None
+
+    def _mapped(self):
+        """Read-only memory map of the records, or None if there are none."""
+        size = len(self) * RECORD.size
+        if self.log_map is not None and len(self.log_map) != size:
+            self._close_map()
+        if self.log_map is None and size:
+            with open(self.path, "rb") as f:
+                self.log_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.log_map
+
+    def columns(self, start=0, stop=None):
+        """
+        Returns records start..stop as a NumPy structured array that shares memory with
+        the file (see record_dtype for the column names). Nothing is copied or parsed.
+        """
+        import numpy as np
+        data = self._mapped()
+        if data is None:
+            return np.zeros(0, dtype=record_dtype())
+        stop = len(self) if stop is None else min(stop, len(self))
+        return np.frombuffer(data, dtype=record_dtype(), count=max(stop - start, 0), offset=start * RECORD.size)
+
+    def record(self, n):
+        """The DayRecord stored at position n."""
+        return unpack_record(memoryview(self._mapped())[n * RECORD.size:(n + 1) * RECORD.size], self.strings)
+
+    def _ordinal(self, n):
+        return struct.unpack_from("<I", self._mapped(), n * RECORD.size)[0]
+
+    def find(self, day):
+        """Position of the first record on or after `day` (binary search over the sorted records)."""
+        ordinal = day.toordinal()
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ordinal(middle) < ordinal:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get_day(self, day):
+        """Returns the DayRecord of one day, or None if it isn't stored."""
+        n = self.find(day)
+        return self.record(n) if n < len(self) and self._ordinal(n) == day.toordinal() else None
+
+    def get_range(self, start, end):
+        """Returns the DayRecords from `start` to `end` (inclusive), sorted by date."""
+        first = self.find(start)
+        last = self.find(end + datetime.timedelta(days=1))
+        return [self.record(n) for n in range(first, last)]
+
+    def __iter__(self):
+        return (self.record(n) for n in range(len(self)))
+
+    def write(self, records):
+        """
+        Replaces the file with `records` (any order). They are packed as they come in,
+        then sorted by date in one step; a day given twice keeps its first record, like LogStore.
+        """
+        import numpy as np
+        strings = StringTable()
+        packed = bytearray()
+        for record in records:
+            packed += pack_record(record, strings)
+        table = np.frombuffer(bytes(packed), dtype=record_dtype())
+        _, first = np.unique(table["date_ordinal"], return_index=True) # Sorted dates, first occurrence of each
+        self._close_map()
+        temp_path = self.path + ".tmp"
+        table[first].tofile(temp_path)
+        strings.save(self.strings_path)
+        os.replace(temp_path, self.path)
+        self.strings = strings
+
+    def put(self, record):
+        """
+        Saves one day. An existing day is overwritten in place and a day after the
+        last one is appended, both without touching any other record. A day that
+        belongs in the middle (back-dated) reads the whole file and rewrites it with
+        the record spliced in, so it costs O(days) instead of one record.
+        """
+        string_count = len(self.strings.strings)
+        data = pack_record(record, self.strings)
+        n = self.find(record.day)
+        count = len(self)
+        back_dated = n < count and self._ordinal(n) != record.day.toordinal()
+        if len(self.strings.strings) != string_count:
+            self.strings.save(self.strings_path) # Only when the day used a text not seen before
+        self._close_map()
+        if back_dated:
+            # The records after it move up one place, copied as they are
+            with open(self.path, "rb") as f:
+                packed = f.read()
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(packed[:n * RECORD.size])
+                f.write(data)
+                f.write(packed[n * RECORD.size:])
+            os.replace(temp_path, self.path)
+            return
+        with open(self.path, "r+b" if count else "wb") as f:
+            f.seek(n * RECORD.size)
+            f.write(data)
+
+    def history(self):
+        """Returns a habit_history.HabitHistory straight from the columns, without parsing any text."""
+        import numpy as np
+        from habit_history import HabitHistory
+        table = self.columns()
+        columns = {name: table[name].astype(np.int64) for name in
+                   ("date_ordinal", "bed_minutes", "wake_minutes", "pomodoro_done", "daily_steps", "points")}
+        for field, (yes_bit, known_bit) in FLAG_BITS.items():
+            flags = table["flags"]
+            columns[field] = np.where(flags & known_bit, (flags & yes_bit) > 0, MISSING).astype(np.int64)
+        return HabitHistory.from_columns(columns)
+
+
+def text_to_binary(log_path, binary_path):
+    """Converts a text log to the binary format. Returns the number of days written."""
+    binary_log = BinaryDayLog(binary_path)
+    binary_log.write(iter_day_records(log_path))
+    return len(binary_log)
+
+
+def binary_to_text(binary_path, log_path, chunk_days=8192):
+    """
+    Writes the days of a binary log to a text log (days already there are replaced). Returns the count.
+    A new text log is written in one pass; an existing one is merged with chunk_days days at a time.
+    """
+    binary_log = BinaryDayLog(binary_path)
+    store = LogStore(log_path)
+    if not os.path.exists(log_path):
+        temp_path = log_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            for record in binary_log:
+                f.write(format_day_block(record.day, format_day_lines(record)))
+        os.replace(temp_path, log_path)
+        store.rebuild_index()
+        discard_summary_cache(log_path) # A cache left from a log deleted earlier
+        return len(binary_log)
+    for start in range(0, len(binary_log), chunk_days):
+        records = [binary_log.record(n) for n in range(start, min(start + chunk_days, len(binary_log)))]
+        store.write_days({record.day: format_day_lines(record) for record in records})
+    discard_summary_cache(log_path) # Older days may have been replaced
+    return len(binary_log)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert between the text habit log and the binary day-record format.")
+    parser.add_argument("direction", choices=("to-binary", "to-text"))
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args()
+    try:
+        if args.direction == "to-binary":
+            count = text_to_binary(args.source, args.target)
+        else:
+            count = binary_to_text(args.source, args.target)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Conversion failed: {e}")
+    print(f"Converted {count} days to {args.target}.")
+
+
+if __name__ == "__main__":
+    main()
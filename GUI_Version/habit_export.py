@@ -0,0 +1,238 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from habit_log_parser import DayRecord, iter_day_rows
+from habit_tracker_logic import BACKENDS, HabitTrackerLogic, open_log_store
+
+# --- Streaming Export ---
+# Writes every logged day as one row to CSV, JSON Lines or a columnar file
+# (Parquet when pyarrow is installed, otherwise a NumPy .npz archive). Days are
+# read and written CHUNK_DAYS at a time, so memory stays bounded however long
+# the history is; with the text backend the rows come straight from the fast
+# parser without building a DayRecord per day.
+#
+# The columns are the DayRecord fields, with "date" first: the same names
+# habit_import.py reads, so an exported CSV or JSON Lines file can be imported again.
+#
+#     python habit_export.py habit_export.csv
+#     python habit_export.py habit_export.parquet --backend sqlite
+
+EXPORT_FIELDS = ("date",) + DayRecord.__slots__[1:]
+TEXT_FIELDS = ("bed_time", "wake_time", "sleep_quality", "what_junk_food")
+FORMATS = ("csv", "jsonl", "parquet", "npz")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".parquet": "parquet", ".npz": "npz"}
+CHUNK_DAYS = 8192
+MISSING = -1 # Missing numbers in the .npz columns (text columns use code -1)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def iter_rows(log_store):
+    """Yields every logged day as a tuple in DayRecord.__slots__ order, streaming from the store."""
+    log_path = getattr(log_store, "log_path", None)
+    if log_path is not None: # Text backend: the fast parser yields rows directly
+        if os.path.exists(log_path):
+            yield from iter_day_rows(log_path)
+        return
+    for record in log_store.iter_records():
+        yield record.row()
+
+
+def iter_chunks(rows, chunk_days=CHUNK_DAYS):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_days:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet # Optional: only used for Parquet output
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_format(path, fmt=None):
+    """
+    Returns (format, path). The format comes from `fmt` or the file extension;
+    "columnar" means Parquet if pyarrow is installed, otherwise .npz. Parquet
+    without pyarrow also falls back to .npz, with the extension changed to match.
+    """
+    root, extension = os.path.splitext(path)
+    fmt = fmt or EXTENSIONS.get(extension.lower())
+    if fmt is None:
+        raise ValueError(f"Can't tell the export format from {path!r}; use one of {', '.join(EXTENSIONS)}.")
+    if fmt == "columnar":
+        fmt = "parquet" if parquet_available() else "npz"
+    if fmt == "parquet" and not parquet_available():
+        print("pyarrow isn't installed, writing a NumPy .npz archive instead of Parquet.")
+        fmt = "npz"
+    if fmt == "npz" and extension.lower() != ".npz":
+        path = root + ".npz"
+    return fmt, path
+
+
+# --- Writers: write(chunk) for every chunk of rows, then close() ---
+
+class CsvExportWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_FIELDS)
+
+    def write(self, chunk):
+        self.writer.writerows(chunk) # Dates are written as YYYY-MM-DD and None as an empty cell
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesExportWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+        self.encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def write(self, chunk):
+        encode = self.encode
+        lines = []
+        for row in chunk:
+            values = dict(zip(EXPORT_FIELDS, row))
+            values["date"] = str(row[0])
+            lines.append(encode(values))
+        lines.append("")
+        self.file.write("\n".join(lines))
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetExportWriter:
+    """One Parquet row group per chunk, through pyarrow's streaming writer."""
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        types = {"date": pa.date32(), "max_points": pa.int32(), "points": pa.int32(), "daily_steps": pa.int64()}
+        self.schema = pa.schema([(field, pa.string() if field in TEXT_FIELDS else types.get(field, pa.int32()))
+                                 for field in EXPORT_FIELDS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, chunk):
+        columns = list(zip(*chunk))
+        arrays = [self.pa.array(column, type=self.schema.field(i).type) for i, column in enumerate(columns)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class NpzExportWriter:
+    """
+    One NumPy array per column in an .npz archive. Each chunk is appended to a raw
+    temporary file per column; close() wraps them as .npy members of the archive,
+    so the whole dataset is never in memory. Text columns are stored as int32
+    codes into a "<field>_values" array of the distinct texts (-1 = missing),
+    numbers as int64 with -1 for missing, dates as datetime64[D].
+    """
+
+    def __init__(self, path):
+        import numpy as np # Only needed for the .npz export
+        self.np = np
+        self.path = path
+        self.temp_dir = tempfile.mkdtemp(prefix="habit_export_")
+        self.files = {field: open(os.path.join(self.temp_dir, field), "wb") for field in EXPORT_FIELDS}
+        self.codes = {field: {} for field in TEXT_FIELDS} # text -> code, per text column
+        self.count = 0
+        self.dtypes = {field: np.dtype("<M8[D]") if field == "date" else np.dtype("<i4") if field in TEXT_FIELDS
+                       else np.dtype("<i8") for field in EXPORT_FIELDS}
+
+    def write(self, chunk):
+        np = self.np
+        for field, column in zip(EXPORT_FIELDS, zip(*chunk)):
+            if field == "date":
+                # datetime64[D] is stored as int64 days since 1970-01-01
+                values = np.array([day.toordinal() - EPOCH_ORDINAL for day in column], dtype=np.int64)
+            elif field in TEXT_FIELDS:
+                codes = self.codes[field]
+                values = np.array([MISSING if text is None else codes.setdefault(text, len(codes)) for text in column],
+                                  dtype=self.dtypes[field])
+            else:
+                values = np.array([MISSING if value is None else value for value in column], dtype=self.dtypes[field])
+            values.tofile(self.files[field])
+        self.count += len(chunk)
+
+    def close(self):
+        np = self.np
+        try:
+            for f in self.files.values():
+                f.close()
+            with zipfile.ZipFile(self.path, "w", allowZip64=True) as archive:
+                for field in EXPORT_FIELDS:
+                    self._add_array(archive, field, os.path.join(self.temp_dir, field), self.dtypes[field])
+                for field in TEXT_FIELDS:
+                    texts = list(self.codes[field]) # Insertion order = code order
+                    values = np.array(texts, dtype=str) if texts else np.zeros(0, dtype="<U1")
+                    with archive.open(f"{field}_values.npy", "w", force_zip64=True) as out:
+                        np.lib.format.write_array(out, values)
+        finally:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _add_array(self, archive, name, raw_path, dtype):
+        with archive.open(f"{name}.npy", "w", force_zip64=True) as out, open(raw_path, "rb") as raw:
+            self.np.lib.format.write_array_header_1_0(out, {"descr": self.np.lib.format.dtype_to_descr(dtype),
+                                                            "fortran_order": False, "shape": (self.count,)})
+            shutil.copyfileobj(raw, out, 1 << 20)
+
+
+WRITERS = {"csv": CsvExportWriter, "jsonl": JsonLinesExportWriter, "parquet": ParquetExportWriter, "npz": NpzExportWriter}
+
+
+def export_log(log_store, path, fmt=None, chunk_days=CHUNK_DAYS):
+    """
+    Streams every logged day of `log_store` to `path`.
+    Returns (days written, path written) - the path differs from the one given
+    when Parquet falls back to .npz.
+    """
+    fmt, path = resolve_format(path, fmt)
+    writer = WRITERS[fmt](path)
+    count = 0
+    try:
+        for chunk in iter_chunks(iter_rows(log_store), chunk_days):
+            writer.write(chunk)
+            count += len(chunk)
+    finally:
+        writer.close()
+    return count, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the habit log to CSV, JSON Lines, Parquet or NumPy .npz.")
+    parser.add_argument("target", help="Output file; the format follows the extension (.csv, .jsonl, .parquet, .npz)")
+    parser.add_argument("--format", choices=FORMATS + ("columnar",),
+                        help="Output format (default: from the extension); columnar = Parquet if available, else .npz")
+    parser.add_argument("--log", help="Log file to export (default: the app's habit_log.txt)")
+    parser.add_argument("--backend", choices=BACKENDS, help="Storage backend to read from (default: HABIT_TRACKER_BACKEND or text)")
+    args = parser.parse_args()
+
+    log_path = args.log or HabitTrackerLogic().get_log_file_path()
+    log_store = open_log_store(log_path, args.backend or os.environ.get("HABIT_TRACKER_BACKEND", "text"))
+    try:
+        count, path = export_log(log_store, args.target, args.format)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Export failed: {e}")
+    print(f"Exported {count} days to {path}.")
+
+
+if __name__ == "__main__":
+    main()
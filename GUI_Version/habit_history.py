@@ -0,0 +1,153 @@
+import numpy as np
+from habit_log_parser import iter_day_records
+from habit_time_parser import time_to_minutes # Also used by habit_binary_log.py, which doesn't need NumPy
+
+# --- Columnar History Store ---
+# One NumPy array per field, one row per logged day. Analytics over years of
+# history then run as array operations instead of Python loops over records.
+
+COLUMNS = ("date_ordinal", "bed_minutes", "wake_minutes", "morning_walk", "healthy_breakfast",
+           "pomodoro_done", "junk_food", "daily_steps", "points")
+MISSING = -1 # Marks a value that wasn't in the log
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def record_to_row(record):
+    """Returns the column values of one DayRecord as a tuple in COLUMNS order."""
+    def value(v):
+        return MISSING if v is None else v
+    return (record.day.toordinal(), time_to_minutes(record.bed_time), time_to_minutes(record.wake_time),
+            value(record.morning_walk), value(record.healthy_breakfast), value(record.pomodoro_done),
+            value(record.junk_food), value(record.daily_steps), value(record.points))
+
+
+class HabitHistory:
+    """
+    Columnar in-memory copy of every logged day.
+    Rows are in the order days were added; `rows` maps a date ordinal to its row.
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.rows = {}
+        self.data = {name: np.full(capacity, MISSING, dtype=np.int64) for name in COLUMNS}
+
+    @classmethod
+    def from_log(cls, log_path, chunk_size=8192):
+        """Builds the history by streaming the log file once."""
+        return cls.from_records(iter_day_records(log_path), chunk_size)
+
+    @classmethod
+    def from_records(cls, records, chunk_size=8192):
+        """Builds the history from any iterable of DayRecords, in chunks."""
+        history = cls()
+        chunk = []
+        for record in records:
+            chunk.append(record_to_row(record))
+            if len(chunk) >= chunk_size:
+                history.extend_rows(chunk)
+                chunk = []
+        history.extend_rows(chunk)
+        return history
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Builds the history from whole columns ({name: array}, one entry per day, first occurrences only)."""
+        size = len(columns["date_ordinal"])
+        history = cls(capacity=max(size, 1))
+        for name in COLUMNS:
+            history.data[name][:size] = columns[name]
+        history.size = size
+        history.rows = dict(zip(history.data["date_ordinal"][:size].tolist(), range(size)))
+        return history
+
+    def _reserve(self, extra):
+        """Grows every column (doubling) so `extra` more rows fit."""
+        capacity = len(self.data["date_ordinal"])
+        if self.size + extra <= capacity:
+            return
+        while capacity < self.size + extra:
+            capacity *= 2
+        for name in COLUMNS:
+            grown = np.full(capacity, MISSING, dtype=np.int64)
+            grown[:self.size] = self.data[name][:self.size]
+            self.data[name] = grown
+
+    def extend_rows(self, rows):
+        """
+        Appends many rows (tuples in COLUMNS order) in one bulk copy.
+        A day that is already stored keeps its first row, like the log itself.
+        """
+        new_rows = []
+        for row in rows:
+            if row[0] not in self.rows:
+                self.rows[row[0]] = self.size + len(new_rows)
+                new_rows.append(row)
+        if not new_rows:
+            return
+        self._reserve(len(new_rows))
+        block = np.array(new_rows, dtype=np.int64)
+        for j, name in enumerate(COLUMNS):
+            self.data[name][self.size:self.size + len(new_rows)] = block[:, j]
+        self.size += len(new_rows)
+
+    def upsert(self, record):
+        """Adds a DayRecord, or overwrites the row of that day if it's already stored."""
+        self.upsert_row(record_to_row(record))
+
+    def upsert_row(self, row):
+        """Adds a row (tuple in COLUMNS order), or overwrites the row of that day if it's already stored."""
+        i = self.rows.get(row[0])
+        if i is None:
+            self.extend_rows([row])
+            return
+        for j, name in enumerate(COLUMNS):
+            self.data[name][i] = row[j]
+
+    # --- Column Access ---
+
+    def __len__(self):
+        return self.size
+
+    def column(self, name):
+        """Returns a view of one column for all stored days."""
+        return self.data[name][:self.size]
+
+    def values(self, name):
+        """Returns one column with the missing values left out."""
+        column = self.column(name)
+        return column[column != MISSING]
+
+    def weekdays(self):
+        """Returns the weekday (0 = Monday) of every stored day."""
+        return (self.column("date_ordinal") - 1) % 7
+
+    # --- Aggregations ---
+
+    def mean(self, name):
+        """Average of a column over all days that have a value, or None if there are none."""
+        values = self.values(name)
+        return float(values.mean()) if len(values) else None
+
+    def percentile(self, name, q):
+        """q-th percentile (0-100, or a sequence of them) of a column, or None if it's empty."""
+        values = self.values(name)
+        return np.percentile(values, q) if len(values) else None
+
+    def weekday_means(self, name):
+        """
+        Returns a 7-element array with the average of a column per weekday
+        (Monday first). Weekdays without data are NaN.
+        """
+        column = self.column(name)
+        present = column != MISSING
+        weekdays = self.weekdays()[present]
+        totals = np.bincount(weekdays, weights=column[present], minlength=7)
+        counts = np.bincount(weekdays, minlength=7)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return totals / counts
+
+    def weekday_breakdown(self, name):
+        """Returns {weekday name: average} for a column, skipping weekdays without data."""
+        means = self.weekday_means(name)
+        return {WEEKDAY_NAMES[i]: float(means[i]) for i in range(7) if not np.isnan(means[i])}
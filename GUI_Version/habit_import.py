@@ -0,0 +1,181 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+from habit_log_parser import DayRecord, format_day_lines
+from habit_log_store import discard_summary_cache
+from habit_scoring import SCORER
+from habit_time_parser import clean_times
+from habit_tracker_logic import BACKENDS, HabitTrackerLogic, get_clean_time, open_log_store, parse_yes_no, parse_number
+
+# --- Bulk Backfill / Import ---
+# Reads many days from CSV or JSON Lines, validates them with the same rules the
+# GUI uses, scores them with the same SCORER and renders the same log lines, and
+# saves them with a single merged write.
+#
+# Expected columns / keys (same names as the DayRecord fields):
+#     date, bed_time, wake_time, sleep_quality, morning_walk, healthy_breakfast,
+#     pomodoro_done, junk_food, what_junk_food, daily_steps
+# Yes/no fields accept "yes"/"no" as well as 1/0.
+# A date that appears more than once keeps its first row, like a log with a day
+# logged twice keeps its first block; the later rows are reported as skipped.
+
+IMPORT_BATCH = 10000 # Rows whose times are validated together with clean_times()
+
+
+def read_csv_rows(path):
+    """Yields one dict per CSV row, keyed by the header line."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def read_jsonl_rows(path):
+    """Yields one dict per non-empty line of a JSON Lines file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_day_rows(path):
+    """Picks the reader from the file extension (.csv, otherwise JSON Lines)."""
+    if os.path.splitext(path)[1].lower() == ".csv":
+        return read_csv_rows(path)
+    return read_jsonl_rows(path)
+
+
+def _yes_no(value):
+    """Same rule as parse_yes_no, but also accepts 1/0 from JSON or CSV."""
+    if value in (0, 1) and not isinstance(value, bool):
+        return value
+    text = str(value if value is not None else "").strip()
+    if text in ("0", "1"): # 1/0 as CSV text, e.g. from habit_export.py
+        return int(text)
+    return parse_yes_no(text)
+
+
+def _number(value):
+    """Same rule as parse_number, but also accepts ints from JSON."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value >= 0 else None
+    return parse_number(str(value if value is not None else ""))
+
+
+def _time_text(row, key):
+    return str(row.get(key) or "")
+
+
+def validate_day_row(row, times=None):
+    """
+    Validates one raw day row.
+    `times` is the row's (bed_time, wake_time) already cleaned by import_days with
+    clean_times(); without it they are parsed here.
+    Returns {"is_valid": bool, "message": str, "cleaned_data": dict}, like the GUI's validators.
+    """
+    try:
+        day = datetime.date.fromisoformat(str(row.get("date", "")).strip())
+    except ValueError:
+        return {"is_valid": False, "message": "Invalid date. Use YYYY-MM-DD.", "cleaned_data": None}
+
+    if times is None:
+        times = (get_clean_time(_time_text(row, "bed_time")), get_clean_time(_time_text(row, "wake_time")))
+    bed_time, wake_time = times
+    if bed_time is None:
+        return {"is_valid": False, "message": "Invalid bedtime. Use HH:MM or HH.", "cleaned_data": None}
+    if wake_time is None:
+        return {"is_valid": False, "message": "Invalid wake time. Use HH:MM or HH.", "cleaned_data": None}
+    sleep_quality = str(row.get("sleep_quality") or "").strip()
+    if not sleep_quality:
+        return {"is_valid": False, "message": "Please comment on your sleep quality.", "cleaned_data": None}
+
+    yes_no = {}
+    for key in ("morning_walk", "healthy_breakfast", "junk_food"):
+        yes_no[key] = _yes_no(row.get(key))
+        if yes_no[key] is None:
+            return {"is_valid": False, "message": f"Please answer yes or no for {key}.", "cleaned_data": None}
+
+    numbers = {}
+    for key in ("pomodoro_done", "daily_steps"):
+        numbers[key] = _number(row.get(key))
+        if numbers[key] is None:
+            return {"is_valid": False, "message": f"Please enter a valid positive number for {key}.", "cleaned_data": None}
+
+    what_junk_food = str(row.get("what_junk_food") or "").strip() or None
+    if yes_no["junk_food"] == 1 and what_junk_food is None:
+        return {"is_valid": False, "message": "Please specify what junk food you ate.", "cleaned_data": None}
+    if yes_no["junk_food"] == 0:
+        what_junk_food = None
+
+    cleaned = {"date": day, "bed_time": bed_time, "wake_time": wake_time, "sleep_quality": sleep_quality,
+               "what_junk_food": what_junk_food, **yes_no, **numbers}
+    return {"is_valid": True, "message": "", "cleaned_data": cleaned}
+
+
+def score_day(cleaned):
+    """
+    Scores one validated day and returns its log lines (header excluded), exactly
+    as the GUI would write them. Only a DayRecord is built: no HabitTrackerLogic,
+    which would open a log store for every row.
+    """
+    record = DayRecord(cleaned["date"])
+    for field in ("bed_time", "wake_time", "sleep_quality", "morning_walk", "healthy_breakfast",
+                  "pomodoro_done", "junk_food", "what_junk_food", "daily_steps"):
+        setattr(record, field, cleaned[field]) # what_junk_food is already None without junk food
+    record.points = SCORER.score(record)
+    record.max_points = SCORER.max_points
+    return format_day_lines(record)
+
+
+def import_days(rows, log_store):
+    """
+    Validates and scores every row, then writes all valid days in one merged pass.
+    Days already in the log are replaced. A date that appears twice keeps its first
+    row. Returns (imported, errors) where errors is a list of (row number, message)
+    for the rows that were skipped.
+    """
+    days = {}
+    errors = []
+
+    def add_batch(batch):
+        # The bed and wake times of the whole batch are parsed together, each distinct value once
+        bed_times = clean_times([_time_text(row, "bed_time") for _, row in batch])
+        wake_times = clean_times([_time_text(row, "wake_time") for _, row in batch])
+        for (row_number, row), times in zip(batch, zip(bed_times, wake_times)):
+            result = validate_day_row(row, times)
+            if not result["is_valid"]:
+                errors.append((row_number, result["message"]))
+            elif result["cleaned_data"]["date"] in days:
+                errors.append((row_number, f"{result['cleaned_data']['date']} is already imported from an earlier row."))
+            else:
+                days[result["cleaned_data"]["date"]] = score_day(result["cleaned_data"])
+
+    batch = []
+    for row_number, row in enumerate(rows, start=1):
+        batch.append((row_number, row))
+        if len(batch) == IMPORT_BATCH:
+            add_batch(batch)
+            batch = []
+    add_batch(batch)
+    log_store.write_days(days)
+    if getattr(log_store, "log_path", None) is not None:
+        discard_summary_cache(log_store.log_path) # Older days may have been replaced
+    return len(days), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import many days into habit_log.txt at once.")
+    parser.add_argument("source", help="CSV or JSON Lines file with one day per row")
+    parser.add_argument("--log", help="Log file to import into (default: the app's habit_log.txt)")
+    parser.add_argument("--backend", choices=BACKENDS, default="text", help="Storage backend to import into")
+    args = parser.parse_args()
+
+    log_path = args.log or HabitTrackerLogic(backend="text").get_log_file_path() # The text store opens nothing up front
+    imported, errors = import_days(read_day_rows(args.source), open_log_store(log_path, args.backend))
+    for row_number, message in errors:
+        print(f"Row {row_number} skipped: {message}")
+    print(f"Imported {imported} days into {log_path}.")
+
+
+if __name__ == "__main__":
+    main()
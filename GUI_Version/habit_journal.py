@@ -0,0 +1,71 @@
+import json
+import os
+
+# --- Base File Plus Journal ---
+# Sidecar caches that change one day at a time (the search index, the summary
+# cache) are saved as a base file holding everything plus a journal with one JSON
+# line per day saved since. Saving a day appends one line; the base is only
+# rewritten once the journal has COMPACT_AFTER lines. Loading reads the base and
+# replays the journal on top of it.
+
+COMPACT_AFTER = 500 # Journal lines before the base file is rewritten
+
+
+def journal_path(path):
+    return os.path.splitext(path)[0] + ".journal"
+
+
+def discard(path):
+    """Deletes a saved base file and its journal, if they exist."""
+    for file_path in (path, journal_path(path)):
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
+class JournaledSnapshot:
+    """
+    Mixin for a cache saved as a base file plus a journal. The class writes its
+    base with write_base(), one day with append_entry(), and reads the journal
+    back with replay_journal() when it loads.
+    """
+
+    journal_lines = 0 # Lines in the journal since the base was written
+
+    def write_base(self, path, write, binary=False):
+        """Writes the base through write(f) into a temporary file that replaces it, and starts an empty journal."""
+        temp_path = path + ".tmp"
+        with (open(temp_path, "wb") if binary else open(temp_path, "w", encoding="utf-8")) as f:
+            write(f)
+        os.replace(temp_path, path)
+        with open(journal_path(path), "w", encoding="utf-8"):
+            pass
+        self.journal_lines = 0
+
+    def append_entry(self, path, entry, compact):
+        """
+        Records one saved day: appends `entry` to the journal, or calls compact()
+        (which writes a fresh base) once the journal has grown long or there's no base.
+        """
+        if self.journal_lines >= COMPACT_AFTER or not os.path.exists(path):
+            compact()
+            return
+        with open(journal_path(path), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.journal_lines += 1
+
+    def replay_journal(self, path):
+        """Yields the journal entries in order, counting them. Stops at a line cut short by a crash."""
+        try:
+            f = open(journal_path(path), "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    return # The signature saved with the entries before it won't match the log then
+                self.journal_lines += 1
+                yield entry
@@ -0,0 +1,359 @@
+import datetime
+import gzip
+import re
+from habit_scoring import SCORER
+
+# --- Streaming Parser for habit_log.txt ---
+# Both the GUI and the terminal version write the same kind of day block, with
+# small differences (e.g. "Steps Done: 4444" vs "Steps Done:4444", "/5" vs "/7"),
+# so every line pattern below is deliberately loose about spacing.
+
+HEADER_RE = re.compile(r"^=== (\d{4}-\d{2}-\d{2}) ===$")
+SLEEP_RE = re.compile(r"^Sleep log:\s*Bedtime\s*--\s*(.*?)\s*\|\s*Wake Time\s*--\s*(.*?)\s*\|\s*Sleep Quality\s*--\s?(.*)$")
+POMODORO_RE = re.compile(r"^Pomodoro/Work Done:\s*(\d+)")
+JUNK_FOOD_RE = re.compile(r"^Junk Food:\s*(Yes|No)(?::\s?(.*))?$", re.IGNORECASE)
+STEPS_RE = re.compile(r"^Steps Done:\s*(\d+)")
+POINTS_RE = re.compile(r"^Today's Points:\s*(\d+)\s*/\s*(\d+)")
+
+# Fast path for whole files: a day block exactly as the GUI writes it is matched
+# by this one pattern, so the regex engine walks through big chunks of text and
+# Python only runs once per day instead of once per line. Each optional line only
+# accepts text that the line patterns above would read the same way; whatever it
+# doesn't match (other spellings, the terminal format, unknown lines) is left to
+# the line-by-line parser, which continues the same record.
+FAST_BLOCK_RE = re.compile(
+    r"^=== (\d{4}-\d{2}-\d{2}) ===\n"
+    r"(?:Sleep log: Bedtime -- ([^\s|]*) \| Wake Time -- ([^\s|]*) \| Sleep Quality -- ((?:[^\n]*\S)?)\n)?"
+    r"(?:Morning Walk: ([^\n]*)\n)?"
+    r"(?:Breakfast: ([^\n]*)\n)?"
+    r"(?:Pomodoro/Work Done: (\d+)[^\n]*\n)?"
+    r"(?:Junk Food: (?:Yes: ((?:[^\n]*\S)?)|(No))\n)?"
+    r"(?:Steps Done: ?(\d+)[^\n]*\n)?"
+    r"(?:Today's Points: (\d+)/(\d+)[^\n]*\n)?"
+    r"\n*", # Blank lines, e.g. the one before the next header, carry no data
+    re.MULTILINE)
+POMODORO_MINUTES = 30 # Length of one pomodoro session
+READ_CHARS = 1 << 22 # Text read per chunk by the fast path
+
+
+class DayRecord:
+    """
+    One day of the habit log: parsed from a day block, or filled in step by step by
+    HabitTrackerLogic (format_day_lines turns it back into log lines). Anything
+    not answered or missing from the log stays None.
+    """
+    __slots__ = ("day", "bed_time", "wake_time", "sleep_quality", "morning_walk",
+                 "healthy_breakfast", "pomodoro_done", "junk_food", "what_junk_food",
+                 "daily_steps", "points", "max_points")
+
+    def __init__(self, day, bed_time=None, wake_time=None, sleep_quality=None,
+                 morning_walk=None, healthy_breakfast=None, pomodoro_done=None,
+                 junk_food=None, what_junk_food=None, daily_steps=None,
+                 points=None, max_points=None):
+        self.day = day # datetime.date
+        self.bed_time = bed_time # "HH:MM"
+        self.wake_time = wake_time # "HH:MM"
+        self.sleep_quality = sleep_quality
+        self.morning_walk = morning_walk # 1 for yes, 0 for no
+        self.healthy_breakfast = healthy_breakfast # 1 for yes, 0 for no
+        self.pomodoro_done = pomodoro_done
+        self.junk_food = junk_food # 1 for yes, 0 for no
+        self.what_junk_food = what_junk_food
+        self.daily_steps = daily_steps
+        self.points = points
+        self.max_points = max_points # 7 in the GUI log, 5 in old terminal logs
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"DayRecord({fields})"
+
+    def __eq__(self, other):
+        if not isinstance(other, DayRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def get(self, field, default=None):
+        """The value of a field, or `default` if it isn't answered."""
+        value = getattr(self, field)
+        return default if value is None else value
+
+    def answers(self):
+        """The answered fields as a dict (the date left out), e.g. for JSON."""
+        return {name: getattr(self, name) for name in self.__slots__[1:] if getattr(self, name) is not None}
+
+    def copy(self):
+        return DayRecord(*self.row())
+
+    def row(self):
+        """The field values as a tuple, in DayRecord.__slots__ order (the order DayRecord() takes them)."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def parse_header(line):
+    """Returns the date of a '=== YYYY-MM-DD ===' header line, or None for any other line."""
+    match = HEADER_RE.match(line.strip())
+    if not match:
+        return None
+    try:
+        return datetime.date.fromisoformat(match.group(1))
+    except ValueError:
+        return None
+
+
+def _parse_sleep(record, line):
+    match = SLEEP_RE.match(line)
+    if match:
+        record.bed_time, record.wake_time, record.sleep_quality = match.groups()
+
+
+def _parse_walk(record, line):
+    record.morning_walk = 1 if "walk done" in line[len("Morning Walk:"):].lower() else 0
+
+
+def _parse_breakfast(record, line):
+    record.healthy_breakfast = 1 if "healthy" in line[len("Breakfast:"):].lower() else 0
+
+
+def _parse_pomodoro(record, line):
+    match = POMODORO_RE.match(line)
+    if match:
+        record.pomodoro_done = int(match.group(1))
+
+
+def _parse_junk_food(record, line):
+    match = JUNK_FOOD_RE.match(line)
+    if match:
+        record.junk_food = 1 if match.group(1).lower() == "yes" else 0
+        record.what_junk_food = match.group(2) if record.junk_food else None
+
+
+def _parse_steps(record, line):
+    match = STEPS_RE.match(line)
+    if match:
+        record.daily_steps = int(match.group(1))
+
+
+def _parse_points(record, line):
+    match = POINTS_RE.match(line)
+    if match:
+        record.points = int(match.group(1))
+        record.max_points = int(match.group(2))
+
+
+# First 4 characters of a line -> (its full label, parser). One dict lookup per
+# line instead of trying every label in turn; the labels all differ in 4 characters.
+LINE_PARSERS = {label[:4]: (label, parser) for label, parser in (
+    ("Sleep log:", _parse_sleep),
+    ("Morning Walk:", _parse_walk),
+    ("Breakfast:", _parse_breakfast),
+    ("Pomodoro/Work Done:", _parse_pomodoro),
+    ("Junk Food:", _parse_junk_food),
+    ("Steps Done:", _parse_steps),
+    ("Today's Points:", _parse_points),
+)}
+
+
+def parse_log_line(record, line):
+    """
+    Fills the matching fields of `record` from one log line.
+    Lines that don't match any known habit are ignored.
+    """
+    line = line.strip()
+    entry = LINE_PARSERS.get(line[:4])
+    if entry is not None and line.startswith(entry[0]):
+        entry[1](record, line)
+
+
+def parse_day_lines(day, lines):
+    """Builds a DayRecord from the lines of one day block (header excluded)."""
+    record = DayRecord(day)
+    for line in lines:
+        parse_log_line(record, line)
+    return record
+
+
+def format_work_hours(total_minutes):
+    """Formats minutes of focused work as H:MM, e.g. 150 -> "2:30"."""
+    hours, minutes = divmod(total_minutes, 60)
+    return f"{hours}:{minutes:02d}"
+
+
+def format_day_lines(record):
+    """
+    Returns the log lines of a DayRecord (header excluded), in the GUI's format.
+    Only answered habits get a line, and the points line only once points are set.
+    """
+    lines = []
+    if record.bed_time is not None or record.wake_time is not None or record.sleep_quality is not None:
+        lines.append(f"Sleep log: Bedtime -- {record.bed_time} | Wake Time -- {record.wake_time} | "
+                     f"Sleep Quality -- {record.sleep_quality or ''}")
+    if record.morning_walk is not None:
+        lines.append(f"Morning Walk: Walk done👍 +{SCORER.points_for('morning_walk', 1)}" if record.morning_walk == 1
+                     else "Morning Walk: None.")
+    if record.healthy_breakfast is not None:
+        lines.append(f"Breakfast: Healthy👍 +{SCORER.points_for('healthy_breakfast', 1)}" if record.healthy_breakfast == 1
+                     else "Breakfast: None.")
+    if record.pomodoro_done is not None:
+        lines.append(f"Pomodoro/Work Done: {record.pomodoro_done} sessions = "
+                     f"{format_work_hours(record.pomodoro_done * POMODORO_MINUTES)} hours of focused work.")
+    if record.junk_food is not None:
+        lines.append(f"Junk Food: Yes: {record.what_junk_food}" if record.junk_food == 1 else "Junk Food: No")
+    if record.daily_steps is not None:
+        lines.append(f"Steps Done:{record.daily_steps} {SCORER.label_for('daily_steps', record.daily_steps)}")
+    if record.points is not None:
+        max_points = record.max_points or SCORER.max_points
+        lines.append(f"Today's Points: {record.points}/{max_points} - {SCORER.message(record.points)}")
+    return lines
+
+
+def open_log_file(path):
+    """Opens a log for reading as text; gzip-compressed logs (.gz) are decompressed on the fly."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _is_path(source):
+    return isinstance(source, (str, bytes)) or hasattr(source, "__fspath__")
+
+
+def iter_day_blocks(source):
+    """
+    Yields (YYYY-MM-DD label, lines) for every day block in the log, in file order,
+    without parsing the lines. Blank lines and the header itself are left out.
+    `source` is a path (.gz is decompressed on the fly) or an opened text file.
+    """
+    if _is_path(source):
+        with open_log_file(source) as f:
+            yield from iter_day_blocks(f)
+        return
+
+    label = None
+    lines = []
+    for line in source:
+        day = parse_header(line) if "=== " in line else None
+        if day is not None:
+            if label is not None:
+                yield label, lines
+            label = str(day)
+            lines = []
+        elif label is not None and line.strip():
+            lines.append(line.rstrip("\r\n"))
+    if label is not None:
+        yield label, lines
+
+
+def iter_day_records(source):
+    """
+    Yields a DayRecord for every day block in the log, in file order.
+    `source` is a path or an already opened text file. The file is read line by
+    line, so memory use stays constant no matter how long the history is.
+    Lines before the first header are skipped. Paths ending in .gz are
+    decompressed on the fly.
+    """
+    if _is_path(source):
+        with open_log_file(source) as f:
+            yield from iter_day_records(f)
+        return
+    if hasattr(source, "read"):
+        for row in _iter_rows_fast(source):
+            yield DayRecord(*row)
+        return
+
+    record = None
+    for line in source:
+        day = parse_header(line) if "=== " in line else None # Cheap test first, most lines aren't headers
+        if day is not None:
+            if record is not None:
+                yield record
+            record = DayRecord(day)
+        elif record is not None:
+            parse_log_line(record, line)
+    if record is not None:
+        yield record
+
+
+def iter_day_rows(source):
+    """
+    Like iter_day_records, but yields each day as a plain tuple in DayRecord.__slots__
+    order. Cheaper when the values are only passed on (e.g. exported).
+    """
+    if _is_path(source):
+        with open_log_file(source) as f:
+            yield from _iter_rows_fast(f)
+        return
+    for record in iter_day_records(source):
+        yield record.row()
+
+
+def _fast_row(day, match):
+    """The row of a FAST_BLOCK_RE match, read the way parse_log_line reads each line."""
+    (_, bed_time, wake_time, sleep_quality, walk, breakfast, pomodoro_done,
+     what_junk_food, no_junk_food, daily_steps, points, max_points) = match.groups()
+    return (day, bed_time, wake_time, sleep_quality,
+            None if walk is None else 1 if "walk done" in walk.lower() else 0,
+            None if breakfast is None else 1 if "healthy" in breakfast.lower() else 0,
+            None if pomodoro_done is None else int(pomodoro_done),
+            0 if no_junk_food is not None else None if what_junk_food is None else 1,
+            what_junk_food,
+            None if daily_steps is None else int(daily_steps),
+            None if points is None else int(points),
+            None if max_points is None else int(max_points))
+
+
+def _parse_text_lines(text, record, finished):
+    """
+    Line-by-line parsing of `text` (whole lines), continuing `record`. Days that
+    end inside the text are appended to `finished` as rows. Returns the day still open.
+    """
+    for line in text.split("\n"):
+        day = parse_header(line) if "=== " in line else None
+        if day is not None:
+            if record is not None:
+                finished.append(record.row())
+            record = DayRecord(day)
+        elif record is not None:
+            parse_log_line(record, line)
+    return record
+
+
+def _iter_rows_fast(f):
+    """
+    Yields the rows of an opened log, reading READ_CHARS at a time. Blocks are
+    matched whole by FAST_BLOCK_RE; the text between matches goes through the line
+    parser, so every line is still read once and in order, with the same result.
+    """
+    pending = None # The open day: a row from the fast path, or a DayRecord the line parser is filling
+    rest = ""
+    finished = []
+    while True:
+        data = f.read(READ_CHARS)
+        text = rest + data
+        cut = text.rfind("\n") + 1 if data else len(text) # Chunks end at a line end
+        text, rest = text[:cut], text[cut:]
+        position = 0
+        for match in FAST_BLOCK_RE.finditer(text):
+            try:
+                day = datetime.date.fromisoformat(match.group(1))
+            except ValueError:
+                continue # Not a real header: the line parser treats it as part of the previous day
+            if match.start() > position:
+                if isinstance(pending, tuple):
+                    pending = DayRecord(*pending) # Lines after the matched part still belong to this day
+                pending = _parse_text_lines(text[position:match.start()], pending, finished)
+                yield from finished
+                finished.clear()
+            if pending is not None:
+                yield pending if isinstance(pending, tuple) else pending.row()
+            pending = _fast_row(day, match)
+            position = match.end()
+        if position < len(text):
+            if isinstance(pending, tuple):
+                pending = DayRecord(*pending)
+            pending = _parse_text_lines(text[position:], pending, finished)
+            yield from finished
+            finished.clear()
+        if not data:
+            break
+    if pending is not None:
+        yield pending if isinstance(pending, tuple) else pending.row()
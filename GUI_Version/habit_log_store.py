@@ -0,0 +1,497 @@
+import bisect
+import datetime
+import mmap
+import os
+import re
+import threading
+from habit_journal import discard
+from habit_log_parser import iter_day_records, parse_day_lines
+from habit_profiler import span
+
+# --- Day-Segment Log Store ---
+# habit_log.txt is a sequence of day blocks, each one written as
+#
+#     \n=== 2025-07-30 ===\nSleep log: ...\n...\nToday's Points: ...\n
+#
+# The store keeps a small sidecar index (habit_log.txt.idx) with the byte offset
+# of every block, so saving a day only touches that day's bytes instead of
+# reading and rewriting the whole history.
+#
+# Index file layout (plain text, fixed width so entries can be rewritten in place):
+#     HABITLOGIDX1 <log size:20> <log mtime_ns:20>\n
+#     <YYYY-MM-DD> <block offset:20>\n      (one line per block, in file order)
+
+INDEX_MAGIC = b"HABITLOGIDX1"
+INDEX_HEADER_SIZE = len(INDEX_MAGIC) + 1 + 20 + 1 + 20 + 1
+INDEX_ENTRY_SIZE = 10 + 1 + 20 + 1
+SHIFT_CHUNK = 1 << 20 # Bytes moved at a time when a past day changes size
+SUMMARY_CACHE_SUFFIX = ".summary.npz" # The cache habit_summary_cache.py keeps next to the log
+
+HEADER_LINE_RE = re.compile(rb"^=== (\d{4}-\d{2}-\d{2}) ===\r?$")
+
+
+def format_day_block(day, lines):
+    """Returns the bytes of one day block exactly as the log file stores it."""
+    text = f"\n=== {day} ===\n" + "".join(line + "\n" for line in lines)
+    return text.encode("utf-8")
+
+
+def format_day_text(day, lines):
+    """Returns one day as text: the date header followed by its lines."""
+    return "\n".join([f"\n=== {day} ==="] + list(lines))
+
+
+def discard_summary_cache(log_path):
+    """
+    Deletes the summary cache next to a log. Tools that rewrite older days in bulk
+    call this; the cache is rebuilt the next time it's needed. (It's kept here, not
+    in habit_summary_cache.py, so those tools don't need NumPy.)
+    """
+    discard(log_path + SUMMARY_CACHE_SUFFIX)
+
+
+def scan_day_offsets(log_path):
+    """
+    Streams the log file once and returns (dates, offsets) for every day block.
+    A block starts at the blank line in front of its header when there is one.
+    """
+    dates = []
+    offsets = []
+    if not os.path.exists(log_path):
+        return dates, offsets
+    with open(log_path, "rb") as f:
+        position = 0
+        previous_blank_at = -1 # Offset of the previous line if it was blank
+        for line in f:
+            match = HEADER_LINE_RE.match(line.rstrip(b"\n"))
+            if match:
+                dates.append(match.group(1).decode("ascii"))
+                offsets.append(previous_blank_at if previous_blank_at != -1 else position)
+            previous_blank_at = position if line.strip() == b"" else -1
+            position += len(line)
+    return dates, offsets
+
+
+def shift_bytes(f, start, end, delta, chunk_size=SHIFT_CHUNK):
+    """
+    Moves bytes start..end of an open file by `delta` bytes (forward when positive),
+    a chunk at a time so memory use doesn't grow with the file. The bytes left
+    behind are not cleared.
+    """
+    if delta > 0:
+        position = end # Back to front, so no chunk is overwritten before it's read
+        while position > start:
+            chunk_start = max(start, position - chunk_size)
+            f.seek(chunk_start)
+            data = f.read(position - chunk_start)
+            f.seek(chunk_start + delta)
+            f.write(data)
+            position = chunk_start
+    elif delta < 0:
+        position = start
+        while position < end:
+            f.seek(position)
+            data = f.read(min(chunk_size, end - position))
+            f.seek(position + delta)
+            f.write(data)
+            position += len(data)
+
+class LogStore:
+    """
+    Reads and writes day blocks of habit_log.txt through a byte-offset index.
+    Saving a day appends it, or overwrites it in place when it is the last block,
+    so the cost depends on the size of that day and not on the whole history.
+    Editing an older day also moves the bytes logged after it.
+    """
+
+    def __init__(self, log_path, index_path=None):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self.lock = threading.RLock()
+        self.dates = None # Day labels in file order, loaded lazily
+        self.offsets = None # Block start offsets, same order as self.dates
+        self.positions = {} # Day label -> position in self.dates (first occurrence)
+        self.sorted_dates = None # Unique day labels sorted by date, for binary search
+        self.sorted_positions = None # Position in self.dates of each label in self.sorted_dates
+        self.log_map = None # Read-only memory map of the log, reopened when the file changes
+
+    def signature(self):
+        """Changes whenever the log changes; sidecar caches use it to check they are still valid."""
+        return self._log_signature()
+
+    # --- Index Management ---
+
+    def _log_signature(self):
+        """Returns (size, mtime_ns) of the log file, or (0, 0) if it doesn't exist."""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_size, stat.st_mtime_ns
+
+    def _read_index_file(self):
+        """Loads the sidecar index if it still matches the log file, otherwise returns False."""
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        header = data[:INDEX_HEADER_SIZE].split()
+        if len(header) != 3 or header[0] != INDEX_MAGIC:
+            return False
+        if (int(header[1]), int(header[2])) != self._log_signature():
+            return False # The log was changed behind our back
+        body = data[INDEX_HEADER_SIZE:]
+        if len(body) % INDEX_ENTRY_SIZE:
+            return False
+        dates = []
+        offsets = []
+        for start in range(0, len(body), INDEX_ENTRY_SIZE):
+            entry = body[start:start + INDEX_ENTRY_SIZE]
+            dates.append(entry[:10].decode("ascii"))
+            offsets.append(int(entry[11:31]))
+        self._set_index(dates, offsets)
+        return True
+
+    def _set_index(self, dates, offsets):
+        self.dates = dates
+        self.offsets = offsets
+        self.positions = {}
+        for i, day in enumerate(dates):
+            self.positions.setdefault(day, i)
+        self.sorted_dates = None
+        self.sorted_positions = None
+
+    def _index_header(self):
+        size, mtime_ns = self._log_signature()
+        return INDEX_MAGIC + b" %020d %020d\n" % (size, mtime_ns)
+
+    def _index_entry(self, i):
+        return self.dates[i].encode("ascii") + b" %020d\n" % self.offsets[i]
+
+    def _write_index_file(self, first_changed=0):
+        """
+        Rewrites the index header and every entry from `first_changed` onward.
+        Entries before it are fixed width and stay untouched on disk.
+        """
+        mode = "r+b" if first_changed and os.path.exists(self.index_path) else "wb"
+        with open(self.index_path, mode) as f:
+            if mode == "wb":
+                first_changed = 0
+            f.write(self._index_header())
+            f.seek(INDEX_HEADER_SIZE + first_changed * INDEX_ENTRY_SIZE)
+            f.write(b"".join(self._index_entry(i) for i in range(first_changed, len(self.dates))))
+            f.truncate()
+
+    def rebuild_index(self):
+        """Rescans the log file and writes a fresh sidecar index."""
+        with self.lock:
+            dates, offsets = scan_day_offsets(self.log_path)
+            self._set_index(dates, offsets)
+            self._write_index_file()
+
+    def load_index(self):
+        """Makes sure the in-memory index is loaded and matches the log file."""
+        with self.lock:
+            if self.dates is not None and self._index_matches_file():
+                return
+            if not self._read_index_file():
+                self.rebuild_index()
+
+    def _index_matches_file(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(INDEX_HEADER_SIZE)
+        except OSError:
+            return False
+        return header == self._index_header()
+
+    # --- Reading ---
+
+    def day_labels(self):
+        """Returns the day labels (YYYY-MM-DD) in the order they appear in the log."""
+        self.load_index()
+        return list(self.dates)
+
+    def block_span(self, day):
+        """Returns (start, end) byte offsets of a day's block, or None if it's not logged."""
+        self.load_index()
+        i = self.positions.get(str(day))
+        if i is None:
+            return None
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else self._log_signature()[0]
+        return self.offsets[i], end
+
+    def _sorted_index(self):
+        """Returns (sorted labels, positions), building them from the file-order index if needed."""
+        if self.sorted_dates is None:
+            pairs = sorted(self.positions.items())
+            self.sorted_dates = [label for label, _ in pairs]
+            self.sorted_positions = [i for _, i in pairs]
+        return self.sorted_dates, self.sorted_positions
+
+    def _mapped_log(self):
+        """Returns a read-only memory map of the log file, or None if the file is empty."""
+        size = self._log_signature()[0]
+        if self.log_map is not None and len(self.log_map) != size:
+            self._close_map()
+        if self.log_map is None and size:
+            with open(self.log_path, "rb") as f:
+                self.log_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.log_map
+
+    def mapped_log(self):
+        """
+        Returns a read-only memory map of the whole log (None if it's empty) for
+        bulk scans. Hold `lock` while using it: the map is closed before writes.
+        """
+        with self.lock:
+            self.load_index()
+            return self._mapped_log()
+
+    def _close_map(self):
+        # Windows can't resize a mapped file, so the map is released before every write
+        if self.log_map is not None:
+            self.log_map.close()
+            self.log_map = None
+
+    def _block_lines(self, log_map, i):
+        """Decodes only the bytes of the i-th block and returns its lines (header excluded)."""
+        start = self.offsets[i]
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else len(log_map)
+        lines = log_map[start:end].decode("utf-8", errors="replace").strip("\n").splitlines()
+        return [line for line in lines[1:] if line.strip()]
+
+    def read_day(self, day):
+        """Returns the log lines of one day (header excluded), or None if it's not logged."""
+        with self.lock:
+            self.load_index()
+            i = self.positions.get(str(day))
+            if i is None:
+                return None
+            return self._block_lines(self._mapped_log(), i)
+
+    def get_day(self, day):
+        """
+        Returns the parsed DayRecord of one day, or None if it's not logged.
+        The day is found by binary search over the sorted header index and only
+        its own bytes are read from the memory-mapped log.
+        """
+        label = str(day)
+        with self.lock:
+            self.load_index()
+            sorted_dates, sorted_positions = self._sorted_index()
+            k = bisect.bisect_left(sorted_dates, label)
+            if k == len(sorted_dates) or sorted_dates[k] != label:
+                return None
+            lines = self._block_lines(self._mapped_log(), sorted_positions[k])
+        return parse_day_lines(datetime.date.fromisoformat(label), lines)
+
+    def last_block_is_first(self):
+        """Whether the last block is its day's first (and so the one that counts)."""
+        with self.lock:
+            self.load_index()
+            return bool(self.dates) and self.positions[self.dates[-1]] == len(self.dates) - 1
+
+    def format_day(self, day, lines):
+        """Returns one day as the text the log file would show."""
+        return format_day_text(day, lines)
+
+    # Paging, for views that show a few blocks of a long log at a time
+
+    def day_count(self):
+        """Returns the number of day blocks in the log."""
+        with self.lock:
+            self.load_index()
+            return len(self.offsets)
+
+    def read_blocks(self, first, count):
+        """Returns [(label, lines)] for `count` blocks from file position `first`, reading only their bytes."""
+        with self.lock:
+            self.load_index()
+            log_map = self._mapped_log()
+            last = min(first + count, len(self.offsets))
+            return [(self.dates[i], self._block_lines(log_map, i)) for i in range(max(first, 0), last)]
+
+    def find_position(self, day):
+        """
+        Returns the file position of `day`'s block, or of the first logged day after
+        it (the last block if none is later). Returns None if the log is empty.
+        """
+        with self.lock:
+            self.load_index()
+            sorted_dates, sorted_positions = self._sorted_index()
+            if not sorted_dates:
+                return None
+            k = min(bisect.bisect_left(sorted_dates, str(day)), len(sorted_dates) - 1)
+            return sorted_positions[k]
+
+    def iter_records(self):
+        """Yields the DayRecord of every logged day, streaming the log in file order."""
+        return iter_day_records(self.log_path) if os.path.exists(self.log_path) else iter(())
+
+    def get_range(self, start, end):
+        """Returns the DayRecords of every logged day from `start` to `end` (inclusive), sorted by date."""
+        with self.lock:
+            self.load_index()
+            sorted_dates, sorted_positions = self._sorted_index()
+            first = bisect.bisect_left(sorted_dates, str(start))
+            last = bisect.bisect_right(sorted_dates, str(end))
+            log_map = self._mapped_log()
+            blocks = [(sorted_dates[k], self._block_lines(log_map, sorted_positions[k]))
+                      for k in range(first, last)]
+        return [parse_day_lines(datetime.date.fromisoformat(label), lines) for label, lines in blocks]
+
+    # --- Writing ---
+
+    def write_day(self, day, lines):
+        """
+        Saves one day's log lines, replacing the day's previous block if it exists.
+        A new day is appended. An existing day is overwritten where it is; if its
+        block changed size, the blocks after it are moved by the difference a chunk
+        at a time, so the log stays in date order and the earlier bytes are never
+        touched.
+        """
+        block = format_day_block(day, lines)
+        with self.lock:
+            with span("log.load_index"):
+                self.load_index()
+            self._close_map()
+            label = str(day)
+            i = self.positions.get(label)
+            if i is None:
+                with span("log.write_block"), open(self.log_path, "ab") as log:
+                    start = log.tell()
+                    log.write(block)
+                self.dates.append(label)
+                self.offsets.append(start)
+                self.positions[label] = len(self.dates) - 1
+                if self.sorted_dates is not None:
+                    if self.sorted_dates and label < self.sorted_dates[-1]:
+                        self.sorted_dates = None # Back-dated entry, re-sort on next lookup
+                    else:
+                        self.sorted_dates.append(label)
+                        self.sorted_positions.append(len(self.dates) - 1)
+                with span("log.write_index"):
+                    self._write_index_file(len(self.dates) - 1)
+                return
+
+            start, end = self.block_span(label)
+            size = self._log_signature()[0]
+            delta = len(block) - (end - start)
+            with open(self.log_path, "r+b") as log:
+                if delta and end < size:
+                    # A past day is being edited: move the blocks after it to fit the new size
+                    with span("log.shift_blocks"):
+                        shift_bytes(log, end, size, delta)
+                with span("log.write_block"):
+                    log.seek(start)
+                    log.write(block)
+                    if delta < 0:
+                        log.truncate(size + delta)
+            with span("log.write_index"):
+                if delta:
+                    for j in range(i + 1, len(self.offsets)):
+                        self.offsets[j] += delta
+                self._write_index_file(i + 1 if delta else len(self.dates))
+
+    def write_days(self, days):
+        """
+        Saves many days in one merged pass. `days` maps a date to its log lines.
+        Days that are already logged are replaced where they are, new days are
+        appended in the order given. If every day is new the log is only appended to;
+        otherwise it is streamed once into a temporary file that replaces the log.
+        """
+        blocks = {str(day): format_day_block(day, lines) for day, lines in days.items()}
+        if not blocks:
+            return
+        with self.lock:
+            self.load_index()
+            self._close_map()
+            new_labels = [label for label in blocks if label not in self.positions]
+
+            if len(new_labels) == len(blocks):
+                with open(self.log_path, "ab") as log:
+                    position = log.tell()
+                    log.write(b"".join(blocks[label] for label in new_labels))
+                first_changed = len(self.dates)
+                for label in new_labels:
+                    self.positions[label] = len(self.dates)
+                    self.dates.append(label)
+                    self.offsets.append(position)
+                    position += len(blocks[label])
+                self.sorted_dates = None
+                self._write_index_file(first_changed)
+                return
+
+            dates = []
+            offsets = []
+            temp_path = self.log_path + ".tmp"
+            with open(self.log_path, "rb") as src, open(temp_path, "wb") as dst:
+                ends = self.offsets[1:] + [self._log_signature()[0]]
+                if self.offsets and self.offsets[0] > 0:
+                    dst.write(src.read(self.offsets[0])) # Anything before the first header
+                for i, label in enumerate(self.dates):
+                    dates.append(label)
+                    offsets.append(dst.tell())
+                    if label in blocks and self.positions[label] == i:
+                        dst.write(blocks[label])
+                    else:
+                        src.seek(self.offsets[i])
+                        dst.write(src.read(ends[i] - self.offsets[i]))
+                for label in new_labels:
+                    dates.append(label)
+                    offsets.append(dst.tell())
+                    dst.write(blocks[label])
+            os.replace(temp_path, self.log_path)
+            self._set_index(dates, offsets)
+            self._write_index_file()
+
+    def splice(self, edits):
+        """
+        Replaces byte ranges of the log in one streaming pass and returns how many were replaced.
+        `edits` yields (start, end, data) sorted by start; none of them may touch a day header.
+        The index is shifted along with the data instead of being rebuilt.
+        """
+        with self.lock:
+            self.load_index()
+            log_map = self._mapped_log()
+            if log_map is None:
+                return 0
+            view = memoryview(log_map) # Slices of a memoryview are written without copying
+            offsets = list(self.offsets)
+            k = 0 # Blocks before position k have already been shifted
+            shift = 0
+            position = 0
+            count = 0
+            temp_path = self.log_path + ".tmp"
+            try:
+                with open(temp_path, "wb") as dst:
+                    pieces = []
+                    for start, end, data in edits:
+                        while k < len(offsets) and offsets[k] <= start:
+                            offsets[k] += shift
+                            k += 1
+                        pieces.append(view[position:start])
+                        pieces.append(data)
+                        position = end
+                        shift += len(data) - (end - start)
+                        count += 1
+                        if len(pieces) >= 8192:
+                            dst.writelines(pieces) # Batched, one write call per piece is much slower
+                            pieces = []
+                    pieces.append(view[position:])
+                    dst.writelines(pieces)
+                    del pieces
+            finally:
+                view.release()
+            if not count:
+                os.remove(temp_path) # Nothing to replace, the log stays as it is
+                return 0
+            for j in range(k, len(offsets)):
+                offsets[j] += shift
+            self._close_map()
+            os.replace(temp_path, self.log_path)
+            self._set_index(self.dates, offsets)
+            self._write_index_file()
+            return count
@@ -0,0 +1,110 @@
+import datetime
+import customtkinter
+from habit_log_store import format_day_text
+
+# --- Log Viewer Window ---
+# Shows the habit log inside the app, a page of day blocks at a time. The
+# store's day-offset index says where every block starts, so only the blocks
+# on screen are ever read and rendered: opening a 20-year log costs the same
+# as opening a week's worth, and memory stays constant while scrolling.
+
+PAGE_DAYS = 15 # Day blocks rendered at once
+WHEEL_DAYS = 3 # Days moved per mouse wheel notch
+
+
+class LogViewerWindow(customtkinter.CTkToplevel):
+    def __init__(self, master, log_store):
+        super().__init__(master)
+        self.log_store = log_store
+        self.first = 0 # File position of the first block on screen
+        self.total = 0
+
+        self.title("Habit Log")
+        self.geometry("700x600")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # --- Jump-to-date bar ---
+        self.top_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.top_frame.grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="ew")
+        self.top_frame.grid_columnconfigure(2, weight=1)
+        self.date_entry = customtkinter.CTkEntry(self.top_frame, placeholder_text="YYYY-MM-DD", width=140, corner_radius=8)
+        self.date_entry.grid(row=0, column=0, padx=(0, 5))
+        self.date_entry.bind("<Return>", lambda event: self.jump_to_date())
+        self.go_button = customtkinter.CTkButton(self.top_frame, text="Go to Date", width=100, height=28,
+                                                 corner_radius=8, command=self.jump_to_date)
+        self.go_button.grid(row=0, column=1, padx=5)
+        self.position_label = customtkinter.CTkLabel(self.top_frame, text="", text_color="#B0B0B0")
+        self.position_label.grid(row=0, column=2, padx=5, sticky="e")
+
+        # --- Page of day blocks ---
+        # The textbox never holds more than one page, so it gets an external
+        # scrollbar that represents the position in the whole log instead.
+        self.textbox = customtkinter.CTkTextbox(self, wrap="word", activate_scrollbars=False,
+                                                font=customtkinter.CTkFont(size=13))
+        self.textbox.grid(row=1, column=0, padx=(10, 0), pady=(0, 10), sticky="nsew")
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, padx=(0, 10), pady=(0, 10), sticky="ns")
+
+        for widget in (self.textbox, self.scrollbar):
+            widget.bind("<MouseWheel>", self.on_mouse_wheel) # Windows/macOS
+            widget.bind("<Button-4>", lambda event: self.scroll_to(self.first - WHEEL_DAYS)) # Linux
+            widget.bind("<Button-5>", lambda event: self.scroll_to(self.first + WHEEL_DAYS))
+        self.bind("<Prior>", lambda event: self.scroll_to(self.first - PAGE_DAYS))
+        self.bind("<Next>", lambda event: self.scroll_to(self.first + PAGE_DAYS))
+        self.bind("<Home>", lambda event: self.scroll_to(0))
+        self.bind("<End>", lambda event: self.scroll_to(self.total))
+
+        self.show_latest()
+
+    def show_latest(self):
+        """Re-reads the index and shows the most recent days (the end of the log)."""
+        self.total = self.log_store.day_count()
+        self.scroll_to(self.total)
+
+    def scroll_to(self, first):
+        """Renders the page of blocks starting at file position `first` (clamped to the log)."""
+        self.total = self.log_store.day_count()
+        self.first = max(0, min(first, self.total - PAGE_DAYS))
+        blocks = self.log_store.read_blocks(self.first, PAGE_DAYS)
+        text = "\n".join(format_day_text(label, lines) for label, lines in blocks)
+
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("end", text.lstrip("\n") if text else "The log is empty. Complete a log first!")
+        self.textbox.configure(state="disabled")
+
+        if self.total:
+            last = min(self.first + PAGE_DAYS, self.total)
+            self.scrollbar.set(self.first / self.total, last / self.total)
+            self.position_label.configure(text=f"Days {self.first + 1}-{last} of {self.total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.position_label.configure(text="")
+
+    def on_scrollbar(self, action, *args):
+        """Translates Tk scrollbar commands ("moveto" fraction / "scroll" n units|pages) into day positions."""
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * self.total))
+        elif action == "scroll":
+            step = PAGE_DAYS if args[1] == "pages" else 1
+            self.scroll_to(self.first + int(args[0]) * step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_to(self.first - WHEEL_DAYS if event.delta > 0 else self.first + WHEEL_DAYS)
+        return "break" # Keep the textbox from scrolling its own (single page of) content
+
+    def jump_to_date(self):
+        """Shows the page starting at the entered date, or at the next logged day after it."""
+        text = self.date_entry.get().strip()
+        try:
+            day = datetime.date.fromisoformat(text)
+        except ValueError:
+            self.position_label.configure(text="Please enter a date as YYYY-MM-DD.", text_color="orange")
+            return
+        position = self.log_store.find_position(day)
+        if position is None:
+            self.position_label.configure(text="The log is empty.", text_color="orange")
+            return
+        self.position_label.configure(text_color="#B0B0B0")
+        self.scroll_to(position)
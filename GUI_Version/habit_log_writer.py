@@ -0,0 +1,70 @@
+import queue
+import threading
+
+# --- Background Log Writer ---
+# Saving the log can be slow on a big history or a slow disk, and Tk freezes
+# while its main thread waits. The writer runs save jobs on one worker thread.
+# Results come back through a queue that the GUI drains from its own thread
+# (Tk widgets must only be touched from the main thread).
+
+
+class BackgroundLogWriter:
+    """
+    Runs save jobs on a single worker thread.
+    Jobs are keyed (e.g. by date): submitting a job while another with the same key is
+    still waiting replaces it, so repeated saves of the same day are written only once.
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue() # Keys of jobs waiting to run, in submit order
+        self.results = queue.Queue() # (callback, result, error) waiting to be delivered
+        self.pending = {} # key -> (func, callback) of the latest job for that key
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="habit-log-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, key, func, callback=None):
+        """
+        Queues func() to run on the worker thread. callback(result, error) is called
+        later from poll(), i.e. on the thread that polls (the Tk main loop).
+        """
+        with self.lock:
+            coalesced = key in self.pending
+            self.pending[key] = (func, callback)
+        if not coalesced:
+            self.jobs.put(key)
+
+    def is_busy(self):
+        """True while jobs are queued, running, or have results not yet delivered."""
+        with self.lock:
+            return bool(self.pending) or self.jobs.unfinished_tasks > 0 or not self.results.empty()
+
+    def poll(self):
+        """Delivers the callbacks of finished jobs. Call this from the GUI thread."""
+        while True:
+            try:
+                callback, result, error = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if callback is not None:
+                callback(result, error)
+
+    def close(self, timeout=None):
+        """Waits for queued jobs to be written and stops the worker thread."""
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            key = self.jobs.get()
+            try:
+                if key is None:
+                    return
+                with self.lock:
+                    func, callback = self.pending.pop(key)
+                try:
+                    self.results.put((callback, func(), None))
+                except Exception as e:
+                    self.results.put((callback, None, e))
+            finally:
+                self.jobs.task_done()
@@ -0,0 +1,156 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# --- Opt-in Instrumentation ---
+# Times the hot paths (the process_* steps, saving a day and its phases, time
+# parsing, GUI redraws) into small histograms, to see where the time goes on a
+# slow machine. Off by default, and then it costs nothing: timed() hands back the
+# undecorated function and span() a shared do-nothing context manager.
+#
+# Turn it on with an environment variable, or for the GUI (also the frozen exe) a flag:
+#
+#     HABIT_TRACKER_PROFILE=1                  summary table at exit
+#     HABIT_TRACKER_PROFILE=trace.json         summary + Chrome trace (chrome://tracing, Perfetto)
+#     habit_tracker_app.py --profile[=trace.json]
+#
+# Only the variable is read here: the command-line tools parse their own arguments
+# and would reject the flag, so habit_tracker_app.py turns it into the variable.
+#
+# The summary goes to stderr, or to habit_profile.txt in the working directory
+# when there is no console (a windowed exe).
+
+MAX_TRACE_EVENTS = 1_000_000 # Later events are counted in the histograms but left out of the trace
+BUCKETS = 64 # Bucket b holds durations of b bits, i.e. 2**(b-1) to 2**b - 1 ns
+
+
+def _setting():
+    """The profiling setting from HABIT_TRACKER_PROFILE; None when off."""
+    value = os.environ.get("HABIT_TRACKER_PROFILE", "")
+    return value if value not in ("", "0") else None
+
+
+class Histogram:
+    """Count, total, min, max and power-of-two buckets of durations in nanoseconds."""
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = [0] * BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        self.min = ns if self.min is None else min(self.min, ns)
+        self.max = max(self.max, ns)
+        self.buckets[min(ns.bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (within a factor of 2)."""
+        wanted = self.count * q / 100
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= wanted:
+                return min((1 << bucket) - 1, self.max)
+        return self.max
+
+
+class Profiler:
+    """Collects the histograms (and trace events when a trace file was asked for) and dumps them at exit."""
+
+    def __init__(self, trace_path=None):
+        self.histograms = {}
+        self.trace_path = trace_path
+        self.events = [] # (name, start ns, duration ns, thread id)
+        self.started = time.perf_counter_ns()
+        self.lock = threading.Lock() # The log writer thread records too
+
+    def record(self, name, start, duration):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(duration)
+            if self.trace_path and len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append((name, start, duration, threading.get_ident()))
+
+    def summary_lines(self):
+        lines = [f"{'name':<40} {'count':>8} {'total ms':>10} {'mean us':>10} {'p50 us':>9} {'p90 us':>9} "
+                 f"{'p99 us':>9} {'max us':>10}"]
+        for name, h in sorted(self.histograms.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<40} {h.count:>8} {h.total / 1e6:>10.2f} {h.total / h.count / 1e3:>10.1f} "
+                         f"{h.percentile(50) / 1e3:>9.1f} {h.percentile(90) / 1e3:>9.1f} "
+                         f"{h.percentile(99) / 1e3:>9.1f} {h.max / 1e3:>10.1f}")
+        return lines
+
+    def write_trace(self, path):
+        """Writes the events in the Chrome trace event format (complete "X" events, microseconds)."""
+        pid = os.getpid()
+        with self.lock:
+            events = [{"name": name, "ph": "X", "ts": (start - self.started) / 1e3, "dur": duration / 1e3,
+                       "pid": pid, "tid": tid} for name, start, duration, tid in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def dump(self):
+        """Prints the summary and writes the trace; registered to run at exit."""
+        text = "\n".join(["Habit tracker profile:"] + self.summary_lines()) + "\n"
+        try:
+            if sys.stderr is not None:
+                sys.stderr.write(text)
+            else: # No console, e.g. the windowed exe
+                with open("habit_profile.txt", "w", encoding="utf-8") as f:
+                    f.write(text)
+            if self.trace_path:
+                self.write_trace(self.trace_path)
+        except Exception as e:
+            print(f"Error writing the profile: {e}")
+
+
+_setting_value = _setting()
+PROFILER = None
+if _setting_value is not None:
+    PROFILER = Profiler(_setting_value if _setting_value.endswith(".json") else None)
+    atexit.register(PROFILER.dump)
+
+
+def timed(name):
+    """Decorator that records every call of the function under `name` (returns it unchanged when off)."""
+    def decorate(func):
+        if PROFILER is None:
+            return func
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+@contextlib.contextmanager
+def _span(name):
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        PROFILER.record(name, start, time.perf_counter_ns() - start)
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(name):
+    """Context manager that records the time spent in its block (does nothing when off)."""
+    return _NO_SPAN if PROFILER is None else _span(name)
@@ -0,0 +1,335 @@
+import argparse
+import bisect
+import os
+import sys
+
+# --- Scoring Rules ---
+# Every point a day can earn is defined here, once. The GUI, the terminal version,
+# the importer and the rescoring below all score through SCORER, so changing a
+# threshold is a one-line change and the maximum score follows automatically.
+#
+# A rule gives points for one answer (the field names are the DayRecord/answers
+# keys). "tiers" are (threshold, points[, label]) pairs, best tier first: the
+# value has to be at least the threshold, or at most it with "at_most".
+# "otherwise" is the label when no tier is reached.
+
+SCORING_RULES = (
+    {"field": "morning_walk", "tiers": ((1, 1),)}, # 1 = yes
+    {"field": "healthy_breakfast", "tiers": ((1, 1),)},
+    {"field": "pomodoro_done", "tiers": ((8, 2), (4, 1))},
+    {"field": "junk_food", "at_most": True, "tiers": ((0, 1),)}, # No junk food earns the point
+    {"field": "daily_steps", "tiers": ((7000, 2, "great!"), (5000, 1, "minimum!")),
+     "otherwise": "Below average more steps need!"},
+)
+
+# (minimum total, message), best first. None stands for every available point.
+POINT_MESSAGES = (
+    (None, "Excellent! You hit all your goals today. 💯"),
+    (4, "Great job! You're doing very well. 👍"),
+    (2, "Keep building those habits."),
+    (0, "Start again never give up!"),
+)
+
+
+class CompiledRule:
+    """
+    One rule turned into a sorted threshold list, so scoring a value is a single
+    bisect. "at most" rules are stored negated to use the same lookup.
+    """
+    __slots__ = ("field", "sign", "bounds", "points", "labels")
+
+    def __init__(self, rule):
+        self.field = rule["field"]
+        self.sign = -1 if rule.get("at_most") else 1
+        tiers = sorted(rule["tiers"], key=lambda tier: self.sign * tier[0]) # Lowest bar first
+        self.bounds = [self.sign * tier[0] for tier in tiers]
+        self.points = [0] + [tier[1] for tier in tiers] # points[i] when i bounds are reached
+        self.labels = [rule.get("otherwise")] + [tier[2] if len(tier) > 2 else None for tier in tiers]
+
+    def tier(self, value):
+        """Index into points/labels for a value (0 = no tier reached, also for None)."""
+        if value is None:
+            return 0
+        return bisect.bisect_right(self.bounds, self.sign * value)
+
+
+class Scorer:
+    """The scoring rules compiled once; see SCORING_RULES."""
+
+    def __init__(self, rules=SCORING_RULES, messages=POINT_MESSAGES):
+        self.rules = {rule["field"]: CompiledRule(rule) for rule in rules}
+        self.max_points = sum(max(rule.points) for rule in self.rules.values())
+        self.messages = [(self.max_points if minimum is None else minimum, message) for minimum, message in messages]
+
+    def points_for(self, field, value):
+        """Points one answer earns (0 for a field without a rule)."""
+        rule = self.rules.get(field)
+        return rule.points[rule.tier(value)] if rule else 0
+
+    def label_for(self, field, value):
+        """The label of the tier an answer reached, e.g. "great!" for daily steps."""
+        rule = self.rules.get(field)
+        return rule.labels[rule.tier(value)] if rule else None
+
+    def score(self, answers):
+        """Total points of a day, from an answers dict or a DayRecord."""
+        get = answers.get if isinstance(answers, dict) else lambda field: getattr(answers, field, None)
+        return sum(rule.points[rule.tier(get(field))] for field, rule in self.rules.items())
+
+    def message(self, total):
+        """The end-of-day message for a total."""
+        for minimum, message in self.messages:
+            if total >= minimum:
+                return message
+        return self.messages[-1][1]
+
+    def points_line(self, total):
+        """The "Today's Points" log line for a total."""
+        return f"Today's Points: {total}/{self.max_points} - {self.message(total)}"
+
+    def score_columns(self, columns, missing=-1):
+        """
+        Scores many days at once. `columns` maps each rule's field to an integer
+        NumPy array (one entry per day, `missing` where there is no answer).
+        Returns the array of totals.
+        """
+        import numpy as np # Only needed for batch scoring
+        totals = None
+        for field, rule in self.rules.items():
+            column = np.asarray(columns[field])
+            tiers = np.searchsorted(np.array(rule.bounds, dtype=np.int64), rule.sign * column, side="right")
+            points = np.array(rule.points, dtype=np.int64)[tiers]
+            points[column == missing] = 0
+            totals = points if totals is None else totals + points
+        return totals
+
+
+SCORER = Scorer()
+
+
+# --- Full-History Rescoring ---
+# After a rules change every "Today's Points" line can be recomputed. The log is
+# memory-mapped and handled as a NumPy byte array, a few megabytes of day blocks
+# at a time: lines are found and classified by comparing their first bytes with
+# the labels below, answers are decoded with array arithmetic, the totals come
+# from Scorer.score_columns, and the changed lines are rewritten in a single
+# streaming pass (LogStore.splice). No Python code runs per line except for the
+# points lines that actually change.
+
+# field -> (kind, label[, what marks "yes"]) for the answers rescoring reads back.
+# The labels are the ones HabitTrackerLogic and the terminal version write.
+LOG_FIELDS = {
+    "morning_walk": ("contains", b"Morning Walk:", b"walk done"),
+    "healthy_breakfast": ("contains", b"Breakfast:", b"healthy"),
+    "junk_food": ("yes_no", b"Junk Food:"),
+    "pomodoro_done": ("number", b"Pomodoro/Work Done:"),
+    "daily_steps": ("number", b"Steps Done:"),
+}
+POINTS_LABEL = b"Today's Points:"
+CHUNK_BYTES = 1 << 25 # About 32 MB of the log is decoded at a time
+PADDING = 64 # NUL bytes after each chunk, so lookups a few bytes past a line need no bounds checks
+
+
+class _LogChunk:
+    """The lines of a run of whole day blocks, as arrays of byte positions."""
+
+    def __init__(self, np, data, start, end, block_starts, first_block):
+        self.np = np
+        self.start = start
+        self.size = end - start
+        self.bytes = np.zeros(self.size + PADDING, dtype=np.uint8)
+        self.bytes[:self.size] = np.frombuffer(data, dtype=np.uint8, count=self.size, offset=start)
+        newlines = np.flatnonzero(self.bytes[:self.size] == 10)
+        self.line_starts = newlines + 1 # Lines that follow a newline; a block starts with "\n=== date ==="
+        self.line_ends = np.append(newlines[1:], self.size) # Position of each line's own "\n"
+        if len(self.line_starts) and self.line_starts[-1] >= self.size:
+            self.line_starts, self.line_ends = self.line_starts[:-1], self.line_ends[:-1]
+        relative_starts = np.asarray(block_starts, dtype=np.int64) - start
+        self.line_blocks = np.searchsorted(relative_starts, self.line_starts, side="right") - 1 + first_block
+        self.first_bytes = self.bytes[self.line_starts]
+
+    def byte_at(self, positions):
+        """The byte at each position (0 past the end of the chunk)."""
+        return self.bytes[positions]
+
+    def lines_starting_with(self, label):
+        """Indices of the lines that begin with `label`."""
+        candidates = self.np.flatnonzero(self.first_bytes == label[0])
+        for j, byte in enumerate(label[1:], 1):
+            candidates = candidates[self.bytes[self.line_starts[candidates] + j] == byte]
+        return candidates
+
+    def skip_blanks(self, positions):
+        positions = positions.copy()
+        while True:
+            blank = (self.byte_at(positions) == 32) | (self.byte_at(positions) == 9)
+            if not blank.any():
+                return positions
+            positions[blank] += 1
+
+    def read_numbers(self, positions):
+        """Decodes the digits at each position. Returns (values, found a digit)."""
+        np = self.np
+        values = np.zeros(len(positions), dtype=np.int64)
+        digits = np.zeros(len(positions), dtype=np.int64)
+        active = np.ones(len(positions), dtype=bool)
+        while True:
+            byte = self.byte_at(positions + digits)
+            active &= (byte >= 48) & (byte <= 57)
+            if not active.any():
+                return values, digits > 0
+            values[active] = values[active] * 10 + (byte[active] - 48)
+            digits[active] += 1
+
+    def matches_word(self, positions, word):
+        """Whether each position holds `word`, ignoring ASCII case."""
+        found = self.np.ones(len(positions), dtype=bool)
+        for j, byte in enumerate(word.lower()):
+            found &= (self.byte_at(positions + j) | 0x20) == byte
+        return found
+
+    def ends_answer(self, positions):
+        """True where a yes/no answer ends: at ':' or at the end of the line."""
+        after = self.skip_blanks(positions)
+        byte = self.byte_at(after)
+        return ((self.byte_at(positions) == 58) | (byte == 10) | (byte == 0)
+                | ((byte == 13) & ((self.byte_at(after + 1) == 10) | (self.byte_at(after + 1) == 0))))
+
+    def contains(self, lines, offset, word):
+        """Whether each line has `word` (ignoring case) somewhere from `offset` bytes in."""
+        np = self.np
+        found = np.zeros(len(lines), dtype=bool)
+        first = word.lower()[0]
+        starts = self.line_starts[lines] + offset
+        ends = self.line_ends[lines]
+        # Walk all lines one column at a time; lines drop out once they're found or end
+        column = np.zeros(len(lines), dtype=np.int64)
+        active = np.flatnonzero(starts + len(word) <= ends)
+        while len(active):
+            positions = starts[active] + column[active]
+            hit = ((self.byte_at(positions) | 0x20) == first)
+            hit[hit] = self.matches_word(positions[hit], word)
+            found[active[hit]] = True
+            column[active] += 1
+            active = active[~hit & (starts[active] + column[active] + len(word) <= ends[active])]
+        return found
+
+    def read_field(self, kind, label, word=None):
+        """Returns (block numbers, values) for every line of one answer in this chunk."""
+        np = self.np
+        lines = self.lines_starting_with(label)
+        after_label = self.line_starts[lines] + len(label)
+        if kind == "number":
+            values, found = self.read_numbers(self.skip_blanks(after_label))
+        elif kind == "yes_no":
+            answer = self.skip_blanks(after_label)
+            yes = self.matches_word(answer, b"yes") & self.ends_answer(answer + 3)
+            no = self.matches_word(answer, b"no") & self.ends_answer(answer + 2)
+            values, found = yes.astype(np.int64), yes | no
+        else:
+            values, found = self.contains(lines, len(label), word).astype(np.int64), np.ones(len(lines), dtype=bool)
+        return self.line_blocks[lines[found]], values[found]
+
+
+def _chunks(np, starts, size):
+    """Yields (first block, end block, start byte, end byte) runs of whole blocks of about CHUNK_BYTES."""
+    first = 0
+    while first < len(starts):
+        end = max(int(np.searchsorted(starts, starts[first] + CHUNK_BYTES, side="right")), first + 1)
+        yield first, end, int(starts[first]), int(starts[end]) if end < len(starts) else size
+        first = end
+
+
+def rescore_log(log_store, scorer=SCORER):
+    """
+    Recomputes the "Today's Points" line of every logged day with the current rules.
+    Returns the number of lines that changed. Works with the text log (LogStore),
+    segment by segment with the segmented backend, and with the SQLite backend.
+    """
+    if hasattr(log_store, "map_segments"):
+        return sum(log_store.map_segments(lambda segment: rescore_log(segment, scorer)))
+    if not hasattr(log_store, "splice"):
+        return _rescore_sqlite(log_store, scorer)
+    import numpy as np # Only needed for rescoring
+    for field in scorer.rules:
+        if field not in LOG_FIELDS:
+            raise ValueError(f"Can't rescore {field!r}: it isn't read back from the log")
+    lines = [scorer.points_line(total).encode("utf-8") for total in range(scorer.max_points + 1)]
+
+    def edits(data, starts):
+        for first, end, start, stop in _chunks(np, starts, len(data)):
+            chunk = _LogChunk(np, data, start, stop, starts[first:end], first)
+            columns = {}
+            for field in scorer.rules:
+                blocks, values = chunk.read_field(*LOG_FIELDS[field])
+                column = np.full(end - first, -1, dtype=np.int64)
+                column[blocks - first] = values # A line repeated in a block: the later one wins, as in the parser
+                columns[field] = column
+            totals = scorer.score_columns(columns).tolist()
+            points_lines = chunk.lines_starting_with(POINTS_LABEL)
+            line_starts = (chunk.line_starts[points_lines] + start).tolist()
+            line_ends = (chunk.line_ends[points_lines] + start).tolist()
+            for line_start, line_end, block in zip(line_starts, line_ends, chunk.line_blocks[points_lines].tolist()):
+                if data[line_end - 1] == 13: # Keep a "\r\n" line ending as it is
+                    line_end -= 1
+                line = lines[totals[block - first]]
+                if data[line_start:line_end] != line:
+                    yield line_start, line_end, line
+
+    with log_store.lock:
+        data = log_store.mapped_log()
+        if data is None:
+            return 0
+        changed = log_store.splice(edits(data, np.array(log_store.offsets, dtype=np.int64)))
+    if changed:
+        # Points of older days may have changed without touching the tail blocks the summary cache checks
+        from habit_log_store import discard_summary_cache
+        discard_summary_cache(log_store.log_path)
+    return changed
+
+
+def _rescore_sqlite(log_store, scorer):
+    """SQLite keeps the answers in columns already, so only the totals and log text need updating."""
+    import numpy as np
+    fields = list(scorer.rules)
+    with log_store.lock:
+        rows = log_store.connection.execute(
+            f"SELECT date, points, max_points, log_text, {', '.join(fields)} FROM days ORDER BY date").fetchall()
+    if not rows:
+        return 0
+    columns = {field: np.array([-1 if row[4 + j] is None else row[4 + j] for row in rows], dtype=np.int64)
+               for j, field in enumerate(fields)}
+    totals = scorer.score_columns(columns).tolist()
+    updates = []
+    for row, total in zip(rows, totals):
+        label, points, max_points, log_text = row[:4]
+        if points is None or (points, max_points) == (total, scorer.max_points):
+            continue # No points line to rewrite, or it's already right
+        lines = [scorer.points_line(total) if line.lstrip().startswith("Today's Points:") else line
+                 for line in log_text.split("\n")]
+        updates.append((total, scorer.max_points, "\n".join(lines), label))
+    with log_store.lock, log_store.connection:
+        log_store.connection.executemany("UPDATE days SET points = ?, max_points = ?, log_text = ? WHERE date = ?", updates)
+    return len(updates)
+
+
+def main():
+    from habit_tracker_logic import BACKENDS, HabitTrackerLogic, open_log_store # Imported here: habit_tracker_logic imports this module
+    parser = argparse.ArgumentParser(description="Rescore every logged day with the current scoring rules.")
+    parser.add_argument("--log", help="Log file (default: habit_log.txt next to this script)")
+    parser.add_argument("--backend", choices=BACKENDS, help="Storage backend (default: HABIT_TRACKER_BACKEND or text)")
+    args = parser.parse_args()
+
+    if args.log:
+        log_store = open_log_store(args.log, args.backend or os.environ.get("HABIT_TRACKER_BACKEND", "text"))
+    else:
+        log_store = HabitTrackerLogic(backend=args.backend).log_store
+    try:
+        changed = rescore_log(log_store)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Rescoring failed: {e}")
+    print(f"Rescored: {changed} days changed (maximum is now {SCORER.max_points} points).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import array
+import bisect
+import datetime
+import json
+import re
+import threading
+from habit_journal import JournaledSnapshot
+
+# --- Full-Text Search over the Free-Text Answers ---
+# The sleep quality comment and what junk food was eaten are the only free text
+# in the log. An inverted index maps every word of them to the sorted dates it
+# was used on, so "chips" or "restless" is a dictionary lookup instead of a scan
+# of the whole log. The words are also kept sorted, so the words starting with a
+# query word ("chip" -> "chips") are found with a binary search, and each day's
+# words are kept so re-saving a day only touches the words it used.
+#
+# The index is saved next to the log as a base file (habit_log.txt.search.json)
+# plus a journal (habit_log.txt.search.journal) with one line per saved day.
+# Saving a day appends one line; the base is only rewritten once the journal has
+# grown long (see habit_journal.py). Both carry the log signature they match, like
+# the stats snapshot, so an index that's out of date is rebuilt instead of used.
+
+SEARCH_FIELDS = ("sleep_quality", "what_junk_food")
+FIELD_LABELS = {"sleep_quality": "Sleep quality", "what_junk_food": "Junk food"}
+WORD_RE = re.compile(r"\w+")
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    """The distinct lowercase words of a text, in order."""
+    return list(dict.fromkeys(WORD_RE.findall(text.lower()))) if text else []
+
+
+class SearchIndex(JournaledSnapshot):
+    """Word -> sorted date ordinals, per free-text field, updated one day at a time."""
+
+    def __init__(self):
+        # field -> word -> array of the ordinals of the days that used the word
+        self.postings = {field: {} for field in SEARCH_FIELDS}
+        self.sorted_words = {field: [] for field in SEARCH_FIELDS} # The keys of postings, sorted
+        self.day_words = {} # ordinal -> (field, word) pairs the day was indexed under
+        self.journal_lines = 0
+        self.lock = threading.Lock() # The GUI searches while the log writer thread adds days
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds the index from a full history (any order); a day given twice keeps its first block, like LogStore."""
+        index = cls()
+        seen = set()
+        for record in records:
+            ordinal = record.day.toordinal()
+            if ordinal not in seen:
+                seen.add(ordinal)
+                index.add_day(record)
+        return index
+
+    def _remove(self, ordinal):
+        for field, word in self.day_words.pop(ordinal, ()):
+            days = self.postings[field][word]
+            del days[bisect.bisect_left(days, ordinal)]
+            if not days:
+                del self.postings[field][word]
+                sorted_words = self.sorted_words[field]
+                del sorted_words[bisect.bisect_left(sorted_words, word)]
+
+    def _index_loaded_postings(self):
+        """Fills sorted_words and day_words from postings, after loading a saved base."""
+        for field, words in self.postings.items():
+            self.sorted_words[field] = sorted(words)
+            for word, days in words.items():
+                for ordinal in days:
+                    self.day_words.setdefault(ordinal, []).append((field, word))
+
+    def add_day(self, record):
+        """
+        Indexes one day's free text. Re-saving a day replaces its words. Adding a day
+        after all the others (the usual case) is an append; an earlier one, an insert.
+        """
+        ordinal = record.day.toordinal()
+        with self.lock:
+            self._remove(ordinal) # The day may have been indexed before
+            day_words = []
+            for field in SEARCH_FIELDS:
+                words = self.postings[field]
+                for word in tokenize(getattr(record, field)):
+                    day_words.append((field, word))
+                    days = words.get(word)
+                    if days is None:
+                        words[word] = array.array("i", [ordinal])
+                        bisect.insort(self.sorted_words[field], word)
+                    elif days[-1] < ordinal:
+                        days.append(ordinal)
+                    else:
+                        bisect.insort(days, ordinal)
+            if day_words:
+                self.day_words[ordinal] = day_words
+
+    # --- Queries ---
+
+    def _matching_days(self, field, query_words):
+        """Ordinals where the field has every query word (as a word or the start of one)."""
+        words = self.postings[field]
+        sorted_words = self.sorted_words[field]
+        matches = None
+        for query_word in query_words:
+            days = set()
+            # The words starting with query_word are next to each other in sorted order
+            i = bisect.bisect_left(sorted_words, query_word)
+            while i < len(sorted_words) and sorted_words[i].startswith(query_word):
+                days.update(words[sorted_words[i]])
+                i += 1
+            matches = days if matches is None else matches & days
+            if not matches:
+                return set()
+        return matches or set()
+
+    def search(self, query):
+        """
+        Returns {field: sorted dates} of the days whose text in that field contains
+        every word of the query. A query word also matches longer words ("chip" -> "chips").
+        """
+        query_words = tokenize(query)
+        with self.lock:
+            return {field: [datetime.date.fromordinal(ordinal)
+                            for ordinal in sorted(self._matching_days(field, query_words))] if query_words else []
+                    for field in SEARCH_FIELDS}
+
+    def words(self, field):
+        """The indexed words of a field with their number of days, most used first."""
+        with self.lock:
+            return sorted(((word, len(days)) for word, days in self.postings[field].items()),
+                          key=lambda item: (-item[1], item[0]))
+
+    # --- Persistence ---
+
+    def save(self, path, signature):
+        """Writes the whole index as the new base and starts an empty journal."""
+        with self.lock:
+            data = {"version": INDEX_VERSION, "signature": list(signature),
+                    "postings": {field: {word: days.tolist() for word, days in words.items()}
+                                 for field, words in self.postings.items()}}
+        self.write_base(path, lambda f: json.dump(data, f, ensure_ascii=False))
+
+    def save_day(self, path, record, signature):
+        """
+        Records a day that add_day() just indexed: one journal line, or a fresh base
+        once the journal has grown long.
+        """
+        entry = {"day": record.day.toordinal(), "signature": list(signature),
+                 "text": {field: getattr(record, field) for field in SEARCH_FIELDS}}
+        self.append_entry(path, entry, lambda: self.save(path, signature))
+
+    @classmethod
+    def load(cls, path, signature):
+        """Returns the saved index (base plus journal) if it matches the log signature, otherwise None."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        for field, words in data["postings"].items():
+            if field in index.postings:
+                index.postings[field] = {word: array.array("i", days) for word, days in words.items()}
+        index._index_loaded_postings()
+        saved_signature = data["signature"]
+        for entry in index.replay_journal(path):
+            index.add_day(_JournalDay(entry))
+            saved_signature = entry["signature"]
+        return index if saved_signature == list(signature) else None
+
+
+class _JournalDay:
+    """The fields of a journal line that add_day() reads."""
+
+    def __init__(self, entry):
+        self.day = datetime.date.fromordinal(entry["day"])
+        for field in SEARCH_FIELDS:
+            setattr(self, field, entry["text"].get(field))
@@ -0,0 +1,107 @@
+import customtkinter
+from habit_search import FIELD_LABELS, SEARCH_FIELDS
+
+# --- Notes Search Window ---
+# Searches the sleep quality comments and junk food notes through the inverted
+# index in habit_search.py, e.g. "chips" or "restless", and lists how many days
+# matched and which ones (newest first). The index is loaded by the app's log
+# writer thread; the window shows "Loading notes…" until it arrives.
+
+MAX_DATES_SHOWN = 500 # Per field; the counts always cover every match
+TOP_WORDS = 12 # Suggestions shown before the first search
+
+
+def day_count_text(count):
+    return f"{count} day" if count == 1 else f"{count} days"
+
+
+class SearchWindow(customtkinter.CTkToplevel):
+    def __init__(self, master, load_index):
+        """load_index(callback) loads the search index off the Tk thread and calls callback(index, error)."""
+        super().__init__(master)
+        self.index = None # habit_search.SearchIndex, once loaded
+
+        self.title("Search Notes")
+        self.geometry("600x500")
+        self.grid_rowconfigure(2, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # --- Query bar ---
+        self.top_frame = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.top_frame.grid(row=0, column=0, padx=10, pady=(10, 5), sticky="ew")
+        self.top_frame.grid_columnconfigure(0, weight=1)
+        self.query_entry = customtkinter.CTkEntry(self.top_frame, placeholder_text="e.g. chips or restless", corner_radius=8)
+        self.query_entry.grid(row=0, column=0, padx=(0, 5), sticky="ew")
+        self.query_entry.bind("<Return>", lambda event: self.run_search())
+        self.search_button = customtkinter.CTkButton(self.top_frame, text="Search", width=100, height=28,
+                                                     corner_radius=8, command=self.run_search)
+        self.search_button.grid(row=0, column=1, padx=5)
+
+        self.count_label = customtkinter.CTkLabel(self, text="", text_color="#B0B0B0", anchor="w", justify="left")
+        self.count_label.grid(row=1, column=0, padx=10, pady=(0, 5), sticky="ew")
+
+        # --- Results ---
+        self.textbox = customtkinter.CTkTextbox(self, wrap="word", font=customtkinter.CTkFont(size=13))
+        self.textbox.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="nsew")
+
+        self.count_label.configure(text="Loading notes…")
+        load_index(self.on_index_loaded)
+        self.query_entry.focus()
+
+    def on_index_loaded(self, index, error):
+        """Called on the Tk thread once the index is loaded."""
+        if not self.winfo_exists():
+            return # Closed while loading
+        if error is not None:
+            self.count_label.configure(text=f"Loading notes failed: {error}", text_color="red")
+            print(f"Loading notes failed: {error}")
+            return
+        self.index = index
+        if self.query_entry.get().strip():
+            self.run_search() # Searched for while loading
+        else:
+            self.show_top_words()
+
+    def show_text(self, text):
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("end", text)
+        self.textbox.configure(state="disabled")
+
+    def show_top_words(self):
+        """Lists the most used words of each field as a starting point."""
+        lines = []
+        for field in SEARCH_FIELDS:
+            words = self.index.words(field)[:TOP_WORDS]
+            if words:
+                lines.append(f"{FIELD_LABELS[field]}: " + ", ".join(f"{word} ({days})" for word, days in words))
+        self.count_label.configure(text="Most used words:" if lines else "No notes logged yet.")
+        self.show_text("\n\n".join(lines))
+
+    def run_search(self):
+        if self.index is None:
+            return # Runs once the index has loaded
+        query = self.query_entry.get().strip()
+        if not query:
+            self.show_top_words()
+            return
+        try:
+            results = self.index.search(query)
+        except Exception as e:
+            self.count_label.configure(text=f"Search failed: {e}", text_color="red")
+            print(f"Search failed: {e}")
+            return
+
+        total = len(set().union(*results.values()))
+        counts = ", ".join(f"{FIELD_LABELS[field]} {len(results[field])}" for field in SEARCH_FIELDS)
+        self.count_label.configure(text=f"'{query}': {day_count_text(total)} ({counts})",
+                                   text_color="#B0B0B0")
+        sections = []
+        for field in SEARCH_FIELDS:
+            dates = results[field]
+            if not dates:
+                continue
+            shown = ", ".join(str(day) for day in reversed(dates[-MAX_DATES_SHOWN:]))
+            more = f" … and {len(dates) - MAX_DATES_SHOWN} earlier" if len(dates) > MAX_DATES_SHOWN else ""
+            sections.append(f"{FIELD_LABELS[field]} ({day_count_text(len(dates))}):\n{shown}{more}")
+        self.show_text("\n\n".join(sections) if sections else "No matching days.")
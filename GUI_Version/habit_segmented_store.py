@@ -0,0 +1,329 @@
+import datetime
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+from habit_log_parser import iter_day_blocks, iter_day_records, parse_day_lines
+from habit_log_store import LogStore, format_day_text
+
+# --- Segmented Log Storage ---
+# Optional backend that splits the history into one text segment per year (or
+# per month), e.g.
+#
+#     habit_log_segments/
+#         manifest.json     which segments exist, their file, day count and date range
+#         2023.txt.gz       a closed year, gzip-compressed
+#         2024.txt          the current year: a normal log with its own LogStore index
+#
+# Saving a day only touches that day's segment and the small manifest, so the cost
+# no longer grows with the length of the history. Segments of periods that have
+# ended are compressed; reading them (and the parser) decompresses transparently.
+# Editing a day of a closed period decompresses that one segment, writes and
+# compresses it again.
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+PERIOD_KEYS = {"year": lambda label: label[:4], "month": lambda label: label[:7]} # Segment key of a YYYY-MM-DD label
+SEGMENT_FILE_RE = re.compile(r"^(\d{4}(?:-\d{2})?)\.txt(\.gz)?$")
+
+
+class SegmentedLogStore:
+    """
+    Day blocks stored in per-period segment files, with the same interface as LogStore.
+    An existing single-file log (`legacy_log`) is split into segments the first time.
+    """
+
+    def __init__(self, segment_dir, period="year", legacy_log=None):
+        self.segment_dir = segment_dir
+        self.manifest_path = os.path.join(segment_dir, MANIFEST_NAME)
+        self.lock = threading.RLock()
+        self.stores = {} # Segment key -> LogStore of an uncompressed segment
+        self.archive_cache = None # (key, [(label, lines)]) of the last compressed segment read
+        os.makedirs(segment_dir, exist_ok=True)
+        self.manifest = self._read_manifest()
+        if self.manifest is None:
+            self.manifest = {"version": MANIFEST_VERSION, "period": period, "segments": {}}
+            self._rebuild_manifest()
+            if not self.manifest["segments"] and legacy_log and os.path.exists(legacy_log):
+                self._migrate(legacy_log)
+            self._compress_closed()
+            self._write_manifest()
+        self.period_key = PERIOD_KEYS[self.manifest["period"]]
+
+    # --- Manifest ---
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+    def _write_manifest(self):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def _rebuild_manifest(self):
+        """Recreates the manifest from the segment files on disk (e.g. after it was deleted)."""
+        self.period_key = PERIOD_KEYS[self.manifest["period"]]
+        for name in sorted(os.listdir(self.segment_dir)):
+            match = SEGMENT_FILE_RE.match(name)
+            if match:
+                if len(match.group(1)) == 7:
+                    self.manifest["period"] = "month"
+                    self.period_key = PERIOD_KEYS["month"]
+                self.manifest["segments"][match.group(1)] = {"file": name}
+                self._update_entry(match.group(1))
+
+    def _update_entry(self, key):
+        """Refreshes the day count and date range of one segment in the manifest."""
+        labels = [label for label, _ in self._blocks(key)] if self._is_compressed(key) else self._store(key).day_labels()
+        self.manifest["segments"][key].update(days=len(labels), first=min(labels, default=None),
+                                              last=max(labels, default=None))
+
+    def _keys(self):
+        return sorted(self.manifest["segments"])
+
+    # --- Segments ---
+
+    def _path(self, key):
+        return os.path.join(self.segment_dir, self.manifest["segments"][key]["file"])
+
+    def _is_compressed(self, key):
+        return self.manifest["segments"][key]["file"].endswith(".gz")
+
+    def _store(self, key):
+        """Returns the LogStore of a segment, creating or decompressing the segment if needed."""
+        store = self.stores.get(key)
+        if store is not None:
+            return store
+        segments = self.manifest["segments"]
+        if key not in segments:
+            segments[key] = {"file": f"{key}.txt", "days": 0, "first": None, "last": None}
+        elif self._is_compressed(key):
+            self._decompress(key)
+        store = self.stores[key] = LogStore(self._path(key))
+        return store
+
+    def _decompress(self, key):
+        compressed_path = self._path(key)
+        plain_path = os.path.join(self.segment_dir, f"{key}.txt")
+        with gzip.open(compressed_path, "rb") as src, open(plain_path + ".tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(plain_path + ".tmp", plain_path)
+        self.manifest["segments"][key]["file"] = f"{key}.txt"
+        self._write_manifest() # Before the archive goes away, so the manifest never points at a missing file
+        os.remove(compressed_path)
+        if self.archive_cache is not None and self.archive_cache[0] == key:
+            self.archive_cache = None
+
+    def _compress(self, key):
+        store = self.stores.pop(key, None)
+        if store is not None:
+            store._close_map()
+        plain_path = self._path(key)
+        compressed_path = plain_path + ".gz"
+        with open(plain_path, "rb") as src, gzip.open(compressed_path + ".tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(compressed_path + ".tmp", compressed_path)
+        self.manifest["segments"][key]["file"] = f"{key}.txt.gz"
+        self._write_manifest()
+        for path in (plain_path, plain_path + ".idx"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _compress_closed(self):
+        """Compresses every uncompressed segment of a period that has ended."""
+        current = self.period_key(str(datetime.date.today()))
+        for key in self._keys():
+            if key < current and not self._is_compressed(key):
+                self._compress(key)
+
+    def _blocks(self, key):
+        """Returns [(label, lines)] of a compressed segment, decompressing it once into a small cache."""
+        if self.archive_cache is None or self.archive_cache[0] != key:
+            self.archive_cache = (key, list(iter_day_blocks(self._path(key))))
+        return self.archive_cache[1]
+
+    def _archive_day(self, key, label):
+        for block_label, lines in self._blocks(key):
+            if block_label == label:
+                return lines
+        return None
+
+    def _migrate(self, legacy_log):
+        """Splits a single habit_log.txt into segments, one period at a time (the original is left as it is)."""
+        pending_key = None
+        pending = {}
+        for label, lines in iter_day_blocks(legacy_log):
+            key = self.period_key(label)
+            if key != pending_key and pending:
+                self._store(pending_key).write_days(pending)
+                pending = {}
+            pending_key = key
+            pending.setdefault(label, lines) # A day logged twice keeps its first block, like LogStore
+        if pending:
+            self._store(pending_key).write_days(pending)
+        for key in self._keys():
+            self._update_entry(key)
+
+    def _after_write(self, keys):
+        for key in keys:
+            self._update_entry(key)
+        self._compress_closed()
+        self._write_manifest()
+
+    def map_segments(self, func):
+        """Calls func(LogStore) for every segment (closed ones are decompressed for it) and returns the results."""
+        with self.lock:
+            results = [func(self._store(key)) for key in self._keys()]
+            self._after_write(self._keys())
+            return results
+
+    def signature(self):
+        """Changes whenever any segment or the manifest changes."""
+        size = 0
+        mtime_ns = 0
+        for path in [self.manifest_path] + [self._path(key) for key in self._keys()]:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            mtime_ns = max(mtime_ns, stat.st_mtime_ns)
+        return size, mtime_ns
+
+    # --- Writing ---
+
+    def write_day(self, day, lines):
+        """Saves one day's log lines; only that day's segment is touched."""
+        key = self.period_key(str(day))
+        with self.lock:
+            self._store(key).write_day(day, lines)
+            self._after_write([key])
+
+    def write_days(self, days):
+        """Saves many days (date -> log lines), with one merged write per segment."""
+        by_key = {}
+        for day, lines in days.items():
+            by_key.setdefault(self.period_key(str(day)), {})[day] = lines
+        with self.lock:
+            for key, segment_days in by_key.items():
+                self._store(key).write_days(segment_days)
+            self._after_write(by_key)
+
+    # --- Reading ---
+
+    def format_day(self, day, lines):
+        """Returns one day as the text the log file would show."""
+        return format_day_text(day, lines)
+
+    def day_labels(self):
+        """Returns the day labels, segment by segment in date order and in file order within a segment."""
+        with self.lock:
+            labels = []
+            for key in self._keys():
+                if self._is_compressed(key):
+                    labels.extend(label for label, _ in self._blocks(key))
+                else:
+                    labels.extend(self._store(key).day_labels())
+            return labels
+
+    def read_day(self, day):
+        """Returns the log lines of one day (header excluded), or None if it's not logged."""
+        label = str(day)
+        key = self.period_key(label)
+        with self.lock:
+            if key not in self.manifest["segments"]:
+                return None
+            if self._is_compressed(key):
+                return self._archive_day(key, label)
+            return self._store(key).read_day(label)
+
+    def get_day(self, day):
+        """Returns the parsed DayRecord of one day, or None if it's not logged."""
+        label = str(day)
+        key = self.period_key(label)
+        with self.lock:
+            if key not in self.manifest["segments"]:
+                return None
+            if not self._is_compressed(key):
+                return self._store(key).get_day(label)
+            lines = self._archive_day(key, label)
+        return parse_day_lines(datetime.date.fromisoformat(label), lines) if lines is not None else None
+
+    def get_range(self, start, end):
+        """Returns the DayRecords of every logged day from `start` to `end` (inclusive), sorted by date."""
+        first, last = str(start), str(end)
+        records = []
+        with self.lock:
+            for key in self._keys():
+                if not self.period_key(first) <= key <= self.period_key(last):
+                    continue
+                if not self._is_compressed(key):
+                    records.extend(self._store(key).get_range(first, last))
+                    continue
+                seen = set()
+                for label, lines in sorted(self._blocks(key), key=lambda block: block[0]):
+                    if first <= label <= last and label not in seen:
+                        seen.add(label)
+                        records.append(parse_day_lines(datetime.date.fromisoformat(label), lines))
+        return records
+
+    def iter_records(self):
+        """Yields the DayRecord of every logged day, streaming one segment at a time in date order."""
+        with self.lock:
+            paths = [self._path(key) for key in self._keys()]
+        for path in paths:
+            yield from iter_day_records(path) # .gz segments are decompressed on the fly
+
+    # Paging, for the log viewer: positions count days across all segments in order
+
+    def day_count(self):
+        """Returns the number of day blocks in all segments."""
+        with self.lock:
+            return sum(segment["days"] for segment in self.manifest["segments"].values())
+
+    def read_blocks(self, first, count):
+        """Returns [(label, lines)] for `count` blocks from position `first`, reading only the segments needed."""
+        blocks = []
+        with self.lock:
+            position = 0
+            for key in self._keys():
+                days = self.manifest["segments"][key]["days"]
+                if len(blocks) >= count:
+                    break
+                if position + days > first:
+                    local = max(first - position, 0)
+                    wanted = count - len(blocks)
+                    if self._is_compressed(key):
+                        blocks.extend(self._blocks(key)[local:local + wanted])
+                    else:
+                        blocks.extend(self._store(key).read_blocks(local, wanted))
+                position += days
+        return blocks
+
+    def find_position(self, day):
+        """
+        Returns the position of `day`'s block, or of the first logged day after it
+        (the last block if none is later). Returns None if nothing is logged.
+        """
+        label = str(day)
+        with self.lock:
+            position = 0
+            for key in self._keys():
+                segment = self.manifest["segments"][key]
+                if segment["days"] and segment["last"] >= label:
+                    # The first segment that has a day on or after `label`
+                    if not self._is_compressed(key):
+                        return position + self._store(key).find_position(label)
+                    blocks = self._blocks(key)
+                    return position + min((i for i, (block_label, _) in enumerate(blocks) if block_label >= label),
+                                          key=lambda i: blocks[i][0])
+                position += segment["days"]
+            return position - 1 if position else None
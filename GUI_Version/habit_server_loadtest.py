@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from habit_tracker_server import HabitTrackerServer
+
+# --- Local Load Test for habit_tracker_server.py ---
+# Simulates many users logging a full day at the same time, each over its own
+# keep-alive connection, and reports throughput and latency percentiles.
+# By default the server runs in this process with a temporary data directory;
+# pass --port to test a server that is already running.
+
+
+def day_flow(user):
+    """The requests one simulated user sends to log a whole day."""
+    junk = random.random() < 0.3
+    return [
+        ("POST", f"/users/{user}/reset", {}),
+        ("POST", f"/users/{user}/sleep", {"bedtime": random.choice(["23:30", "2315", "0", "22.45"]),
+                                          "waketime": random.choice(["7", "06:30", "0815"]),
+                                          "sleep_quality": random.choice(["Good", "Restless", "ok"])}),
+        ("POST", f"/users/{user}/morning_walk", {"answer": random.choice(["yes", "no"])}),
+        ("POST", f"/users/{user}/breakfast", {"answer": random.choice([1, 0])}),
+        ("POST", f"/users/{user}/pomodoro", {"sessions": random.randint(0, 10)}),
+        ("POST", f"/users/{user}/junk_food", {"answer": "yes" if junk else "no", "what": "chips" if junk else ""}),
+        ("POST", f"/users/{user}/daily_steps", {"steps": random.randint(0, 12000)}),
+        ("POST", f"/users/{user}/points", {}),
+    ]
+
+
+async def send(reader, writer, method, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def simulate_user(host, port, user, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for method, path, payload in day_flow(user):
+            started = time.perf_counter()
+            status = await send(reader, writer, method, path, payload)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                failures.append((user, path, status))
+    finally:
+        writer.close()
+
+
+async def run_load_test(host, port, users, concurrency):
+    latencies = []
+    failures = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def limited(user):
+        async with limit:
+            await simulate_user(host, port, user, latencies, failures)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(f"user{i}") for i in range(users)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q / 100 * len(latencies)))] * 1000
+    return {
+        "users": users,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "failures": len(failures),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {"p50": round(percentile(50), 2), "p95": round(percentile(95), 2), "p99": round(percentile(99), 2)},
+    }
+
+
+async def main_async(args):
+    if args.port:
+        return await run_load_test(args.host, args.port, args.users, args.concurrency)
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = HabitTrackerServer(data_dir, args.backend)
+        ready = asyncio.Event()
+        serving = asyncio.ensure_future(server.serve(args.host, 0, ready))
+        await ready.wait()
+        try:
+            return await run_load_test(args.host, server.port, args.users, args.concurrency)
+        finally:
+            serving.cancel()
+            server.executor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the habit tracker HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="Port of a running server (default: start one in-process)")
+    parser.add_argument("--users", type=int, default=2000, help="Number of simulated users")
+    parser.add_argument("--concurrency", type=int, default=500, help="Users logging at the same time")
+    parser.add_argument("--backend", choices=("text", "sqlite"), default="text")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import numpy as np
+from habit_history import MISSING
+
+# --- Sleep Analytics ---
+# Turns the logged bedtimes and wake times into minute-of-day arrays and computes,
+# as array operations over the whole history:
+#   - sleep duration, across midnight too (23:00 -> 06:00 is 7:00)
+#   - bedtime drift: how much later (or earlier) bedtime is getting, in minutes per week
+#   - a regularity score: the Sleep Regularity Index, -100..100, where 100 means
+#     asleep and awake at exactly the same clock times on consecutive days
+#   - the correlation of a night's sleep with the next day's points, steps and pomodoros
+#
+# Clock times are measured from noon, so a bedtime of 23:30 (690) and one of
+# 00:30 (750) are an hour apart instead of 23 hours.
+
+DAY_MINUTES = 24 * 60
+NOON = 12 * 60
+MAX_SLEEP_MINUTES = 16 * 60 # Longer "nights" are taken for typos and left out
+DRIFT_DAYS = 30 # Bedtime drift is measured over the last 30 days
+MIN_DAYS = 7 # Fewer usable days than this gives no drift, regularity or correlation
+NEXT_DAY_METRICS = ("points", "daily_steps", "pomodoro_done")
+METRIC_LABELS = {"points": "points", "daily_steps": "steps", "pomodoro_done": "pomodoros"}
+
+
+def format_minutes(minutes):
+    """Formats a duration in minutes as H:MM."""
+    hours, minutes = divmod(int(round(minutes)), 60)
+    return f"{hours}:{minutes:02d}"
+
+
+def format_clock(minutes_after_noon):
+    """Formats a time measured from noon as a HH:MM clock time."""
+    hours, minutes = divmod(int(round(minutes_after_noon + NOON)) % DAY_MINUTES, 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def correlation(x, y):
+    """Pearson correlation of two arrays, or None when there's too little data or no variation."""
+    if len(x) < MIN_DAYS or x.std() == 0 or y.std() == 0:
+        return None
+    return float(np.corrcoef(x, y)[0, 1])
+
+
+class SleepAnalysis:
+    """
+    Sleep arrays of a habit_history.HabitHistory, sorted by date, with the analytics on top.
+    Every night is counted on the day whose record it was logged in.
+    """
+
+    def __init__(self, history):
+        order = np.argsort(history.column("date_ordinal"), kind="stable")
+        self.ordinals = history.column("date_ordinal")[order]
+        bed = history.column("bed_minutes")[order]
+        wake = history.column("wake_minutes")[order]
+        self.metrics = {metric: history.column(metric)[order] for metric in NEXT_DAY_METRICS}
+
+        self.duration = (wake - bed) % DAY_MINUTES # Wrapping past midnight: 23:00 -> 06:00 = 420
+        self.valid = (bed != MISSING) & (wake != MISSING) & (self.duration > 0) & (self.duration <= MAX_SLEEP_MINUTES)
+        self.bed = (bed - NOON) % DAY_MINUTES # Minutes after noon
+        self.wake = self.bed + self.duration # Can pass the next noon for a late night
+
+    def __len__(self):
+        return int(self.valid.sum())
+
+    # --- Duration ---
+
+    def mean_duration(self, days=None):
+        """Average sleep in minutes, over the last `days` calendar days when given; None without data."""
+        valid = self.valid
+        if days is not None and len(self.ordinals):
+            valid = valid & (self.ordinals > self.ordinals[-1] - days)
+        return float(self.duration[valid].mean()) if valid.any() else None
+
+    def mean_bedtime(self):
+        """Average bedtime in minutes after noon, or None without data."""
+        return float(self.bed[self.valid].mean()) if self.valid.any() else None
+
+    # --- Drift and Regularity ---
+
+    def bedtime_drift(self, days=DRIFT_DAYS):
+        """
+        Least-squares slope of bedtime over the last `days` calendar days, in minutes
+        per week (positive = going to bed later). None with fewer than MIN_DAYS nights.
+        """
+        if not len(self.ordinals):
+            return None
+        recent = self.valid & (self.ordinals > self.ordinals[-1] - days)
+        if recent.sum() < MIN_DAYS:
+            return None
+        x = self.ordinals[recent].astype(np.float64)
+        y = self.bed[recent].astype(np.float64)
+        x -= x.mean()
+        return float((x * (y - y.mean())).sum() / (x * x).sum() * 7)
+
+    def _consecutive(self):
+        """Indices i where day i and day i + 1 are consecutive calendar days that both have a night logged."""
+        pairs = np.flatnonzero(np.diff(self.ordinals) == 1)
+        return pairs[self.valid[pairs] & self.valid[pairs + 1]]
+
+    def regularity(self):
+        """
+        Sleep Regularity Index over all consecutive pairs of logged nights: the share of
+        the 24 hours spent in the same state (asleep or awake) on both days, scaled to
+        -100..100. None with fewer than MIN_DAYS pairs.
+        """
+        i = self._consecutive()
+        if len(i) < MIN_DAYS:
+            return None
+        start_a, end_a = self.bed[i], np.minimum(self.wake[i], DAY_MINUTES)
+        start_b, end_b = self.bed[i + 1], np.minimum(self.wake[i + 1], DAY_MINUTES)
+        overlap = np.clip(np.minimum(end_a, end_b) - np.maximum(start_a, start_b), 0, None)
+        different = (end_a - start_a) + (end_b - start_b) - 2 * overlap # Minutes asleep on only one of the days
+        same_share = (DAY_MINUTES - different) / DAY_MINUTES
+        return float(200 * same_share.mean() - 100)
+
+    # --- Next Day ---
+
+    def next_day_correlations(self):
+        """
+        {metric: correlation of the night's sleep duration with that metric on the
+        following calendar day, or None}. Days without the metric are left out.
+        """
+        following = np.searchsorted(self.ordinals, self.ordinals + 1)
+        has_next = following < len(self.ordinals)
+        has_next[has_next] = self.ordinals[following[has_next]] == self.ordinals[has_next] + 1
+        nights = np.flatnonzero(self.valid & has_next)
+        correlations = {}
+        for metric in NEXT_DAY_METRICS:
+            values = self.metrics[metric][following[nights]]
+            present = values != MISSING
+            correlations[metric] = correlation(self.duration[nights][present].astype(np.float64),
+                                               values[present].astype(np.float64))
+        return correlations
+
+    # --- Display ---
+
+    def summary_lines(self):
+        """Short text lines for the summary screen (none until a night with both times is logged)."""
+        if not len(self):
+            return []
+        line = f"Sleep: {format_minutes(self.mean_duration())} on average"
+        recent = self.mean_duration(DRIFT_DAYS)
+        if recent is not None:
+            line += f" ({format_minutes(recent)} over the last {DRIFT_DAYS} days)"
+        line += f", bedtime {format_clock(self.mean_bedtime())}"
+        drift = self.bedtime_drift()
+        if drift is not None:
+            line += f", drifting {drift:+.0f} min/week"
+        lines = [line]
+        regularity = self.regularity()
+        if regularity is not None:
+            lines.append(f"Sleep regularity: {regularity:.0f}/100")
+        correlations = {metric: r for metric, r in self.next_day_correlations().items() if r is not None}
+        if correlations:
+            lines.append("Longer sleep vs. next day: " +
+                         ", ".join(f"{METRIC_LABELS[metric]} {r:+.2f}" for metric, r in correlations.items()))
+        return lines
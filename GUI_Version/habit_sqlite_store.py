@@ -0,0 +1,206 @@
+import datetime
+import os
+import sqlite3
+import threading
+from habit_log_parser import DayRecord, iter_day_blocks, parse_day_lines
+from habit_log_store import format_day_text
+
+# --- SQLite Storage Backend ---
+# Optional alternative to the plain habit_log.txt file. Every day is one row in
+# `days` (structured fields plus the exact log text), and every numeric habit is
+# also a row in `habits` so single habits can be queried without parsing text.
+# Replacing today's entries is an indexed upsert instead of a file rewrite.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY, -- YYYY-MM-DD
+    bed_time TEXT,
+    wake_time TEXT,
+    sleep_quality TEXT,
+    morning_walk INTEGER,
+    healthy_breakfast INTEGER,
+    pomodoro_done INTEGER,
+    junk_food INTEGER,
+    what_junk_food TEXT,
+    daily_steps INTEGER,
+    points INTEGER,
+    max_points INTEGER,
+    log_text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS days_points ON days (points);
+CREATE TABLE IF NOT EXISTS habits (
+    date TEXT NOT NULL,
+    habit TEXT NOT NULL,
+    value INTEGER,
+    PRIMARY KEY (date, habit)
+);
+CREATE INDEX IF NOT EXISTS habits_date ON habits (date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+MIGRATE_BATCH = 10000 # Days per transaction when an existing habit_log.txt is imported
+
+DAY_COLUMNS = ("bed_time", "wake_time", "sleep_quality", "morning_walk", "healthy_breakfast",
+               "pomodoro_done", "junk_food", "what_junk_food", "daily_steps", "points", "max_points")
+HABIT_COLUMNS = ("morning_walk", "healthy_breakfast", "pomodoro_done", "junk_food", "daily_steps")
+
+# Kept as constants so sqlite3's statement cache reuses the prepared statements
+UPSERT_DAY_SQL = (f"INSERT OR REPLACE INTO days (date, {', '.join(DAY_COLUMNS)}, log_text) "
+                  f"VALUES ({', '.join('?' * (len(DAY_COLUMNS) + 2))})")
+UPSERT_HABIT_SQL = "INSERT OR REPLACE INTO habits (date, habit, value) VALUES (?, ?, ?)"
+SELECT_DAY_SQL = f"SELECT date, {', '.join(DAY_COLUMNS)} FROM days"
+
+
+class SQLiteLogStore:
+    """
+    Stores the habit log in an SQLite database (WAL journal) with the same
+    interface as habit_log_store.LogStore.
+    An existing habit_log.txt (`legacy_log`) is imported the first time.
+    """
+
+    def __init__(self, db_path, legacy_log=None):
+        self.db_path = db_path
+        self.lock = threading.RLock() # The GUI may save from a background thread
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        if legacy_log and os.path.exists(legacy_log) and not self._meta("migrated"):
+            self._migrate(legacy_log)
+
+    def _meta(self, key):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _migrate(self, legacy_log):
+        """
+        Copies every day of a habit_log.txt into the database (the file is left as it
+        is). Days already in the database keep their row; a day logged twice in the
+        file keeps its first block, like LogStore.
+        """
+        seen = set(self.day_labels())
+        pending = {}
+        for label, lines in iter_day_blocks(legacy_log):
+            if label in seen:
+                continue
+            seen.add(label)
+            pending[datetime.date.fromisoformat(label)] = lines
+            if len(pending) >= MIGRATE_BATCH:
+                self.write_days(pending)
+                pending = {}
+        if pending:
+            self.write_days(pending)
+        # Recorded last: an import cut short is run again, and skips the days it already copied
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', ?)", (legacy_log,))
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def signature(self):
+        """Changes whenever the database changes (writes land in the -wal file first)."""
+        parts = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                stat = os.stat(path)
+                parts.extend((stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                parts.extend((0, 0))
+        return tuple(parts)
+
+    # --- Writing ---
+
+    def _rows_for(self, day, lines):
+        """Returns the `days` row and the `habits` rows of one day."""
+        label = str(day)
+        record = parse_day_lines(day, lines)
+        day_row = (label, *(getattr(record, name) for name in DAY_COLUMNS), "\n".join(lines))
+        habit_rows = [(label, name, getattr(record, name)) for name in HABIT_COLUMNS
+                      if getattr(record, name) is not None]
+        return day_row, habit_rows
+
+    def write_day(self, day, lines):
+        """Saves one day's log lines, replacing that day if it was already stored."""
+        self.write_days({day: lines})
+
+    def write_days(self, days):
+        """Saves many days in a single transaction with executemany."""
+        day_rows = []
+        habit_rows = []
+        for day, lines in days.items():
+            day_row, rows = self._rows_for(day, lines)
+            day_rows.append(day_row)
+            habit_rows.extend(rows)
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM habits WHERE date = ?", [(row[0],) for row in day_rows])
+            self.connection.executemany(UPSERT_DAY_SQL, day_rows)
+            self.connection.executemany(UPSERT_HABIT_SQL, habit_rows)
+
+    # --- Reading ---
+
+    def format_day(self, day, lines):
+        """Returns one day as the text the log file would show."""
+        return format_day_text(day, lines)
+
+    def day_labels(self):
+        """Returns the day labels (YYYY-MM-DD) in date order."""
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT date FROM days ORDER BY date")]
+
+    def read_day(self, day):
+        """Returns the log lines of one day, or None if it's not stored."""
+        with self.lock:
+            row = self.connection.execute("SELECT log_text FROM days WHERE date = ?", (str(day),)).fetchone()
+        return row[0].split("\n") if row else None
+
+    def day_count(self):
+        """Returns the number of stored days."""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM days").fetchone()[0]
+
+    def read_blocks(self, first, count):
+        """Returns [(label, lines)] for `count` days from position `first` in date order."""
+        with self.lock:
+            rows = self.connection.execute("SELECT date, log_text FROM days ORDER BY date LIMIT ? OFFSET ?",
+                                           (count, max(first, 0))).fetchall()
+        return [(label, text.split("\n")) for label, text in rows]
+
+    def find_position(self, day):
+        """Returns the position of `day`, or of the first stored day after it (the last one if none is later)."""
+        with self.lock:
+            before = self.connection.execute("SELECT COUNT(*) FROM days WHERE date < ?", (str(day),)).fetchone()[0]
+            total = self.connection.execute("SELECT COUNT(*) FROM days").fetchone()[0]
+        return min(before, total - 1) if total else None
+
+    def _record(self, row):
+        return DayRecord(datetime.date.fromisoformat(row[0]), *row[1:])
+
+    def get_day(self, day):
+        """Returns the DayRecord of one day, or None if it's not stored."""
+        with self.lock:
+            row = self.connection.execute(SELECT_DAY_SQL + " WHERE date = ?", (str(day),)).fetchone()
+        return self._record(row) if row else None
+
+    def get_range(self, start, end):
+        """Returns the DayRecords from `start` to `end` (inclusive), sorted by date."""
+        with self.lock:
+            rows = self.connection.execute(SELECT_DAY_SQL + " WHERE date BETWEEN ? AND ? ORDER BY date",
+                                           (str(start), str(end))).fetchall()
+        return [self._record(row) for row in rows]
+
+    def iter_records(self, batch_size=4096):
+        """Yields the DayRecord of every stored day in date order, fetching in batches."""
+        last = ""
+        while True:
+            with self.lock:
+                rows = self.connection.execute(SELECT_DAY_SQL + " WHERE date > ? ORDER BY date LIMIT ?",
+                                               (last, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._record(row)
+            last = rows[-1][0]
@@ -0,0 +1,255 @@
+import bisect
+import collections
+import copy
+import datetime
+import json
+import os
+from habit_scoring import SCORER
+
+# --- Streaks and Rolling Averages ---
+# Kept up to date one day at a time: finalizing a day costs O(1) no matter how
+# long the history is. The whole state is a few counters plus at most 90 recent
+# values per metric, saved as a small JSON snapshot next to the log.
+#
+# Editing a past day doesn't need the history either: besides the counters, the
+# lengths of all streak runs are kept as a histogram per habit, so only the run
+# around the edited day is looked at (reading its neighbouring days) and the
+# longest streak is the largest length left in the histogram.
+
+# habit name -> the DayRecord field of its scoring rule. A habit is kept on a day
+# its rule earns points, so the streaks follow the thresholds in habit_scoring.py.
+STREAK_FIELDS = {"morning_walk": "morning_walk", "healthy_breakfast": "healthy_breakfast",
+                 "no_junk_food": "junk_food", "pomodoro": "pomodoro_done", "daily_steps": "daily_steps"}
+
+
+def kept_test(field):
+    """Test on a DayRecord that says whether the rule for `field` earned any points that day."""
+    rule = SCORER.rules[field]
+    return lambda record: rule.points[rule.tier(getattr(record, field))] > 0
+
+
+def lowest_bar(field):
+    """The smallest answer that earns points for `field`, e.g. 4 pomodoros."""
+    rule = SCORER.rules[field]
+    return rule.sign * rule.bounds[0]
+
+
+# habit name -> test on a DayRecord that says whether the habit was kept that day
+STREAK_HABITS = {habit: kept_test(field) for habit, field in STREAK_FIELDS.items()}
+STREAK_LABELS = {"morning_walk": "Morning walk", "healthy_breakfast": "Healthy breakfast",
+                 "no_junk_food": "No junk food", "pomodoro": f"{lowest_bar('pomodoro_done')}+ pomodoros",
+                 "daily_steps": f"{lowest_bar('daily_steps')}+ steps"}
+ROLLING_METRICS = ("points", "daily_steps", "pomodoro_done")
+ROLLING_WINDOWS = (7, 30, 90) # In calendar days, ending at the last logged day
+SNAPSHOT_VERSION = 2
+
+
+class HabitStats:
+    """Current/longest streak per habit and 7/30/90-day rolling averages, updated incrementally."""
+
+    def __init__(self):
+        self.last_ordinal = None # Date ordinal of the last day added
+        self.current = {habit: 0 for habit in STREAK_HABITS}
+        self.longest = {habit: 0 for habit in STREAK_HABITS}
+        self.runs = {habit: {} for habit in STREAK_HABITS} # habit -> {streak length: how many streaks had it}
+        # (metric, window) -> deque of (ordinal, value) inside the window, and their running sum
+        self.windows = {(metric, days): collections.deque() for metric in ROLLING_METRICS for days in ROLLING_WINDOWS}
+        self.sums = {key: 0 for key in self.windows}
+        self.previous = None # State before the last day was added, so re-saving that day can be undone
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds the stats from a full history (any order) in one pass after sorting by date."""
+        stats = cls()
+        records = sorted(records, key=lambda record: record.day)
+        for i, record in enumerate(records):
+            stats.add_day(record, keep_undo=(i == len(records) - 1)) # Only the last day can be re-saved
+        return stats
+
+    def _state(self):
+        return (self.last_ordinal, dict(self.current), dict(self.longest),
+                {key: collections.deque(values) for key, values in self.windows.items()}, dict(self.sums),
+                {habit: dict(runs) for habit, runs in self.runs.items()})
+
+    def _restore(self, state):
+        self.last_ordinal, self.current, self.longest, self.windows, self.sums, self.runs = copy.deepcopy(state)
+
+    def _count_run(self, habit, length, change):
+        """Adds `change` streaks of `length` days to the habit's run histogram."""
+        if not length:
+            return
+        runs = self.runs[habit]
+        runs[length] = runs.get(length, 0) + change
+        if not runs[length]:
+            del runs[length]
+
+    def is_past_day(self, day):
+        """Whether add_day() would refuse `day`, so it has to go through replace_day()."""
+        ordinal = day.toordinal()
+        return self.last_ordinal is not None and (
+            ordinal < self.last_ordinal or (ordinal == self.last_ordinal and self.previous is None))
+
+    def add_day(self, record, keep_undo=True):
+        """
+        Adds one finalized day. Re-saving the last day replaces it.
+        Returns False (and changes nothing) for a day before the last one: the
+        caller has to use replace_day() in that case.
+        """
+        ordinal = record.day.toordinal()
+        if self.is_past_day(record.day):
+            return False
+        if ordinal == self.last_ordinal:
+            self._restore(self.previous)
+        self.previous = self._state() if keep_undo else None
+
+        consecutive = self.last_ordinal is not None and ordinal == self.last_ordinal + 1
+        for habit, kept in STREAK_HABITS.items():
+            if kept(record):
+                if consecutive:
+                    self._count_run(habit, self.current[habit], -1) # The running streak grows by one
+                self.current[habit] = self.current[habit] + 1 if consecutive else 1
+                self._count_run(habit, self.current[habit], 1)
+                self.longest[habit] = max(self.longest[habit], self.current[habit])
+            else:
+                self.current[habit] = 0
+
+        for (metric, days), window in self.windows.items():
+            value = getattr(record, metric)
+            if value is not None:
+                window.append((ordinal, value))
+                self.sums[(metric, days)] += value
+            while window and window[0][0] <= ordinal - days:
+                self.sums[(metric, days)] -= window.popleft()[1]
+        self.last_ordinal = ordinal
+        return True
+
+    def replace_day(self, record, old_record, get_day):
+        """
+        Replaces a day at or before the last one: a past day that was edited or filled
+        in. `old_record` is what the day was before (None if it wasn't logged) and
+        `get_day(date)` returns the stored DayRecord of another day, or None.
+        Only the streak runs touching the day are walked, by reading the days next to
+        it, and only the windows that contain it change, so the cost doesn't depend
+        on the length of the history.
+        """
+        ordinal = record.day.toordinal()
+        if self.last_ordinal is None or ordinal > self.last_ordinal:
+            return self.add_day(record)
+        self.previous = None # The undo state of the last day doesn't include this change
+        neighbours = {} # ordinal -> stored record, shared between the habits
+
+        def kept_on(day_ordinal, kept):
+            if day_ordinal not in neighbours:
+                neighbours[day_ordinal] = get_day(datetime.date.fromordinal(day_ordinal))
+            return neighbours[day_ordinal] is not None and kept(neighbours[day_ordinal])
+
+        for habit, kept in STREAK_HABITS.items():
+            was_kept = old_record is not None and kept(old_record)
+            if kept(record) == was_kept:
+                continue
+            before = 0 # Length of the streak ending the day before
+            while ordinal - before > 1 and kept_on(ordinal - before - 1, kept):
+                before += 1
+            after = 0 # Length of the streak starting the day after
+            while ordinal + after < self.last_ordinal and kept_on(ordinal + after + 1, kept):
+                after += 1
+            # Keeping the habit that day joins the two streaks into one; not keeping it splits them
+            change = -1 if was_kept else 1
+            self._count_run(habit, before + 1 + after, change)
+            self._count_run(habit, before, -change)
+            self._count_run(habit, after, -change)
+            self.longest[habit] = max(self.runs[habit], default=0)
+            if ordinal + after == self.last_ordinal:
+                self.current[habit] = after if was_kept else before + 1 + after
+
+        for (metric, days), window in self.windows.items():
+            if ordinal <= self.last_ordinal - days:
+                continue # Too old for this window
+            values = [entry for entry in window if entry[0] != ordinal]
+            value = getattr(record, metric)
+            if value is not None:
+                bisect.insort(values, (ordinal, value))
+            self.windows[(metric, days)] = collections.deque(values)
+            self.sums[(metric, days)] = sum(value for _, value in values)
+        return True
+
+    def current_streaks(self, as_of_ordinal=None):
+        """
+        Current streak per habit. When `as_of_ordinal` (e.g. today) is more than one day
+        after the last logged day, the streaks have been broken by the missing days.
+        """
+        if as_of_ordinal is not None and self.last_ordinal is not None and as_of_ordinal > self.last_ordinal + 1:
+            return {habit: 0 for habit in self.current}
+        return dict(self.current)
+
+    def rolling_average(self, metric, days):
+        """Average of a metric over the logged days in the last `days` days, or None if there are none."""
+        window = self.windows[(metric, days)]
+        return self.sums[(metric, days)] / len(window) if window else None
+
+    # --- Snapshot ---
+
+    def to_dict(self):
+        def state_dict(state):
+            last_ordinal, current, longest, windows, sums, runs = state
+            return {"last_ordinal": last_ordinal, "current": current, "longest": longest,
+                    "runs": {habit: list(map(list, lengths.items())) for habit, lengths in runs.items()},
+                    "windows": {f"{metric}:{days}": list(map(list, values)) for (metric, days), values in windows.items()}}
+        return {"state": state_dict(self._state()),
+                "previous": state_dict(self.previous) if self.previous is not None else None}
+
+    @classmethod
+    def from_dict(cls, data):
+        def load_state(stats, state):
+            stats.last_ordinal = state["last_ordinal"]
+            stats.current.update(state["current"])
+            stats.longest.update(state["longest"])
+            stats.runs = {habit: {length: count for length, count in state["runs"][habit]} for habit in STREAK_HABITS}
+            for key, values in state["windows"].items():
+                metric, days = key.split(":")
+                window = collections.deque(tuple(value) for value in values)
+                stats.windows[(metric, int(days))] = window
+                stats.sums[(metric, int(days))] = sum(value for _, value in window)
+        stats = cls()
+        if data["previous"] is not None:
+            load_state(stats, data["previous"])
+            stats.previous = stats._state()
+        load_state(stats, data["state"])
+        return stats
+
+    def save(self, path, signature):
+        """Writes the snapshot, tagged with the log signature it matches."""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "signature": list(signature), **self.to_dict()}, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, signature):
+        """Returns the saved stats if the snapshot matches the log signature, otherwise None."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != SNAPSHOT_VERSION or data.get("signature") != list(signature):
+            return None
+        return cls.from_dict(data)
+
+    # --- Display ---
+
+    def summary_lines(self, as_of_ordinal=None):
+        """Short text lines for the summary screen."""
+        current = self.current_streaks(as_of_ordinal)
+        streaks = ", ".join(f"{STREAK_LABELS[habit]} {current[habit]} (best {self.longest[habit]})"
+                            for habit in STREAK_HABITS)
+        lines = [f"Streaks: {streaks}"]
+        for days in ROLLING_WINDOWS:
+            points = self.rolling_average("points", days)
+            if points is None:
+                continue
+            steps = self.rolling_average("daily_steps", days)
+            pomodoros = self.rolling_average("pomodoro_done", days)
+            lines.append(f"Last {days} days: {points:.1f} points, "
+                         f"{steps or 0:,.0f} steps, {pomodoros or 0:.1f} pomodoros per day")
+        return lines
@@ -0,0 +1,278 @@
+import datetime
+import hashlib
+import io
+import json
+import os
+import re
+import numpy as np
+from habit_history import COLUMNS, MISSING, HabitHistory, record_to_row
+from habit_journal import JournaledSnapshot, discard # discard() is used on cache_path() by tools that rewrite the log
+from habit_log_parser import iter_day_records
+from habit_log_store import SUMMARY_CACHE_SUFFIX
+
+# --- Persistent Summary Cache ---
+# Per-day aggregates (the columns of habit_history.HabitHistory) and per-month
+# aggregates of the whole log, saved next to it (habit_log.txt.summary.npz), so
+# opening the history or the summary screen doesn't parse the log again at every
+# launch.
+#
+# The cache is tagged with the log's size and mtime, with hashes of the last
+# TAIL_BLOCKS day blocks, and with hashes of everything before the last block in
+# PREFIX_CHUNK pieces. When the log has changed since:
+#   - if everything before the last block is still the same, only the last block
+#     (today, possibly rewritten) and whatever was appended after it are parsed;
+#   - otherwise older content changed and the cache is rebuilt from the whole log.
+# Checking reads and hashes the log once (well under a second for a million days),
+# but rebuilding is O(history), about 11 s for a million days, so the GUI only
+# opens the cache from its log writer thread, never from the Tk thread. Tools that
+# rewrite older days in bulk delete the cache (habit_log_store.discard_summary_cache).
+# Saving a day from the app updates the cache directly: one journal line
+# (habit_log.txt.summary.journal) per day on top of the base file, see habit_journal.py.
+#
+# Only the text backend has blocks to hash; with the others the cache is used
+# while the store's signature matches and rebuilt otherwise.
+
+CACHE_VERSION = 2
+TAIL_BLOCKS = 8 # Day blocks at the end of the log whose hashes are kept
+TAIL_BYTES = 1 << 16 # First guess of how much of the end of the log holds them
+PREFIX_CHUNK = 1 << 20 # Bytes per hash of the log before the last block
+HEADER_BYTES_RE = re.compile(rb"^=== (\d{4}-\d{2}-\d{2}) ===\r?$", re.MULTILINE)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+MONTH_COUNTS = ("morning_walk", "healthy_breakfast", "junk_food") # Per month: days answered yes
+MONTH_AVERAGES = ("points", "daily_steps", "pomodoro_done", "bed_minutes", "wake_minutes") # Per month: mean
+
+
+def cache_path(log_path):
+    return log_path + SUMMARY_CACHE_SUFFIX
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def tail_blocks(f, size):
+    """
+    Returns [[offset, length, hash, date]] of the last TAIL_BLOCKS day blocks of an
+    open log (a block runs from its header line to the next header), oldest first.
+    """
+    window = TAIL_BYTES
+    while True:
+        start = max(0, size - window)
+        f.seek(start)
+        data = f.read(size - start)
+        headers = [(match.start(), match.group(1).decode("ascii")) for match in HEADER_BYTES_RE.finditer(data)]
+        if len(headers) > TAIL_BLOCKS or start == 0:
+            break
+        window *= 4
+    headers = headers[-TAIL_BLOCKS:]
+    ends = [a for a, _ in headers[1:]] + [len(data)]
+    return [[start + a, b - a, _digest(data[a:b]), label] for (a, label), b in zip(headers, ends)]
+
+
+def prefix_hashes(f, end, hashes=(), old_end=0, changed_start=0, changed_stop=0):
+    """
+    Returns the hashes of bytes 0..end of an open log, one per PREFIX_CHUNK piece
+    (the last one shorter). Given the `hashes` of 0..old_end, only the pieces that
+    overlap changed_start..changed_stop or reach past the shorter end are read again.
+    """
+    keep_before = min(old_end, end) // PREFIX_CHUNK # Pieces from here on changed length or are new
+    stale = range(changed_start // PREFIX_CHUNK, -(-changed_stop // PREFIX_CHUNK))
+    result = []
+    for i in range(-(-end // PREFIX_CHUNK)):
+        if i < keep_before and i < len(hashes) and i not in stale:
+            result.append(hashes[i])
+        else:
+            f.seek(i * PREFIX_CHUNK)
+            result.append(_digest(f.read(min(PREFIX_CHUNK, end - i * PREFIX_CHUNK))))
+    return result
+
+
+def month_aggregates(history):
+    """
+    Per-month aggregates of the per-day columns, as arrays: "month" (months since
+    1970-01), "days" logged, yes counts of MONTH_COUNTS and means of MONTH_AVERAGES
+    (NaN for a month without that value).
+    """
+    ordinals = history.column("date_ordinal")
+    months_since_1970 = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    months, index = np.unique(months_since_1970, return_inverse=True)
+    aggregates = {"month": months, "days": np.bincount(index, minlength=len(months))}
+    for name in MONTH_COUNTS:
+        aggregates[name] = np.bincount(index, weights=history.column(name) == 1, minlength=len(months)).astype(np.int64)
+    for name in MONTH_AVERAGES:
+        column = history.column(name)
+        present = column != MISSING
+        totals = np.bincount(index[present], weights=column[present], minlength=len(months))
+        counts = np.bincount(index[present], minlength=len(months))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            aggregates[name] = totals / counts
+    return aggregates
+
+
+class SummaryCache(JournaledSnapshot):
+    """The per-day history and per-month aggregates of a log, plus what's needed to check them against it."""
+
+    def __init__(self, history, signature, tail=None, tail_owned=False, prefix=None):
+        self.history = history
+        self.signature = list(signature)
+        self.tail = tail or [] # tail_blocks() of the log the cache matches (text backend only)
+        self.prefix = prefix or [] # prefix_hashes() of the log up to the last tail block
+        # Whether the last block is the first one of its day, i.e. the one the history row came from
+        self.tail_owned = tail_owned
+        self.months = None # month_aggregates(), computed when first asked for
+        self.journal_lines = 0
+
+    # --- Building ---
+
+    @classmethod
+    def build(cls, log_store):
+        """Parses the whole log once."""
+        signature = log_store.signature()
+        log_path = getattr(log_store, "log_path", None)
+        seen = set()
+        last_new = [False]
+
+        def records():
+            for record in log_store.iter_records():
+                ordinal = record.day.toordinal()
+                last_new[0] = ordinal not in seen
+                seen.add(ordinal)
+                yield record
+
+        history = HabitHistory.from_records(records())
+        tail = []
+        prefix = []
+        if log_path is not None and os.path.exists(log_path):
+            with open(log_path, "rb") as f:
+                tail = tail_blocks(f, signature[0])
+                prefix = prefix_hashes(f, tail[-1][0]) if tail else []
+        return cls(history, signature, tail, last_new[0], prefix)
+
+    @classmethod
+    def open(cls, path, log_store):
+        """
+        Returns the cache for the log: the saved one if it still matches, brought up
+        to date if only the end of the log changed, otherwise rebuilt. A cache that
+        had to be brought up to date or rebuilt is saved again. Rebuilding parses the
+        whole log, so don't call this on a GUI thread.
+        """
+        signature = list(log_store.signature())
+        cache = cls.load(path)
+        if cache is not None and cache.signature == signature:
+            return cache
+        try:
+            updated = cache is not None and cache._update_tail(log_store, signature)
+        except (OSError, ValueError):
+            updated = False # E.g. the log was cut short mid-write; parse it all
+        if not updated:
+            cache = cls.build(log_store)
+        cache.save(path)
+        return cache
+
+    def _update_tail(self, log_store, signature):
+        """
+        Parses only the last block and what follows it, if everything before it is
+        unchanged. Returns False when the whole log has to be parsed instead.
+        """
+        log_path = getattr(log_store, "log_path", None)
+        if log_path is None or not self.tail or signature[0] < self.tail[-1][0]:
+            return False
+        last_offset = self.tail[-1][0]
+        with open(log_path, "rb") as f:
+            for offset, length, digest, _ in self.tail[:-1]:
+                f.seek(offset)
+                if _digest(f.read(length)) != digest:
+                    return False # Recent content changed, no need to read further back
+            if prefix_hashes(f, last_offset) != self.prefix:
+                return False # Older content changed, even if the size didn't
+            f.seek(last_offset)
+            text = f.read(signature[0] - last_offset).decode("utf-8")
+            new_tail = tail_blocks(f, signature[0])
+            new_prefix = prefix_hashes(f, new_tail[-1][0] if new_tail else 0, self.prefix, last_offset)
+
+        rows = [record_to_row(record) for record in iter_day_records(io.StringIO(text, newline=None))]
+        if not rows or rows[0][0] != datetime.date.fromisoformat(self.tail[-1][3]).toordinal():
+            return False # The last block isn't the same day any more
+        if self.tail_owned:
+            self.history.upsert_row(rows[0]) # Today's block rewritten
+        owned = self.tail_owned
+        for row in rows[1:]:
+            owned = row[0] not in self.history.rows
+            self.history.extend_rows([row]) # A day logged again keeps its first block
+        self.tail = new_tail
+        self.prefix = new_prefix
+        self.tail_owned = owned
+        self.signature = signature
+        self.months = None
+        return True
+
+    # --- Updating ---
+
+    def add_day(self, record):
+        """Adds or replaces a day that was just saved (call save_day() once it's written)."""
+        self.history.upsert(record)
+        self.months = None
+
+    def month_aggregates(self):
+        if self.months is None:
+            self.months = month_aggregates(self.history)
+        return self.months
+
+    # --- Persistence ---
+
+    def _meta(self):
+        return {"version": CACHE_VERSION, "signature": self.signature, "tail": self.tail, "tail_owned": self.tail_owned}
+
+    def save(self, path):
+        """Writes the whole cache as the new base and starts an empty journal."""
+        arrays = {name: self.history.column(name) for name in COLUMNS}
+        arrays.update({f"month_{name}": values for name, values in self.month_aggregates().items()})
+        meta = json.dumps({**self._meta(), "prefix": self.prefix})
+        self.write_base(path, lambda f: np.savez(f, meta=np.array(meta), **arrays), binary=True)
+
+    def save_day(self, path, record, log_store):
+        """
+        Records a day that add_day() just added, after the log was written: one
+        journal line, or a fresh base once the journal has grown long.
+        """
+        old_size = self.signature[0]
+        self.signature = list(log_store.signature())
+        log_path = getattr(log_store, "log_path", None)
+        old_prefix = self.prefix
+        if log_path is not None:
+            old_end = self.tail[-1][0] if self.tail else 0
+            start, end = log_store.block_span(record.day)
+            if self.signature[0] != old_size:
+                end = self.signature[0] # The day changed size: everything after it moved
+            with open(log_path, "rb") as f:
+                self.tail = tail_blocks(f, self.signature[0])
+                self.prefix = prefix_hashes(f, self.tail[-1][0], old_prefix, old_end, start, end)
+            self.tail_owned = log_store.last_block_is_first()
+        # Only the prefix hashes that changed go in the journal (usually one, for an appended day)
+        changed = [[i, digest] for i, digest in enumerate(self.prefix) if i >= len(old_prefix) or old_prefix[i] != digest]
+        entry = {"row": list(record_to_row(record)), "prefix_length": len(self.prefix), "prefix_changes": changed,
+                 **self._meta()}
+        self.append_entry(path, entry, lambda: self.save(path))
+
+    @classmethod
+    def load(cls, path):
+        """Returns the saved cache (base plus journal), or None if there's none or it can't be read."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta.get("version") != CACHE_VERSION:
+                    return None
+                cache = cls(HabitHistory.from_columns({name: data[name] for name in COLUMNS}),
+                            meta["signature"], meta["tail"], meta["tail_owned"], meta["prefix"])
+                cache.months = {name[len("month_"):]: data[name] for name in data.files if name.startswith("month_")}
+        except (OSError, ValueError, KeyError):
+            return None
+        for entry in cache.replay_journal(path):
+            cache.history.upsert_row(tuple(entry["row"]))
+            cache.signature, cache.tail, cache.tail_owned = entry["signature"], entry["tail"], entry["tail_owned"]
+            cache.prefix = cache.prefix[:entry["prefix_length"]]
+            cache.prefix += [None] * (entry["prefix_length"] - len(cache.prefix))
+            for i, digest in entry["prefix_changes"]:
+                cache.prefix[i] = digest
+            cache.months = None
+        return cache
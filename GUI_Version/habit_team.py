@@ -0,0 +1,208 @@
+import argparse
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+from habit_log_parser import DayRecord, POMODORO_MINUTES, format_work_hours, iter_day_rows
+from habit_streaks import STREAK_HABITS, STREAK_LABELS, HabitStats
+
+# --- Team Leaderboard ---
+# Summarizes every team member's habit log in a shared directory and ranks them
+# by average points. Each log is parsed and summarized by a worker process, so a
+# directory with hundreds of logs uses every core; the summaries are cached per
+# file by modification time and size, so a rerun only parses the logs that changed.
+#
+# A member is either a "<name>.txt" log in the directory or a "<name>/habit_log.txt"
+# below it (other files in the member folders, like notes.txt, are left out):
+#
+#     team/alice.txt
+#     team/bob/habit_log.txt
+#
+#     python habit_team.py team/
+
+CACHE_NAME = ".habit_team_cache.json" # Kept in the team directory
+CACHE_VERSION = 1
+LOG_NAME = "habit_log.txt"
+
+
+def discover_logs(directory):
+    """Returns {member name: log path} for every log in or below `directory`."""
+    logs = {}
+    for root, dirs, files in os.walk(directory):
+        # Hidden folders and the segmented backend's per-year files aren't member logs
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and not d.endswith("_segments"))
+        top_level = root == directory
+        for name in sorted(files):
+            if top_level and name.endswith(".txt"):
+                member = os.path.splitext(name)[0]
+            elif not top_level and name == LOG_NAME:
+                member = os.path.relpath(root, directory).replace(os.sep, "/")
+            else:
+                continue
+            logs.setdefault(member, os.path.join(root, name))
+    return logs
+
+
+def summarize_log(path):
+    """
+    Parses one log and returns its summary as a plain dict (it's sent back from the
+    worker process and saved in the cache). A day logged twice counts once, with its
+    first block, like LogStore.
+    """
+    rows = {}
+    for row in iter_day_rows(path):
+        rows.setdefault(row[0], row)
+    records = [DayRecord(*row) for row in rows.values()]
+    points = [record.points for record in records if record.points is not None]
+    stats = HabitStats.from_records(records)
+    return {
+        "days": len(records),
+        "last_day": stats.last_ordinal,
+        "points_total": sum(points),
+        "points_days": len(points),
+        "pomodoros": sum(record.pomodoro_done or 0 for record in records),
+        "current_streaks": stats.current,
+        "longest_streaks": stats.longest,
+    }
+
+
+def _summarize_job(path):
+    """Worker entry point: (path, summary or None, error message or None)."""
+    try:
+        return path, summarize_log(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+# --- Cache ---
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+
+
+def save_cache(cache_path, entries):
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": entries}, f)
+    os.replace(temp_path, cache_path)
+
+
+def file_key(path):
+    """(mtime in ns, size): a log whose key changed is parsed again."""
+    info = os.stat(path)
+    return [info.st_mtime_ns, info.st_size]
+
+
+def summarize_team(directory, workers=None, cache_path=None):
+    """
+    Returns ({member: summary}, [(member, error)]) for every log in `directory`.
+    Summaries of unchanged logs come from the cache; the rest are computed in a
+    process pool of `workers` processes (default: one per core).
+    """
+    cache_path = cache_path or os.path.join(directory, CACHE_NAME)
+    cache = load_cache(cache_path)
+    logs = discover_logs(directory)
+    summaries, errors, entries, todo = {}, [], {}, []
+    for member, path in logs.items():
+        key = os.path.abspath(path)
+        try:
+            stamp = file_key(path)
+        except OSError as e:
+            errors.append((member, str(e)))
+            continue
+        cached = cache.get(key)
+        if cached is not None and cached["stamp"] == stamp:
+            summaries[member] = cached["summary"]
+            entries[key] = cached
+        else:
+            todo.append((member, path, key, stamp))
+
+    if todo:
+        paths = [path for _, path, _, _ in todo]
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        if workers == 1: # Not worth starting processes for
+            results = map(_summarize_job, paths)
+        else:
+            pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(_summarize_job, paths, chunksize=max(1, len(paths) // (workers * 4)))
+        try:
+            for (member, _, key, stamp), (_, summary, error) in zip(todo, results):
+                if error is not None:
+                    errors.append((member, error))
+                    continue
+                summaries[member] = summary
+                entries[key] = {"stamp": stamp, "summary": summary}
+        finally:
+            if workers > 1:
+                pool.shutdown()
+
+    # Logs that are gone drop out of the cache too
+    if entries != cache:
+        try:
+            save_cache(cache_path, entries)
+        except OSError as e:
+            print(f"Couldn't save the team cache: {e}")
+    return summaries, errors
+
+
+# --- Leaderboard ---
+
+def leaderboard(summaries, as_of_ordinal=None):
+    """
+    Reduces the summaries to leaderboard rows, best average points first:
+    (member, days, average points, current streak, its habit, longest streak, its habit, pomodoro hours).
+    Current streaks are broken when a log stopped more than a day before `as_of_ordinal`.
+    """
+    rows = []
+    for member, summary in summaries.items():
+        if not summary["days"]:
+            continue
+        current = summary["current_streaks"]
+        if as_of_ordinal is not None and summary["last_day"] is not None and as_of_ordinal > summary["last_day"] + 1:
+            current = {habit: 0 for habit in current}
+        current_habit = max(STREAK_HABITS, key=lambda habit: current.get(habit, 0))
+        longest_habit = max(STREAK_HABITS, key=lambda habit: summary["longest_streaks"].get(habit, 0))
+        average = summary["points_total"] / summary["points_days"] if summary["points_days"] else 0
+        rows.append((member, summary["days"], average, current.get(current_habit, 0), current_habit,
+                     summary["longest_streaks"].get(longest_habit, 0), longest_habit,
+                     format_work_hours(summary["pomodoros"] * POMODORO_MINUTES)))
+    rows.sort(key=lambda row: (-row[2], row[0]))
+    return rows
+
+
+def leaderboard_lines(rows):
+    lines = [f"{'#':>3} {'member':<20} {'days':>6} {'avg pts':>8} {'current streak':<28} "
+             f"{'longest streak':<28} {'pomodoro hours':>14}"]
+    for rank, (member, days, average, current, current_habit, longest, longest_habit, hours) in enumerate(rows, 1):
+        current_text = f"{current} {STREAK_LABELS[current_habit]}" if current else "-"
+        longest_text = f"{longest} {STREAK_LABELS[longest_habit]}" if longest else "-"
+        lines.append(f"{rank:>3} {member:<20} {days:>6} {average:>8.1f} {current_text:<28} "
+                     f"{longest_text:<28} {hours:>14}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank every habit log in a shared directory.")
+    parser.add_argument("directory", help="Directory with one habit log per team member")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--cache", help=f"Summary cache file (default: {CACHE_NAME} in the directory)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        sys.exit(f"Not a directory: {args.directory}")
+    summaries, errors = summarize_team(args.directory, args.workers, args.cache)
+    for member, error in errors:
+        print(f"Skipped {member}: {error}")
+    print("\n".join(leaderboard_lines(leaderboard(summaries, datetime.date.today().toordinal()))))
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support() # Worker processes of the frozen exe
+    main()
@@ -0,0 +1,52 @@
+import functools
+import re
+
+# --- Time Parsing Engine ---
+# Accepts exactly what the old strptime loop over ("%H:%M", "%H", "%H.%M") did,
+# with one precompiled regex instead of up to three strptime calls that raise
+# and catch ValueError. The hour/minute patterns are the ones strptime itself
+# uses for %H and %M (\d also matches non-ASCII digits, just like strptime).
+
+TIME_RE = re.compile(r"(2[0-3]|[0-1]\d|\d)(?:[:.]([0-5]\d|\d))?")
+MISSING_MINUTES = -1 # time_to_minutes() of a missing time, the MISSING of the columnar formats
+
+
+def _parse_time(text):
+    text = text.strip()
+    # Handle 4-digit time like "2311" => "23:11"
+    if len(text) == 4 and text.isdigit():
+        text = text[:2] + ":" + text[2:]
+    match = TIME_RE.fullmatch(text)
+    if match is None:
+        return None
+    hours, minutes = match.groups()
+    return f"{int(hours):02d}:{int(minutes or 0):02d}"
+
+
+@functools.lru_cache(maxsize=4096)
+def clean_time(text):
+    """
+    Parses a time string ("23:30", "2330", "23", "23.30", "7:30") into "HH:MM".
+    Returns None if it isn't a valid time. Results are kept in a bounded LRU cache,
+    since logs and imports repeat the same handful of times over and over.
+    """
+    return _parse_time(text)
+
+
+def time_to_minutes(hh_mm):
+    """Converts an "HH:MM" string to minutes after midnight, or MISSING_MINUTES if it can't be read."""
+    if not hh_mm:
+        return MISSING_MINUTES
+    hours, _, minutes = hh_mm.partition(":")
+    if not (hours.isdigit() and minutes.isdigit()):
+        return MISSING_MINUTES
+    return int(hours) * 60 + int(minutes)
+
+
+def clean_times(values):
+    """
+    Validates a whole column of time strings at once.
+    Returns a list with "HH:MM" or None for every value, parsing each distinct value once.
+    """
+    parsed = {text: clean_time(text) for text in set(values)}
+    return [parsed[text] for text in values]
@@ -1,10 +1,19 @@
 # Habit_Tracker_app.py
-import customtkinter
+import time
+STARTUP_BEGAN = time.perf_counter() # For --startup-time, taken before the heavy imports
 import os
 import sys
-import subprocess
+# --profile[=trace.json] turns on habit_profiler.py, which reads HABIT_TRACKER_PROFILE when it's
+# first imported, so the flag is turned into the variable before the modules that use it
+for arg in sys.argv[1:]:
+    if arg == "--profile" or arg.startswith("--profile="):
+        os.environ["HABIT_TRACKER_PROFILE"] = arg.partition("=")[2] or "1"
+import customtkinter
 import datetime # Added for time comparisons if needed in future, but not strictly for current logic
 from habit_tracker_logic import HabitTrackerLogic, get_clean_time, parse_yes_no, parse_number
+from habit_log_writer import BackgroundLogWriter
+from habit_profiler import timed
+IMPORTS_DONE = time.perf_counter()
 
 class HabitTrackerApp(customtkinter.CTk):
     def __init__(self):
@@ -35,21 +44,27 @@ class HabitTrackerApp(customtkinter.CTk):
     
         # --- 2. Initialize Backend Logic ---
         self.tracker_logic = HabitTrackerLogic()
+        # Saves run on a worker thread so a slow disk never freezes the window
+        self.log_writer = BackgroundLogWriter()
+        self.log_writer_polling = False # True while an after() loop is delivering save results
+        self.log_viewer = None # In-app log window, created by show_log_file()
+        self.search_window = None # Notes search window, created by show_search()
+        self.protocol("WM_DELETE_WINDOW", self.close_app)
 
         # --- 3. Main Frame Setup ---
+        self.fonts = {} # Shared CTkFont objects, see get_font()
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
         self.main_frame = customtkinter.CTkFrame(self, corner_radius=15)
         self.main_frame.grid(row=0, column=0, padx=30, pady=30, sticky="nsew")
         self.main_frame.grid_columnconfigure(0, weight=1)
-        for i in range(15): # More rows for a flexible layout
-            self.main_frame.grid_rowconfigure(i, weight=1)
+        self.main_frame.grid_rowconfigure(tuple(range(15)), weight=1) # More rows for a flexible layout, in one call
 
         # --- 4. Fixed Header Widgets ---
         self.title_label = customtkinter.CTkLabel(
             self.main_frame,
             text="Welcome to your Daily Habit Tracker!",
-            font=customtkinter.CTkFont(size=24, weight="bold"),
+            font=self.get_font(24, "bold"),
             text_color="#F0F0F0"
         )
         self.title_label.grid(row=0, column=0, pady=(20, 10), sticky="n")
@@ -57,7 +72,7 @@ class HabitTrackerApp(customtkinter.CTk):
         self.description_label = customtkinter.CTkLabel(
             self.main_frame,
             text="Let's log your habits for today.",
-            font=customtkinter.CTkFont(size=16),
+            font=self.get_font(16),
             text_color="#B0B0B0"
         )
         self.description_label.grid(row=1, column=0, pady=(0, 20), sticky="n")
@@ -65,97 +80,42 @@ class HabitTrackerApp(customtkinter.CTk):
          # --- 5. Navigation & Feedback Widgets (Dynamically Placed) ---
         # These widgets are created here, but their visibility and position 
         # are managed programmatically later based on the app's current state.
+        # The end-of-day buttons are only needed on the summary screen and are
+        # created there by build_summary_buttons().
         self.next_button = customtkinter.CTkButton(
             self.main_frame,
             text="Next Step",
             command=self.handle_next_step,
-            font=customtkinter.CTkFont(size=16, weight="bold"),
+            font=self.get_font(16, "bold"),
             height=40, corner_radius=10, fg_color="#2E86C1", hover_color="#3498DB"
         )
         self.message_label = customtkinter.CTkLabel(
             self.main_frame,
-            text="", font=customtkinter.CTkFont(size=14), text_color="#2ECC71"
-        )
-        self.start_new_day_button = customtkinter.CTkButton(
-            self.main_frame,
-            text="Start New Day",
-            command=self.start_new_day,
-            font=customtkinter.CTkFont(size=14), height=30, corner_radius=8
-        )
-        self.exit_button = customtkinter.CTkButton(
-            self.main_frame,
-            text="Exit App",
-            command=self.destroy,
-            font=customtkinter.CTkFont(size=14), height=30, corner_radius=8,
-            fg_color="#C0392B", hover_color="#E74C3C"
+            text="", font=self.get_font(14), text_color="#2ECC71"
         )
-        self.show_log_button = customtkinter.CTkButton(
+        # Shown on the first step and the summary screen: log a missed day or correct a past one
+        self.open_day_button = customtkinter.CTkButton(
             self.main_frame,
-            text="Show Log File",
-            command=self.show_log_file,
-            font=customtkinter.CTkFont(size=14), height=30, corner_radius=8
+            text="Edit Another Day",
+            command=self.ask_open_day,
+            font=self.get_font(14), height=30, corner_radius=8
         )
         
-        # --- 6. Habit-Specific Widgets (ALL HABITS DEFINED HERE) ---
-
-        # 6.1 Sleep Tracking Widgets
-        self.bedtime_label = customtkinter.CTkLabel(self.main_frame, text="What time did you go to bed? (e.g., 23:30 or 23):", font=customtkinter.CTkFont(size=14))
-        self.bedtime_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="HH:MM or HH", width=300, corner_radius=8)
-        self.waketime_label = customtkinter.CTkLabel(self.main_frame, text="What time did you wake up? (e.g., 7:30 or 7):", font=customtkinter.CTkFont(size=14))
-        self.waketime_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="HH:MM or HH", width=300, corner_radius=8)
-        self.sleep_quality_label = customtkinter.CTkLabel(self.main_frame, text="How was the quality of your sleep? (e.g., Good, Restless):", font=customtkinter.CTkFont(size=14))
-        self.sleep_quality_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="Comment on sleep quality", width=300, corner_radius=8)
-        self.bedtime_entry.bind("<Return>", lambda event: self.waketime_entry.focus_set())
-        self.waketime_entry.bind("<Return>", lambda event: self.sleep_quality_entry.focus_set())
-        self.sleep_quality_entry.bind("<Return>", lambda event: self.handle_next_step())
-
-        # 6.2 Morning Walk Widgets
-        self.morning_walk_label = customtkinter.CTkLabel(self.main_frame, text="Did you go for a morning walk today?", font=customtkinter.CTkFont(size=14))
-        self.morning_walk_var = customtkinter.IntVar(value=-1) # Use IntVar for 0/1 matching logic
-        self.morning_walk_yes_radio = customtkinter.CTkRadioButton(self.main_frame, text="Yes", variable=self.morning_walk_var, value=1, command=self.handle_next_step)
-        self.morning_walk_no_radio = customtkinter.CTkRadioButton(self.main_frame, text="No", variable=self.morning_walk_var, value=0, command=self.handle_next_step)
-        
-        # 6.3 Breakfast Widgets
-        self.breakfast_label = customtkinter.CTkLabel(self.main_frame, text="Did you have a healthy breakfast?", font=customtkinter.CTkFont(size=14))
-        self.breakfast_var = customtkinter.IntVar(value=-1)
-        self.breakfast_yes_radio = customtkinter.CTkRadioButton(self.main_frame, text="Yes", variable=self.breakfast_var, value=1, command=self.handle_next_step)
-        self.breakfast_no_radio = customtkinter.CTkRadioButton(self.main_frame, text="No", variable=self.breakfast_var, value=0, command=self.handle_next_step)
-
-        # 6.4 Pomodoro / Work Widgets
-        self.pomodoro_label = customtkinter.CTkLabel(self.main_frame, text="How many 30-minute Pomodoro sessions did you complete?", font=customtkinter.CTkFont(size=14))
-        self.pomodoro_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="Enter number of sessions", width=300, corner_radius=8)
-        self.pomodoro_entry.bind("<Return>", lambda event: self.handle_next_step())
-
-        # 6.5 Junk Food Widgets
-        self.junk_food_label = customtkinter.CTkLabel(self.main_frame, text="Did you eat any junk food today?", font=customtkinter.CTkFont(size=14))
-        self.junk_food_var = customtkinter.IntVar(value=-1)
-        self.junk_food_yes_radio = customtkinter.CTkRadioButton(self.main_frame, text="Yes", variable=self.junk_food_var, value=1, command=self.toggle_junk_food_details)
-        self.junk_food_no_radio = customtkinter.CTkRadioButton(self.main_frame, text="No", variable=self.junk_food_var, value=0, command=self.handle_next_step)
-        self.what_junk_food_label = customtkinter.CTkLabel(self.main_frame, text="What did you eat?", font=customtkinter.CTkFont(size=12))
-        self.what_junk_food_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="e.g., chips, chocolate", width=300, corner_radius=8)
-        self.what_junk_food_entry.bind("<Return>", lambda event: self.handle_next_step())
-
-        #6.6 Daily Steps Widgets
-        self.daily_steps_label = customtkinter.CTkLabel(self.main_frame, text="How many steps did you walk today?", font=customtkinter.CTkFont(size=14))
-        self.daily_steps_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="Enter total steps", width=300, corner_radius=8)
-        self.daily_steps_entry.bind("<Return>", lambda event: self.handle_next_step())
+        # --- 6. Habit-Specific Widgets ---
+        # Each step's widgets are built by its "build_func" the first time
+        # display_current_step() needs them (see ensure_step_built), so only
+        # the first step is constructed before the window first appears.
 
         # --- 7. Survey/Habit Flow Management Data Structure ---
         # This list defines the sequence of questions, their widgets, validation, and processing logic.
+        # "grid_configs" is added to a step by ensure_step_built() once its widgets exist.
         self.questions_data = [
             # Step 0: Sleep Tracking
             {
-                "widgets": [self.bedtime_label, self.bedtime_entry, self.waketime_label, self.waketime_entry, self.sleep_quality_label, self.sleep_quality_entry],
-                "grid_configs": [
-                    {"widget": self.bedtime_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5)},
-                    {"widget": self.bedtime_entry, "row": 3, "column": 0, "padx": 20, "pady": (0, 10)},
-                    {"widget": self.waketime_label, "row": 4, "column": 0, "padx": 20, "pady": (10, 5)},
-                    {"widget": self.waketime_entry, "row": 5, "column": 0, "padx": 20, "pady": (0, 10)},
-                    {"widget": self.sleep_quality_label, "row": 6, "column": 0, "padx": 20, "pady": (10, 5)},
-                    {"widget": self.sleep_quality_entry, "row": 7, "column": 0, "padx": 20, "pady": (0, 20)},
-                ],
+                "build_func": self.build_sleep_widgets,
                 "validation_func": self.validate_sleep_inputs,
                 "process_func": self.tracker_logic.process_sleep_data,
+                "fields": (("bed_time", ""), ("wake_time", ""), ("sleep_quality", "")),
                 "get_values": lambda: (self.bedtime_entry.get(), self.waketime_entry.get(), self.sleep_quality_entry.get()),
                 "set_values": lambda b, w, s: (self.bedtime_entry.delete(0, customtkinter.END) or self.bedtime_entry.insert(0, b), # Use 'or' to ensure execution
                                                self.waketime_entry.delete(0, customtkinter.END) or self.waketime_entry.insert(0, w),
@@ -165,14 +125,10 @@ class HabitTrackerApp(customtkinter.CTk):
             },
             # Step 1: Morning Walk
             {
-                "widgets": [self.morning_walk_label, self.morning_walk_yes_radio, self.morning_walk_no_radio],
-                "grid_configs": [
-                    {"widget": self.morning_walk_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
-                    {"widget": self.morning_walk_yes_radio, "row": 3, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
-                    {"widget": self.morning_walk_no_radio, "row": 4, "column": 0, "padx": 20, "pady": (5, 20), "sticky": "ew"},
-                ],
+                "build_func": self.build_morning_walk_widgets,
                 "validation_func": self.validate_radio_button_selection,
                 "process_func": self.tracker_logic.process_morning_walk,
+                "fields": (("morning_walk", -1),), # -1 indicates no selection
                 "get_values": lambda: self.morning_walk_var.get(),
                 "set_values": lambda val: self.morning_walk_var.set(val),
                 "clear_defaults": lambda: self.morning_walk_var.set(-1), # -1 indicates no selection
@@ -180,14 +136,10 @@ class HabitTrackerApp(customtkinter.CTk):
             },
             # Step 2: Breakfast
             {
-                "widgets": [self.breakfast_label, self.breakfast_yes_radio, self.breakfast_no_radio],
-                "grid_configs": [
-                    {"widget": self.breakfast_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
-                    {"widget": self.breakfast_yes_radio, "row": 3, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
-                    {"widget": self.breakfast_no_radio, "row": 4, "column": 0, "padx": 20, "pady": (5, 20), "sticky": "ew"},
-                ],
+                "build_func": self.build_breakfast_widgets,
                 "validation_func": self.validate_radio_button_selection,
                 "process_func": self.tracker_logic.process_breakfast_data,
+                "fields": (("healthy_breakfast", -1),),
                 "get_values": lambda: self.breakfast_var.get(),
                 "set_values": lambda val: self.breakfast_var.set(val),
                 "clear_defaults": lambda: self.breakfast_var.set(-1),
@@ -195,13 +147,10 @@ class HabitTrackerApp(customtkinter.CTk):
             },
             # Step 3: Pomodoro
             {
-                "widgets": [self.pomodoro_label, self.pomodoro_entry],
-                "grid_configs": [
-                    {"widget": self.pomodoro_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
-                    {"widget": self.pomodoro_entry, "row": 3, "column": 0, "padx": 20, "pady": (0, 20), "sticky": "ew"},
-                ],
+                "build_func": self.build_pomodoro_widgets,
                 "validation_func": self.validate_number_input,
                 "process_func": self.tracker_logic.process_pomodoro_data,
+                "fields": (("pomodoro_done", ""),),
                 "get_values": lambda: self.pomodoro_entry.get(),
                 "set_values": lambda val: (self.pomodoro_entry.delete(0, customtkinter.END) or self.pomodoro_entry.insert(0, str(val))),
                 "clear_defaults": lambda: self.pomodoro_entry.delete(0, customtkinter.END),
@@ -209,16 +158,10 @@ class HabitTrackerApp(customtkinter.CTk):
             },
             # Step 4: Junk Food
             {
-                "widgets": [self.junk_food_label, self.junk_food_yes_radio, self.junk_food_no_radio, self.what_junk_food_label, self.what_junk_food_entry],
-                "grid_configs": [
-                    {"widget": self.junk_food_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
-                    {"widget": self.junk_food_yes_radio, "row": 3, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
-                    {"widget": self.junk_food_no_radio, "row": 4, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
-                    {"widget": self.what_junk_food_label, "row": 5, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
-                    {"widget": self.what_junk_food_entry, "row": 6, "column": 0, "padx": 20, "pady": (0, 20), "sticky": "ew"},
-                ],
+                "build_func": self.build_junk_food_widgets,
                 "validation_func": self.validate_junk_food_input,
                 "process_func": self.tracker_logic.process_junk_food_data,
+                "fields": (("junk_food", -1), ("what_junk_food", "")),
                 "get_values": lambda: (self.junk_food_var.get(), self.what_junk_food_entry.get()),
                 "set_values": lambda junk_ans, food_desc: (self.junk_food_var.set(junk_ans),
                                                            self.what_junk_food_entry.delete(0, customtkinter.END) or self.what_junk_food_entry.insert(0, food_desc),
@@ -228,13 +171,10 @@ class HabitTrackerApp(customtkinter.CTk):
             },
             # Step 5: Daily Steps
             {
-                "widgets": [self.daily_steps_label, self.daily_steps_entry],
-                "grid_configs": [
-                    {"widget": self.daily_steps_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
-                    {"widget": self.daily_steps_entry, "row": 3, "column": 0, "padx": 20, "pady": (0, 20), "sticky": "ew"},
-                ],
+                "build_func": self.build_daily_steps_widgets,
                 "validation_func": self.validate_number_input,
                 "process_func": self.tracker_logic.process_daily_steps_data,
+                "fields": (("daily_steps", ""),),
                 "get_values": lambda: self.daily_steps_entry.get(),
                 "set_values": lambda val: (self.daily_steps_entry.delete(0, customtkinter.END) or self.daily_steps_entry.insert(0, str(val))),
                 "clear_defaults": lambda: self.daily_steps_entry.delete(0, customtkinter.END),
@@ -247,25 +187,155 @@ class HabitTrackerApp(customtkinter.CTk):
         self.hide_all_step_widgets()
         self.display_current_step()
 
+    # --- Fonts and Lazy Widget Construction ---
+
+    def get_font(self, size, weight="normal"):
+        """Returns a shared CTkFont, creating it the first time a size/weight is used."""
+        key = (size, weight)
+        if key not in self.fonts:
+            self.fonts[key] = customtkinter.CTkFont(size=size, weight=weight)
+        return self.fonts[key]
+
+    def ensure_step_built(self, step_data):
+        """Builds a step's widgets the first time it is shown."""
+        if "grid_configs" not in step_data:
+            step_data["grid_configs"] = step_data["build_func"]()
+
+    def built_steps(self):
+        """The steps whose widgets exist already."""
+        return [step_data for step_data in self.questions_data if "grid_configs" in step_data]
+
+    # Each build_* method creates one step's widgets and returns its grid configs.
+
+    def build_sleep_widgets(self):
+        self.bedtime_label = customtkinter.CTkLabel(self.main_frame, text="What time did you go to bed? (e.g., 23:30 or 23):", font=self.get_font(14))
+        self.bedtime_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="HH:MM or HH", width=300, corner_radius=8)
+        self.waketime_label = customtkinter.CTkLabel(self.main_frame, text="What time did you wake up? (e.g., 7:30 or 7):", font=self.get_font(14))
+        self.waketime_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="HH:MM or HH", width=300, corner_radius=8)
+        self.sleep_quality_label = customtkinter.CTkLabel(self.main_frame, text="How was the quality of your sleep? (e.g., Good, Restless):", font=self.get_font(14))
+        self.sleep_quality_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="Comment on sleep quality", width=300, corner_radius=8)
+        self.bedtime_entry.bind("<Return>", lambda event: self.waketime_entry.focus_set())
+        self.waketime_entry.bind("<Return>", lambda event: self.sleep_quality_entry.focus_set())
+        self.sleep_quality_entry.bind("<Return>", lambda event: self.handle_next_step())
+        return [
+            {"widget": self.bedtime_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5)},
+            {"widget": self.bedtime_entry, "row": 3, "column": 0, "padx": 20, "pady": (0, 10)},
+            {"widget": self.waketime_label, "row": 4, "column": 0, "padx": 20, "pady": (10, 5)},
+            {"widget": self.waketime_entry, "row": 5, "column": 0, "padx": 20, "pady": (0, 10)},
+            {"widget": self.sleep_quality_label, "row": 6, "column": 0, "padx": 20, "pady": (10, 5)},
+            {"widget": self.sleep_quality_entry, "row": 7, "column": 0, "padx": 20, "pady": (0, 20)},
+        ]
+
+    def build_morning_walk_widgets(self):
+        self.morning_walk_label = customtkinter.CTkLabel(self.main_frame, text="Did you go for a morning walk today?", font=self.get_font(14))
+        self.morning_walk_var = customtkinter.IntVar(value=-1) # Use IntVar for 0/1 matching logic
+        self.morning_walk_yes_radio = customtkinter.CTkRadioButton(self.main_frame, text="Yes", variable=self.morning_walk_var, value=1, command=self.handle_next_step)
+        self.morning_walk_no_radio = customtkinter.CTkRadioButton(self.main_frame, text="No", variable=self.morning_walk_var, value=0, command=self.handle_next_step)
+        return [
+            {"widget": self.morning_walk_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
+            {"widget": self.morning_walk_yes_radio, "row": 3, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
+            {"widget": self.morning_walk_no_radio, "row": 4, "column": 0, "padx": 20, "pady": (5, 20), "sticky": "ew"},
+        ]
+
+    def build_breakfast_widgets(self):
+        self.breakfast_label = customtkinter.CTkLabel(self.main_frame, text="Did you have a healthy breakfast?", font=self.get_font(14))
+        self.breakfast_var = customtkinter.IntVar(value=-1)
+        self.breakfast_yes_radio = customtkinter.CTkRadioButton(self.main_frame, text="Yes", variable=self.breakfast_var, value=1, command=self.handle_next_step)
+        self.breakfast_no_radio = customtkinter.CTkRadioButton(self.main_frame, text="No", variable=self.breakfast_var, value=0, command=self.handle_next_step)
+        return [
+            {"widget": self.breakfast_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
+            {"widget": self.breakfast_yes_radio, "row": 3, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
+            {"widget": self.breakfast_no_radio, "row": 4, "column": 0, "padx": 20, "pady": (5, 20), "sticky": "ew"},
+        ]
+
+    def build_pomodoro_widgets(self):
+        self.pomodoro_label = customtkinter.CTkLabel(self.main_frame, text="How many 30-minute Pomodoro sessions did you complete?", font=self.get_font(14))
+        self.pomodoro_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="Enter number of sessions", width=300, corner_radius=8)
+        self.pomodoro_entry.bind("<Return>", lambda event: self.handle_next_step())
+        return [
+            {"widget": self.pomodoro_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
+            {"widget": self.pomodoro_entry, "row": 3, "column": 0, "padx": 20, "pady": (0, 20), "sticky": "ew"},
+        ]
+
+    def build_junk_food_widgets(self):
+        self.junk_food_label = customtkinter.CTkLabel(self.main_frame, text="Did you eat any junk food today?", font=self.get_font(14))
+        self.junk_food_var = customtkinter.IntVar(value=-1)
+        self.junk_food_yes_radio = customtkinter.CTkRadioButton(self.main_frame, text="Yes", variable=self.junk_food_var, value=1, command=self.toggle_junk_food_details)
+        self.junk_food_no_radio = customtkinter.CTkRadioButton(self.main_frame, text="No", variable=self.junk_food_var, value=0, command=self.handle_next_step)
+        self.what_junk_food_label = customtkinter.CTkLabel(self.main_frame, text="What did you eat?", font=self.get_font(12))
+        self.what_junk_food_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="e.g., chips, chocolate", width=300, corner_radius=8)
+        self.what_junk_food_entry.bind("<Return>", lambda event: self.handle_next_step())
+        return [
+            {"widget": self.junk_food_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
+            {"widget": self.junk_food_yes_radio, "row": 3, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
+            {"widget": self.junk_food_no_radio, "row": 4, "column": 0, "padx": 20, "pady": 5, "sticky": "ew"},
+            {"widget": self.what_junk_food_label, "row": 5, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
+            {"widget": self.what_junk_food_entry, "row": 6, "column": 0, "padx": 20, "pady": (0, 20), "sticky": "ew"},
+        ]
+
+    def build_daily_steps_widgets(self):
+        self.daily_steps_label = customtkinter.CTkLabel(self.main_frame, text="How many steps did you walk today?", font=self.get_font(14))
+        self.daily_steps_entry = customtkinter.CTkEntry(self.main_frame, placeholder_text="Enter total steps", width=300, corner_radius=8)
+        self.daily_steps_entry.bind("<Return>", lambda event: self.handle_next_step())
+        return [
+            {"widget": self.daily_steps_label, "row": 2, "column": 0, "padx": 20, "pady": (10, 5), "sticky": "ew"},
+            {"widget": self.daily_steps_entry, "row": 3, "column": 0, "padx": 20, "pady": (0, 20), "sticky": "ew"},
+        ]
+
+    def build_summary_buttons(self):
+        """Creates the end-of-day buttons the first time the summary screen is shown."""
+        if hasattr(self, 'start_new_day_button'):
+            return
+        self.start_new_day_button = customtkinter.CTkButton(
+            self.main_frame,
+            text="Start New Day",
+            command=self.start_new_day,
+            font=self.get_font(14), height=30, corner_radius=8
+        )
+        self.exit_button = customtkinter.CTkButton(
+            self.main_frame,
+            text="Exit App",
+            command=self.close_app,
+            font=self.get_font(14), height=30, corner_radius=8,
+            fg_color="#C0392B", hover_color="#E74C3C"
+        )
+        self.show_log_button = customtkinter.CTkButton(
+            self.main_frame,
+            text="Show Log",
+            command=self.show_log_file,
+            font=self.get_font(14), height=30, corner_radius=8
+        )
+        self.search_button = customtkinter.CTkButton(
+            self.main_frame,
+            text="Search Notes",
+            command=self.show_search,
+            font=self.get_font(14), height=30, corner_radius=8
+        )
+
     # --- GUI Flow Management Methods ---
 
+    @timed("gui.hide_all_step_widgets")
     def hide_all_step_widgets(self):
         """Hides all habit-specific labels and input widgets, and navigation buttons."""
-        for step_data in self.questions_data:
+        for step_data in self.built_steps():
+            # Includes the conditionally displayed junk food widgets
             for widget_config in step_data["grid_configs"]:
                 widget_config["widget"].grid_forget()
-        # Hide conditionally displayed junk food widgets
-        self.what_junk_food_label.grid_forget()
-        self.what_junk_food_entry.grid_forget()
 
         self.next_button.grid_forget()
         self.message_label.grid_forget()
-        self.start_new_day_button.grid_forget()
-        self.exit_button.grid_forget()
-        self.show_log_button.grid_forget()
+        self.open_day_button.grid_forget()
+        if hasattr(self, 'start_new_day_button'):
+            self.start_new_day_button.grid_forget()
+            self.exit_button.grid_forget()
+            self.show_log_button.grid_forget()
+            self.search_button.grid_forget()
         if hasattr(self, 'summary_label'):
             self.summary_label.grid_forget()
+        if hasattr(self, 'stats_label'):
+            self.stats_label.grid_forget()
 
+    @timed("gui.display_current_step")
     def display_current_step(self):
         """Displays the habit tracking step corresponding to self.current_step_index."""
         self.hide_all_step_widgets() # Clear previous step from view
@@ -275,40 +345,18 @@ class HabitTrackerApp(customtkinter.CTk):
 
         if self.current_step_index < len(self.questions_data):
             step_data = self.questions_data[self.current_step_index]
+            self.ensure_step_built(step_data)
 
             # Re-grid the specific step's widgets
             for widget_config in step_data["grid_configs"]:
                 widget_config["widget"].grid(row=widget_config["row"], column=widget_config["column"],
                                              padx=widget_config["padx"], pady=widget_config["pady"],)
             
-            # Restore previously entered answers if available, otherwise clear to default
-            # This complex 'if/elif/else' structure is necessary due to varying 'get_values'
-            # and 'set_values' lambdas that handle different numbers/types of inputs.
-            # We fetch values from tracker_logic.answers dictionary which stores processed data.
-            if self.current_step_index == 0: # Sleep data
-                b = self.tracker_logic.answers.get('bed_time', '')
-                w = self.tracker_logic.answers.get('wake_time', '')
-                s = self.tracker_logic.answers.get('sleep_quality', '')
-                step_data["set_values"](b, w, s)
-            elif self.current_step_index == 1: # Morning walk (integer 0 or 1)
-                walk_val_int = self.tracker_logic.answers.get('morning_walk', -1)
-                step_data["set_values"](walk_val_int) # IntVar uses 0/1 directly
-            elif self.current_step_index == 2: # Breakfast (integer 0 or 1)
-                breakfast_val_int = self.tracker_logic.answers.get('healthy_breakfast', -1)
-                step_data["set_values"](breakfast_val_int)
-            elif self.current_step_index == 3: # Pomodoro (integer)
-                pomodoro_val_int = self.tracker_logic.answers.get('pomodoro_done', '')
-                step_data["set_values"](pomodoro_val_int) # Set as string into CTkEntry
-            elif self.current_step_index == 4: # Junk Food (integer 0 or 1, and string)
-                junk_ans_int = self.tracker_logic.answers.get('junk_food', -1)
-                food_desc_str = self.tracker_logic.answers.get('what_junk_food', '')
-                step_data["set_values"](junk_ans_int, food_desc_str)
-            elif self.current_step_index == 5: # Daily Steps (integer)
-                steps_val_int = self.tracker_logic.answers.get('daily_steps', '')
-                step_data["set_values"](steps_val_int)
-            else:
-                # Fallback for future steps if they fit a simple single-value restoration
-                step_data["clear_defaults"]() 
+            # Restore previously entered answers if available, otherwise clear to default.
+            # "fields" lists the DayRecord fields a step sets, each with the value its
+            # widgets show when the field isn't answered yet.
+            record = self.tracker_logic.record
+            step_data["set_values"](*(record.get(field, default) for field, default in step_data["fields"]))
 
             # Update button text based on whether it's the last step
             if self.current_step_index == len(self.questions_data) - 1:
@@ -322,6 +370,8 @@ class HabitTrackerApp(customtkinter.CTk):
             else:
                 self.next_button.grid(row=9, column=0, pady=(0, 10))
             self.message_label.grid(row=10, column=0, pady=(5, 10))
+            if self.current_step_index == 0:
+                self.open_day_button.grid(row=11, column=0, pady=(5, 10))
             self.show_message("", "green")
 
         else:
@@ -430,7 +480,9 @@ class HabitTrackerApp(customtkinter.CTk):
         self.hide_all_step_widgets()
 
         final_summary_text = self.tracker_logic.get_final_points()
-        save_success = self.tracker_logic.write_final_log_to_file()
+        # Save a snapshot of today's entries in the background; the result arrives in on_log_saved
+        record = self.tracker_logic.record.copy()
+        self.log_writer.submit(str(record.day), lambda: self.save_day_log(record), self.on_log_saved)
 
         self.title_label.configure(text="Daily Log Completed!")
         self.description_label.configure(text="Review your progress below:")
@@ -439,23 +491,84 @@ class HabitTrackerApp(customtkinter.CTk):
             self.summary_label = customtkinter.CTkLabel(
                 self.main_frame,
                 text="",
-                font=customtkinter.CTkFont(size=18, weight="bold"),
+                font=self.get_font(18, "bold"),
                 text_color="#F0F0F0",
                 wraplength=600 # Ensure text wraps within the frame
             )
         self.summary_label.configure(text=final_summary_text)
         self.summary_label.grid(row=2, column=0, pady=(10, 20))
 
-        if save_success:
-            self.show_message(f"Daily log updated successfully!", "#2ECC71")
-        else:
-            self.show_message(f"Error saving daily log. Check console for details.", "red")
+        self.message_label.configure(text="Saving…", text_color="#B0B0B0") # Stays until the save finishes
+        self.start_polling_log_writer()
 
+        self.build_summary_buttons()
         self.start_new_day_button.grid(row=9, column=0, pady=(20, 5), padx=5, sticky="e")
         self.show_log_button.grid(row=9, column=0, pady=(20, 5), padx=5, sticky="w")
+        self.search_button.grid(row=9, column=0, pady=(20, 5), padx=5)
         self.exit_button.grid(row=10, column=0, pady=(5, 10))
+        self.open_day_button.grid(row=10, column=0, pady=(5, 10), padx=5, sticky="w")
         self.message_label.grid(row=11, column=0, pady=(5, 10))
 
+    def start_polling_log_writer(self):
+        """Starts delivering log writer results, unless an after() loop is doing it already."""
+        if not self.log_writer_polling:
+            self.log_writer_polling = True
+            self.poll_log_writer()
+
+    def poll_log_writer(self):
+        """Delivers finished saves on the Tk thread and keeps polling while the writer is busy."""
+        self.log_writer.poll()
+        if self.log_writer.is_busy():
+            self.after(50, self.poll_log_writer)
+        else:
+            self.log_writer_polling = False
+
+    def save_day_log(self, record):
+        """
+        Runs on the log writer thread: saves the day, then builds the text under the
+        summary. That can mean parsing the history (a missing or outdated summary
+        cache, see habit_summary_cache.py), so it's done here and not on the Tk thread.
+        Returns (saved, stats text or None).
+        """
+        if not self.tracker_logic.write_day_log(record):
+            return False, None
+        try:
+            return True, self.tracker_logic.get_stats_summary()
+        except Exception as e:
+            print(f"Error computing stats: {e}") # The day is saved; only the stats are missing
+            return True, None
+
+    def on_log_saved(self, result, error):
+        """Called on the Tk thread once the background save has finished."""
+        save_success, stats_text = result if error is None else (False, None)
+        if save_success:
+            self.show_message(f"Daily log updated successfully!", "#2ECC71")
+            if stats_text is not None:
+                self.show_stats(stats_text)
+            if self.log_viewer is not None and self.log_viewer.winfo_exists():
+                self.log_viewer.show_latest() # Include the day that was just saved
+        else:
+            self.show_message(f"Error saving daily log. Check console for details.", "red")
+
+    def show_stats(self, stats_text):
+        """Shows current streaks, rolling averages and sleep analytics under the day's summary."""
+        if not hasattr(self, 'stats_label'): # Create only if it doesn't exist
+            self.stats_label = customtkinter.CTkLabel(
+                self.main_frame,
+                text="",
+                font=self.get_font(13),
+                text_color="#B0B0B0",
+                wraplength=600,
+                justify="left"
+            )
+        self.stats_label.configure(text=stats_text)
+        self.stats_label.grid(row=3, column=0, pady=(0, 10))
+
+    def close_app(self):
+        """Lets pending saves finish before the window closes."""
+        self.log_writer.close()
+        self.destroy()
+
     def start_new_day(self):
         """Resets the habit tracker state and restarts from the first step."""
         self.tracker_logic.reset_for_new_day()
@@ -466,15 +579,53 @@ class HabitTrackerApp(customtkinter.CTk):
         
         if hasattr(self, 'summary_label'):
             self.summary_label.grid_forget()
+        if hasattr(self, 'stats_label'):
+            self.stats_label.grid_forget()
         
-        # Clear all input fields for the new day
-        for step_data in self.questions_data:
+        # Clear all input fields for the new day (steps not built yet have nothing to clear)
+        for step_data in self.built_steps():
             step_data["clear_defaults"]()
 
         self.hide_all_step_widgets()
         self.show_message("", "green")
         self.display_current_step()
 
+    def ask_open_day(self):
+        """Asks for a date and opens that day, to fill in a missed day or correct a logged one."""
+        dialog = customtkinter.CTkInputDialog(text="Which day do you want to log or edit? (YYYY-MM-DD)", title="Edit Another Day")
+        answer = dialog.get_input()
+        if answer is None: # Cancelled
+            return
+        try:
+            day = datetime.date.fromisoformat(answer.strip())
+        except ValueError:
+            self.show_message("Invalid date. Use YYYY-MM-DD.", "red")
+            return
+        if day > datetime.date.today():
+            self.show_message("You can't log a day that hasn't happened yet.", "red")
+            return
+        self.open_day(day)
+
+    def open_day(self, day):
+        """Restarts the steps for `day`, pre-filled with the answers saved for it."""
+        try:
+            logged = self.tracker_logic.open_day(day)
+        except Exception as e:
+            self.show_message(f"Error opening {day}: {e}", "red")
+            print(f"Error opening {day}: {e}") # Log error to console for debugging
+            return
+
+        self.current_step_index = 0
+        if day == datetime.date.today():
+            self.title_label.configure(text="Welcome to your Daily Habit Tracker!")
+            self.description_label.configure(text="Let's log your habits for today.")
+        else:
+            self.title_label.configure(text=f"Editing {day:%A}, {day.day} {day:%B %Y}")
+            self.description_label.configure(text="Correct your answers, then complete the log to save them."
+                                             if logged else "Log the habits you missed that day.")
+        # The restored answers are shown by display_current_step() as each step comes up
+        self.display_current_step()
+
     def show_message(self, message, color):
         """Displays a message to the user and clears it after a few seconds."""
         self.message_label.configure(text=message, text_color=color)
@@ -482,25 +633,64 @@ class HabitTrackerApp(customtkinter.CTk):
             self.after(5000, lambda: self.message_label.configure(text=""))
 
     def show_log_file(self):
-        """Opens the habit_log.txt file using the default system application."""
-        log_file_path = self.tracker_logic.get_log_file_path()
+        """Opens the in-app log viewer, which pages through habit_log.txt a few days at a time."""
+        from habit_log_viewer import LogViewerWindow # Only needed here, kept off the startup path
         try:
-            if os.path.exists(log_file_path):
-                if os.name == 'nt': # Windows
-                    os.startfile(log_file_path)
-                elif os.uname().sysname == 'Darwin': # macOS
-                    subprocess.run(['open', log_file_path])
-                else: # Linux
-                    subprocess.run(['xdg-open', log_file_path])
-            else:
+            if self.log_viewer is not None and self.log_viewer.winfo_exists():
+                self.log_viewer.show_latest()
+                self.log_viewer.lift()
+                self.log_viewer.focus()
+                return
+            if not self.tracker_logic.log_store.day_count():
                 self.show_message("Log file not found. Complete a log first!", "orange")
+                return
+            self.log_viewer = LogViewerWindow(self, self.tracker_logic.log_store)
+            self.log_viewer.after(100, self.log_viewer.lift) # Toplevels can open behind the main window
+        except Exception as e:
+            self.show_message(f"Error opening log viewer: {e}", "red")
+            print(f"Error opening log viewer: {e}") # Log error to console for debugging
+
+    def load_search_index(self, callback):
+        """
+        Loads the notes search index on the log writer thread, since a missing or
+        outdated index is rebuilt from the whole log. callback(index, error) is
+        called on the Tk thread.
+        """
+        self.log_writer.submit("search-index", self.tracker_logic.get_search_index, callback)
+        self.start_polling_log_writer()
+
+    def show_search(self):
+        """Opens the notes search window (sleep quality comments and junk food notes)."""
+        from habit_search_window import SearchWindow # Only needed here, kept off the startup path
+        try:
+            if self.search_window is not None and self.search_window.winfo_exists():
+                self.search_window.lift()
+                self.search_window.focus()
+                return
+            self.search_window = SearchWindow(self, self.load_search_index)
+            self.search_window.after(100, self.search_window.lift) # Toplevels can open behind the main window
         except Exception as e:
-            self.show_message(f"Error opening log file: {e}", "red")
-            print(f"Error opening log file: {e}") # Log error to console for debugging
+            self.show_message(f"Error opening search: {e}", "red")
+            print(f"Error opening search: {e}") # Log error to console for debugging
 
 if __name__ == "__main__":
     customtkinter.set_appearance_mode("Dark")
     customtkinter.set_default_color_theme("dark-blue")
 
+    # Startup measurement: `python habit_tracker_app.py --startup-time` (or
+    # HABIT_TRACKER_STARTUP_TIME=1) prints how long the imports, the window
+    # construction and the first paint took, then closes the window.
+    measure_startup = "--startup-time" in sys.argv or bool(os.environ.get("HABIT_TRACKER_STARTUP_TIME"))
     app = HabitTrackerApp()
+    if measure_startup:
+        constructed = time.perf_counter()
+        def report_startup():
+            app.update_idletasks() # Flush pending geometry/drawing so this is the first paint
+            painted = time.perf_counter()
+            print(f"Startup: imports {(IMPORTS_DONE - STARTUP_BEGAN) * 1000:.1f} ms, "
+                  f"window {(constructed - IMPORTS_DONE) * 1000:.1f} ms, "
+                  f"first paint {(painted - constructed) * 1000:.1f} ms, "
+                  f"total {(painted - STARTUP_BEGAN) * 1000:.1f} ms")
+            app.close_app()
+        app.after_idle(report_startup)
     app.mainloop()
\ No newline at end of file
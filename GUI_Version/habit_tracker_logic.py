@@ -1,27 +1,26 @@
 import datetime
 import os
 import sys
+import threading
+from habit_log_store import SUMMARY_CACHE_SUFFIX, LogStore
+from habit_log_parser import DayRecord, format_day_lines
+from habit_time_parser import clean_time
+from habit_streaks import HabitStats
+from habit_search import SearchIndex
+from habit_profiler import span, timed
+from habit_scoring import SCORER
 
 # --- Helper Functions (Adapted for GUI) ---
 
+@timed("get_clean_time")
 def get_clean_time(user_input):
     """
     Parses a time string into HH:MM format.
     Returns the formatted time string if valid, None otherwise.
     No longer prompts or prints errors.
+    Accepts "2311", "23", "23.30" and "7:30"; see habit_time_parser.py.
     """
-    user_input = user_input.strip()
-    # Handle 4-digit time like "2311" => "23:11"
-    if len(user_input) == 4 and user_input.isdigit():
-        user_input = user_input[:2] + ":" + user_input[2:]
-    # Try multiple formats 
-    for fmt in ("%H:%M", "%H", "%H.%M"):
-        try:
-            parsed = datetime.datetime.strptime(user_input, fmt)
-            return parsed.strftime("%H:%M")
-        except ValueError:
-            continue
-    return None # Return None if no valid format is found
+    return clean_time(user_input)
 
 def parse_yes_no(answer):
     """
@@ -47,17 +46,41 @@ def parse_number(user_input):
     else:
         return None 
 
+BACKENDS = ("text", "sqlite", "segmented")
+
+def open_log_store(log_path, backend="text"):
+    """
+    Returns the persistence backend for the log.
+    "text" (default) is habit_log.txt itself, "sqlite" keeps the same data in habit_log.db,
+    "segmented" splits it into per-year files in habit_log_segments/ (per month with
+    HABIT_TRACKER_SEGMENT_PERIOD=month), compressing the years that have ended.
+    """
+    if backend == "sqlite":
+        from habit_sqlite_store import SQLiteLogStore # Only imported when the SQLite backend is chosen
+        # The existing habit_log.txt is imported the first time, like the segmented backend does
+        return SQLiteLogStore(os.path.splitext(log_path)[0] + ".db", legacy_log=log_path)
+    if backend == "segmented":
+        from habit_segmented_store import SegmentedLogStore
+        period = os.environ.get("HABIT_TRACKER_SEGMENT_PERIOD", "year")
+        # The existing habit_log.txt is split into segments the first time
+        return SegmentedLogStore(os.path.splitext(log_path)[0] + "_segments", period, legacy_log=log_path)
+    return LogStore(log_path)
+
 class HabitTrackerLogic:
-    def __init__(self):
-        self.today = datetime.date.today()
-        self.total_points = 0
-        self.log_entries = [] # Store log entries internally, to be written at the end.
-        self.answers = {} # Dictionary to store all collected answers by their key.
+    def __init__(self, day=None, backend=None, log_dir=None):
+        # `day` lets bulk imports score a past day with the same rules; the GUI opens past days with open_day()
+        self.today = day or datetime.date.today()
+        # Today's answers. The record is the only state: points are scored from it and
+        # log lines are rendered from it when the day is written.
+        self.record = DayRecord(self.today)
 
         self.log_file_name = "habit_log.txt" # Define the name of your log file
 
         # Determine the base directory for the log file
-        if getattr(sys, 'frozen', False):
+        if log_dir is not None:
+            # An explicit directory, e.g. one per user when running as a service
+            self.log_base_dir = log_dir
+        elif getattr(sys, 'frozen', False):
             # If running as a PyInstaller bundle, use the directory of the executable
             # sys.executable gives the path to the .exe file itself
             self.log_base_dir = os.path.dirname(sys.executable)
@@ -68,62 +91,75 @@ class HabitTrackerLogic:
 
         # Combine the base directory and file name to get the full path
         self.log_path = os.path.join(self.log_base_dir, self.log_file_name)
-        
-        # Add the date header to the internal log entries when initialized
-        self.log_entries.append(f"\n=== {self.today} ===")
+        # Where the log is persisted: the text file by default, or SQLite (HABIT_TRACKER_BACKEND=sqlite)
+        self.backend = backend or os.environ.get("HABIT_TRACKER_BACKEND", "text")
+        self.log_store = open_log_store(self.log_path, self.backend)
+        self.history = None # Columnar history of all logged days, loaded on first use
+        self.summary_cache = None # Saved per-day/per-month aggregates (habit_summary_cache.SummaryCache) behind self.history
+        self.summary_path = self.log_path + SUMMARY_CACHE_SUFFIX
+        self.stats = None # Streaks and rolling averages (habit_streaks.HabitStats), loaded on first use
+        self.stats_path = self.log_path + ".stats.json"
+        self.search_index = None # Inverted index of the free-text answers (habit_search.SearchIndex), loaded on first use
+        self.search_path = self.log_path + ".search.json"
+        # The GUI loads these on its log writer thread; the lock keeps two threads from both building one
+        self.sidecar_lock = threading.RLock()
+
+    @property
+    def total_points(self):
+        """Points earned so far today; answering a step again replaces its points."""
+        return SCORER.score(self.record)
 
-    def add_log_entry(self, entry):
-        """Helper to add an entry to the internal log list."""
-        self.log_entries.append(entry)
+    def get_log_lines(self):
+        """Today's log lines (header excluded), as they would be written now."""
+        return format_day_lines(self.record)
 
+    @timed("logic.write_final_log_to_file")
     def write_final_log_to_file(self):
         """
-        Writes all accumulated log entries to the habit_log.txt file.
-        This will be called ONCE by the GUI at the very end.
+        Writes the tracked day's record (today, or the day open_day() opened) to the
+        habit_log.txt file. This will be called ONCE by the GUI at the very end.
+        Only that day's entries are touched: with the text backend its block is
+        appended or replaced in place (see habit_log_store.py), with the SQLite
+        backend its row is upserted (see habit_sqlite_store.py).
         """
-        log_file_path = self.log_path
-        today_header = f"=== {self.today} ==="
-        existing_log_lines = []
-        try:
-            if os.path.exists(log_file_path):
-                with open(log_file_path, "r", encoding="utf-8") as f:
-                    existing_log_lines = f.readlines()
-        except Exception as e:
-            print(f"Error reading existing log file: {e}")
-            return False   
-        # Prepare new log content (including the header for today)
-        new_day_content_lines = [entry + "\n" for entry in self.log_entries] # Add newline for each entry
-        # Find where today's previous entries (if any) start and end
-        start_index = -1
-        end_index = -1
-        for i, line in enumerate(existing_log_lines):
-            if today_header in line:
-                start_index = i
-            # Find the next date header after today's header to determine end_index
-            # This logic assumes headers always start with "===" and are on their own line
-            elif start_index != -1 and line.strip().startswith("===") and i > start_index:
-                end_index = i
-                break
-
-        # Construct the final log content
-        final_log_lines = []
-        if start_index != -1:
-            # If today's entries were found, add lines before and after them
-            final_log_lines.extend(existing_log_lines[:start_index])
-            final_log_lines.extend(new_day_content_lines) # Add the new, updated content for today
-            if end_index != -1:
-                final_log_lines.extend(existing_log_lines[end_index:])
-            # If start_index was found but no next header, it means today is the last entry
-            # In this case, existing_log_lines[end_index:] would be empty, which is correct.
-        else:
-            # If today's header was NOT found, append new day's content to the end
-            final_log_lines.extend(existing_log_lines) # Keep all previous lines
-            final_log_lines.extend(new_day_content_lines) # Add new content for today
+        return self.write_day_log(self.record)
 
+    @timed("logic.write_day_log")
+    def write_day_log(self, record):
+        """
+        Writes one day's record, rendering its log lines.
+        Takes the record as an argument so the GUI can save a snapshot (record.copy())
+        from a worker thread while the logic itself moves on to a new day.
+        """
         try:
-            # Step 5: Write the entire modified content back to the file (overwriting)
-            with open(log_file_path, "w", encoding="utf-8") as log: # Notice "w" (write) mode!
-                log.writelines(final_log_lines) # writelines expects a list of strings
+            # The phases are timed separately when profiling is on (see habit_profiler.py)
+            with span("save.load_sidecars"):
+                stats = self.get_stats() # Loaded before the write, while the snapshots still match the log
+                search_index = self.get_search_index()
+                if self.summary_cache is None and stats.is_past_day(record.day):
+                    # A saved summary cache only checks the end of the log for changes, so it's
+                    # loaded now and kept up to date below instead of missing this edit later
+                    try:
+                        self.get_history()
+                    except ImportError:
+                        pass # No NumPy, so there's no summary cache
+            with span("save.read_old_day"):
+                # A past day is replaced in the stats from what it was before and the days around it
+                old_record = self.log_store.get_day(record.day) if stats.is_past_day(record.day) else None
+            with span("save.write_log"): # The log store's own phases are timed as "log.*"
+                self.log_store.write_day(record.day, format_day_lines(record))
+                signature = self.log_store.signature()
+            with span("save.update_indexes"):
+                if self.summary_cache is not None:
+                    self.summary_cache.add_day(record) # Updates self.history too
+                search_index.add_day(record)
+                if not stats.add_day(record):
+                    stats.replace_day(record, old_record, self.log_store.get_day)
+            with span("save.write_snapshots"):
+                search_index.save_day(self.search_path, record, signature)
+                if self.summary_cache is not None:
+                    self.summary_cache.save_day(self.summary_path, record, self.log_store)
+                stats.save(self.stats_path, signature)
             return True # Indicate success
         except Exception as e:
             print(f"Error writing final log file: {e}")
@@ -132,105 +168,154 @@ class HabitTrackerLogic:
     # ... (your get_final_points_summary and reset_for_new_day methods) ...
 
      # --- Habit Tracking Methods (Adapted for GUI - Accept data, return results) ---
+    @timed("logic.process_sleep_data")
     def process_sleep_data(self, bedtime, waketime, sleep_quality):
         """
-        Processes sleep data, calculates points, and prepares log entry.
+        Records sleep data.
         Assumes inputs are already validated by the GUI.
         """
-        self.answers["bed_time"] = bedtime
-        self.answers["wake_time"] = waketime
-        self.answers["sleep_quality"] = sleep_quality
-        self.add_log_entry(f"Sleep log: Bedtime -- {bedtime} | Wake Time -- {waketime} | Sleep Quality -- {sleep_quality}")    
+        self.record.bed_time = bedtime
+        self.record.wake_time = waketime
+        self.record.sleep_quality = sleep_quality
 
+    @timed("logic.process_morning_walk")
     def process_morning_walk(self, walk_answer):
         """
-        Processes morning walk data, calculates points, and prepares log entry.
+        Records the morning walk.
         walk_answer should be 1 for yes, 0 for no.
         """
-        self.answers["morning_walk"] = walk_answer
-        if walk_answer == 1:
-            self.total_points += 1
-            self.add_log_entry(f"Morning Walk: Walk done👍 +1")
-        else:
-            self.add_log_entry(f"Morning Walk: None.")
+        self.record.morning_walk = walk_answer
 
+    @timed("logic.process_breakfast_data")
     def process_breakfast_data(self, breakfast_answer):
         """
-        Processes breakfast data, calculates points, and prepares log entry.
+        Records breakfast.
         breakfast_answer should be 1 for yes, 0 for no.
         """
-        self.answers["healthy_breakfast"] = breakfast_answer
-        if breakfast_answer == 1:
-            self.total_points += 1
-            self.add_log_entry(f"Breakfast: Healthy👍 +1")
-        else:
-            self.add_log_entry(f"Breakfast: None.")
-
+        self.record.healthy_breakfast = breakfast_answer
 
+    @timed("logic.process_pomodoro_data")
     def process_pomodoro_data(self, pomodoro_done):
         """
-        Processes pomodoro data, calculates points, and prepares log entry.
+        Records the number of pomodoro sessions.
         """
-        self.answers["pomodoro_done"] = pomodoro_done
-        if pomodoro_done >= 8:
-            self.total_points += 2
-        elif pomodoro_done >= 4:
-            self.total_points += 1
-        total_minutes = pomodoro_done * 30
-        hours, minutes = divmod(total_minutes, 60)
-        self.add_log_entry(f"Pomodoro/Work Done: {pomodoro_done} sessions = {hours}:{minutes:02d} hours of focused work.")
+        self.record.pomodoro_done = pomodoro_done
 
+    @timed("logic.process_junk_food_data")
     def process_junk_food_data(self, junk_answer, what_junk_food=None):
         """
-        Processes junk food data, calculates points, and prepares log entry.
-        junk_answer_int should be 1 for yes, 0 for no.
-        what_junk_food_str is optional if junk_answer_int is 1.
+        Records junk food.
+        junk_answer should be 1 for yes, 0 for no.
+        what_junk_food is only kept when junk_answer is 1.
         """
-        self.answers["junk_food"] = junk_answer
-        self.answers["what_junk_food"] = what_junk_food
-        if junk_answer == 1:
-            self.add_log_entry(f"Junk Food: Yes: {what_junk_food}")
-        else:
-            self.add_log_entry("Junk Food: No")
-            self.total_points += 1 
+        self.record.junk_food = junk_answer
+        self.record.what_junk_food = what_junk_food if junk_answer == 1 else None
 
+    @timed("logic.process_daily_steps_data")
     def process_daily_steps_data(self, steps):
-        self.answers["daily_steps"] = steps
-        message = ""
-        if steps >= 7000:
-            message = "great!"
-            self.total_points += 2
-        elif steps >= 5000:
-            message = "minimum!"
-            self.total_points += 1
-        else:
-            message = "Below average more steps need!"
-        self.add_log_entry(f"Steps Done:{steps} {message}")
+        # Points and the "great!"/"minimum!" wording both come from the steps rule in habit_scoring.py
+        self.record.daily_steps = steps
 
     def get_final_points(self):   
         total = self.total_points
-        message = ""
-        if total == 7:
-            message = "Excellent! You hit all your goals today. 💯"
-        elif total >= 4:
-            message = "Great job! You're doing very well. 👍"
-        elif total >= 2:
-            message = "Keep building those habits."
-        else:
-            message = "Start again never give up!"
-        self.add_log_entry(f"Today's Points: {total}/7 - {message}")
-        return f"You got {total}/7 points today! - {message}"
+        # The maximum is derived from the rules, so it never drifts from what can actually be earned
+        self.record.points = total
+        self.record.max_points = SCORER.max_points
+        message = SCORER.message(total)
+        return f"You got {total}/{SCORER.max_points} points today! - {message}"
                 
     def get_full_log_content(self):
         """Returns the complete log content as a single string."""
-        return "\n".join(self.log_entries)
+        return self.log_store.format_day(self.today, self.get_log_lines())
     
-    def reset_for_new_day(self):
-        """Resets all internal state for a new day's tracking."""
-        self.today = datetime.date.today()
-        self.total_points = 0
-        self.log_entries = [f"\n=== {self.today} ==="] # Start new log with new date
-        self.answers = {} # Clear all stored answers
+    def reset_for_new_day(self, day=None):
+        """Resets all internal state for a new day's tracking (today unless `day` is given)."""
+        self.today = day or datetime.date.today()
+        self.record = DayRecord(self.today) # Start a new, empty record
+
+    def open_day(self, day):
+        """
+        Starts tracking `day` (a past day, or today) with its stored answers, so they
+        can be corrected or a missed day filled in. Only that day is read from the
+        log; saving it writes only that day back (see LogStore.write_day).
+        Returns True if the day was logged before.
+        """
+        stored = self.log_store.get_day(day)
+        self.today = day
+        self.record = stored if stored is not None else DayRecord(day)
+        return stored is not None
+
+    def get_history(self):
+        """
+        Returns the columnar history (habit_history.HabitHistory) of every logged day.
+        It comes from the summary cache next to the log, which only parses the part of
+        the log that changed since it was saved, and is then kept up to date by
+        write_final_log_to_file.
+        """
+        with self.sidecar_lock:
+            if self.history is None:
+                from habit_summary_cache import SummaryCache # NumPy is only needed once analytics are used
+                self.summary_cache = SummaryCache.open(self.summary_path, self.log_store)
+                self.history = self.summary_cache.history
+        return self.history
+
+    def get_month_aggregates(self):
+        """Returns the per-month aggregates of the history (see habit_summary_cache.month_aggregates)."""
+        self.get_history()
+        return self.summary_cache.month_aggregates()
+
+    def get_stats(self):
+        """
+        Returns the streaks and rolling averages of the whole history.
+        They come from the saved snapshot when it matches the log; otherwise
+        they are rebuilt from the log once and saved.
+        """
+        with self.sidecar_lock:
+            if self.stats is None:
+                signature = self.log_store.signature()
+                self.stats = HabitStats.load(self.stats_path, signature)
+                if self.stats is None:
+                    self.stats = HabitStats.from_records(self.log_store.iter_records())
+                    self.stats.save(self.stats_path, signature)
+        return self.stats
+
+    def get_search_index(self):
+        """
+        Returns the search index of the sleep quality and junk food notes.
+        It comes from the saved index when it matches the log; otherwise it is
+        rebuilt from the log once and saved, which takes a while on a long history:
+        the GUI calls this from its log writer thread (see HabitTrackerApp.load_search_index).
+        """
+        with self.sidecar_lock:
+            if self.search_index is None:
+                signature = self.log_store.signature()
+                self.search_index = SearchIndex.load(self.search_path, signature)
+                if self.search_index is None:
+                    self.search_index = SearchIndex.from_records(self.log_store.iter_records())
+                    self.search_index.save(self.search_path, signature)
+        return self.search_index
+
+    def search_notes(self, query):
+        """Returns {field: sorted dates} of the days whose notes contain every word of `query`."""
+        return self.get_search_index().search(query)
+
+    def get_sleep_analysis(self):
+        """Returns the sleep analytics (habit_sleep.SleepAnalysis) of the whole history."""
+        from habit_sleep import SleepAnalysis # Needs NumPy, like get_history()
+        return SleepAnalysis(self.get_history())
+
+    def get_stats_summary(self):
+        """
+        Returns the streak, rolling-average and sleep lines for the summary screen.
+        The first call may parse the whole log (see get_history), so the GUI calls
+        it from its log writer thread.
+        """
+        lines = self.get_stats().summary_lines(datetime.date.today().toordinal())
+        try:
+            lines += self.get_sleep_analysis().summary_lines()
+        except ImportError:
+            pass # NumPy isn't installed: no sleep analytics
+        return "\n".join(lines)
 
     def get_log_file_path(self):
     # This logic can be extracted and reused
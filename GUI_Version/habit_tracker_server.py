@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from habit_tracker_logic import BACKENDS, HabitTrackerLogic, get_clean_time, parse_yes_no, parse_number
+
+# --- Multi-User HTTP/JSON Service ---
+# Runs HabitTrackerLogic for many users on one host. Every user gets their own
+# logic instance and their own log directory (<data dir>/<user>/habit_log.txt).
+# The event loop never touches the disk: creating a user's logic and saving
+# their day both run in a thread pool.
+#
+# Endpoints (JSON in, JSON out):
+#     GET  /health
+#     GET  /users/<user>                  -> today's answers and points so far
+#     POST /users/<user>/sleep            {"bedtime": "23:30", "waketime": "7", "sleep_quality": "Good"}
+#     POST /users/<user>/morning_walk     {"answer": "yes"}
+#     POST /users/<user>/breakfast        {"answer": "no"}
+#     POST /users/<user>/pomodoro         {"sessions": 6}
+#     POST /users/<user>/junk_food        {"answer": "yes", "what": "chips"}
+#     POST /users/<user>/daily_steps      {"steps": 8000}
+#     POST /users/<user>/points           -> get_final_points() and saves the day
+#     POST /users/<user>/reset            -> starts a new day
+#
+# A session also starts a new day by itself on its first request after midnight.
+
+USER_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+MAX_BODY_SIZE = 64 * 1024
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _yes_no(value):
+    """parse_yes_no, but JSON clients may also send 1/0 or true/false."""
+    if isinstance(value, bool) or value in (0, 1):
+        return int(value)
+    return parse_yes_no(_text(value))
+
+
+def _number(value):
+    """parse_number, but JSON clients may also send a plain integer."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value >= 0 else None
+    return parse_number(_text(value))
+
+
+# --- Step Validation (same rules and messages as the GUI's validators) ---
+
+def validate_sleep(payload):
+    bedtime = get_clean_time(_text(payload.get("bedtime")))
+    if bedtime is None:
+        return {"is_valid": False, "message": "Invalid bedtime. Use HH:MM or HH.", "cleaned_data": None}
+    waketime = get_clean_time(_text(payload.get("waketime")))
+    if waketime is None:
+        return {"is_valid": False, "message": "Invalid wake time. Use HH:MM or HH.", "cleaned_data": None}
+    sleep_quality = _text(payload.get("sleep_quality")).strip()
+    if not sleep_quality:
+        return {"is_valid": False, "message": "Please comment on your sleep quality.", "cleaned_data": None}
+    return {"is_valid": True, "message": "", "cleaned_data": (bedtime, waketime, sleep_quality)}
+
+
+def validate_yes_no(payload):
+    answer = _yes_no(payload.get("answer"))
+    if answer is None:
+        return {"is_valid": False, "message": "Please answer 'yes' or 'no'.", "cleaned_data": None}
+    return {"is_valid": True, "message": "", "cleaned_data": (answer,)}
+
+
+def validate_count(key):
+    def validate(payload):
+        number = _number(payload.get(key))
+        if number is None:
+            return {"is_valid": False, "message": "Please enter a valid positive number.", "cleaned_data": None}
+        return {"is_valid": True, "message": "", "cleaned_data": (number,)}
+    return validate
+
+
+def validate_junk_food(payload):
+    answer = _yes_no(payload.get("answer"))
+    if answer is None:
+        return {"is_valid": False, "message": "Please answer 'yes' or 'no' for junk food.", "cleaned_data": None}
+    what = _text(payload.get("what")).strip()
+    if answer == 1 and not what:
+        return {"is_valid": False, "message": "Please specify what junk food you ate.", "cleaned_data": None}
+    return {"is_valid": True, "message": "", "cleaned_data": (answer, what if answer == 1 else None)}
+
+
+# step name -> (DayRecord field set by the step, validation function, HabitTrackerLogic method name)
+STEPS = {
+    "sleep": ("bed_time", validate_sleep, "process_sleep_data"),
+    "morning_walk": ("morning_walk", validate_yes_no, "process_morning_walk"),
+    "breakfast": ("healthy_breakfast", validate_yes_no, "process_breakfast_data"),
+    "pomodoro": ("pomodoro_done", validate_count("sessions"), "process_pomodoro_data"),
+    "junk_food": ("junk_food", validate_junk_food, "process_junk_food_data"),
+    "daily_steps": ("daily_steps", validate_count("steps"), "process_daily_steps_data"),
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class UserSession:
+    """One user's tracking state. The lock keeps that user's requests in order."""
+
+    def __init__(self, logic):
+        self.logic = logic
+        self.lock = asyncio.Lock()
+        self.finished = False # get_final_points() was called for the current day
+
+
+class HabitTrackerServer:
+    def __init__(self, data_dir, backend="text", io_workers=16):
+        self.data_dir = data_dir
+        self.backend = backend
+        self.sessions = {}
+        self.creating = {} # user -> future of the session being created
+        self.executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="habit-io")
+
+    async def run_io(self, func, *args):
+        """Runs blocking file work in the I/O thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _create_logic(self, user):
+        user_dir = os.path.join(self.data_dir, user)
+        os.makedirs(user_dir, exist_ok=True)
+        return HabitTrackerLogic(backend=self.backend, log_dir=user_dir)
+
+    async def get_session(self, user):
+        """Returns the user's session, creating it (off the event loop) on first use."""
+        if not USER_RE.match(user):
+            raise HttpError(400, "User names may only contain letters, digits, '-' and '_'.")
+        session = self.sessions.get(user)
+        if session is not None:
+            return session
+        pending = self.creating.get(user)
+        if pending is None:
+            pending = asyncio.ensure_future(self.run_io(self._create_logic, user))
+            self.creating[user] = pending
+        try:
+            logic = await asyncio.shield(pending)
+        finally:
+            self.creating.pop(user, None)
+        return self.sessions.setdefault(user, UserSession(logic))
+
+    # --- Request Handlers ---
+
+    def _state(self, session):
+        logic = session.logic
+        return {"date": str(logic.today), "answers": logic.record.answers(),
+                "total_points": logic.total_points, "finished": session.finished}
+
+    async def handle_step(self, session, step, payload):
+        answer_key, validate, method_name = STEPS[step]
+        result = validate(payload)
+        if not result["is_valid"]:
+            raise HttpError(400, result["message"])
+        async with session.lock:
+            if session.finished or session.logic.record.get(answer_key) is not None:
+                raise HttpError(409, f"'{step}' was already logged today. Reset to start a new day.")
+            getattr(session.logic, method_name)(*result["cleaned_data"])
+            return self._state(session)
+
+    async def handle_points(self, session):
+        async with session.lock:
+            if session.finished:
+                raise HttpError(409, "Today's points were already calculated. Reset to start a new day.")
+            summary = session.logic.get_final_points()
+            saved = await self.run_io(session.logic.write_final_log_to_file)
+            # Only a saved day is finished: after a failed save the client can retry without losing the answers
+            session.finished = saved
+            return {**self._state(session), "summary": summary, "saved": saved}
+
+    def current_day(self):
+        return datetime.date.today()
+
+    async def roll_over(self, session):
+        """Starts a new day when the date changed since the session's day began (the server runs past midnight)."""
+        today = self.current_day()
+        if session.logic.today != today:
+            async with session.lock:
+                if session.logic.today != today:
+                    session.logic.reset_for_new_day(today)
+                    session.finished = False
+
+    async def handle_reset(self, session):
+        async with session.lock:
+            session.logic.reset_for_new_day()
+            session.finished = False
+            return self._state(session)
+
+    async def dispatch(self, method, path, payload):
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        if parts == ["health"] and method == "GET":
+            return {"status": "ok", "users": len(self.sessions)}
+        if len(parts) < 2 or parts[0] != "users":
+            raise HttpError(404, "Not found.")
+        session = await self.get_session(parts[1])
+        await self.roll_over(session)
+        if len(parts) == 2:
+            if method != "GET":
+                raise HttpError(405, "Use GET.")
+            return self._state(session)
+        if len(parts) != 3:
+            raise HttpError(404, "Not found.")
+        if method != "POST":
+            raise HttpError(405, "Use POST.")
+        action = parts[2]
+        if action in STEPS:
+            return await self.handle_step(session, action, payload)
+        if action == "points":
+            return await self.handle_points(session)
+        if action == "reset":
+            return await self.handle_reset(session)
+        raise HttpError(404, f"Unknown step '{action}'.")
+
+    # --- HTTP Plumbing ---
+
+    async def read_request(self, reader):
+        """Returns (method, path, headers, body), or None when the client closed the connection."""
+        request_line = await self.read_line(reader)
+        if not request_line.strip():
+            return None
+        try:
+            method, path, _ = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line.")
+        headers = {}
+        while True:
+            line = await self.read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length") or "0"
+        if not length.isdigit():
+            raise HttpError(400, "Invalid Content-Length.")
+        length = int(length)
+        if length > MAX_BODY_SIZE:
+            raise HttpError(413, "Request body too large.")
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            raise HttpError(400, "Request body is shorter than Content-Length.")
+        return method.upper(), path, headers, body
+
+    async def read_line(self, reader):
+        """One line of the request head. A line longer than the stream limit is a bad request."""
+        try:
+            return await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError): # readline() reports an overrun as ValueError
+            raise HttpError(400, "Request line or header too long.")
+
+    def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    try:
+                        payload = json.loads(body) if body else {}
+                    except ValueError:
+                        raise HttpError(400, "Request body must be JSON.")
+                    if not isinstance(payload, dict):
+                        raise HttpError(400, "Request body must be a JSON object.")
+                    status, response = 200, await self.dispatch(method, path, payload)
+                except HttpError as e:
+                    # keep_alive is still False for errors in the request itself, so the connection is closed
+                    status, response = e.status, {"error": e.message}
+                except ConnectionError:
+                    break
+                except Exception as e:
+                    print(f"Error handling request: {e}")
+                    status, response = 500, {"error": "Internal server error."}
+                self.write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port, ready=None):
+        """Starts listening and serves forever. `ready` (an asyncio.Event) is set once the socket is open."""
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=4096)
+        self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the habit tracker to many users over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", default="habit_users", help="Directory holding one log folder per user")
+    parser.add_argument("--backend", choices=BACKENDS, default="text")
+    args = parser.parse_args()
+
+    server = HabitTrackerServer(args.data_dir, args.backend)
+    print(f"Habit tracker service listening on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
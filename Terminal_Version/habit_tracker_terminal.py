@@ -8,49 +8,66 @@
 
 
 
+import argparse
 import datetime
+import os
+import sys
 
-def get_clean_time(prompt):
-    while True:
-        user_input = input(prompt).strip()
+# The log storage layer is shared with the GUI version
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "GUI_Version"))
+from habit_log_store import LogStore
+from habit_time_parser import clean_time
+from habit_scoring import SCORER
 
-        # Handle 4-digit time like "2311" => "23:11"
-        if len(user_input) == 4 and user_input.isdigit():
-            user_input = user_input[:2] + ":" + user_input[2:]
-        
-        # Try multiple formats
-        for fmt in ("%H:%M", "%H", "%H.%M"):
-            try:
-                parsed = datetime.datetime.strptime(user_input, fmt)
-                return parsed.strftime("%H:%M")
-            except ValueError:
-                continue
+LOG_FILE = "habit_log.txt"
+
+# Each helper asks through `ask` (input() when interactive). With retry=False an
+# invalid answer raises ValueError instead of asking again, which is what batch mode needs.
+
+def get_clean_time(prompt, ask=input, retry=True):
+    while True:
+        user_input = ask(prompt).strip()
+
+        # Accepts "2311" (=> "23:11"), "23", "23.30" and "7:30"; see habit_time_parser.py
+        cleaned = clean_time(user_input)
+        if cleaned is not None:
+            return cleaned
+        if not retry:
+            raise ValueError(f"Invalid time format: {user_input!r}")
         print("Invalid time format. Please enter like 23:00, 23, 23.30")
 
-def ask_yes_no(prompt):
+def ask_yes_no(prompt, ask=input, retry=True):
     while True:
-        answer = input(prompt + " Yes or No: ").strip().lower()
+        answer = ask(prompt + " Yes or No: ").strip().lower()
         if answer == "yes":
             return 1
         elif answer == "no":
             return 0
+        elif not retry:
+            raise ValueError(f"Expected yes or no, got {answer!r}")
         else:
             print("Please type 'yes or 'no")
 
-def get_number(prompt):
+def get_number(prompt, ask=input, retry=True):
         while True:
-            user_input = input(prompt)
+            user_input = ask(prompt).strip()
             if user_input.isdigit():
                return int(user_input)
+            elif not retry:
+                raise ValueError(f"Expected a number, got {user_input!r}")
             else:
                 print("Please enter a number.")
 
 
 class HabitTracker:
-    def __init__(self):
-        self.today = datetime.date.today()
-        print("Welcome to the Daily Habit Tracker!")
-        self.write_log(f"\n=== {self.today} ===") #date header
+    def __init__(self, day=None, ask=input, log_store=None):
+        # Batch mode passes its own `ask` and day, and saves many trackers' entries at once
+        self.today = day or datetime.date.today()
+        self.ask = ask
+        self.interactive = ask is input
+        self.entries = [] # Today's log lines, kept in memory and written once at the end
+        if self.interactive:
+            print("Welcome to the Daily Habit Tracker!")
         self.total_points = 0 # Initialize total points counter
         self.track_sleep()
         self.morning_walk()
@@ -59,57 +76,53 @@ class HabitTracker:
         self.junk_food_check()
         self.track_daily_steps()
         self.check_points()
-        self.goodbye()
+        if log_store is not None:
+            # One write for the whole day; a day that was already logged is replaced, not duplicated
+            log_store.write_day(self.today, self.entries)
+            self.goodbye()
 
     def write_log(self, entry):
-        with open("habit_log.txt", "a", encoding="utf-8") as log:
-            log.write(entry + "\n")
+        self.entries.append(entry)
             
 
     def track_sleep(self):
-        sleep_time = get_clean_time("What time did you go to bed? (enter example, 23:30 or 23): ")
-        wake_time = get_clean_time("What time did you wake up? (enter example 7:30 or 7): ")
-        sleep_quality = input("How was quality of your sleep comment!: ")
+        sleep_time = get_clean_time("What time did you go to bed? (enter example, 23:30 or 23): ", self.ask, self.interactive)
+        wake_time = get_clean_time("What time did you wake up? (enter example 7:30 or 7): ", self.ask, self.interactive)
+        sleep_quality = self.ask("How was quality of your sleep comment!: ")
         self.write_log(f"Sleep log: Bedtime -- {sleep_time} | Wake Time -- {wake_time} | Sleep Quality -- {sleep_quality}")
 
     def morning_walk(self):
-        walk = ask_yes_no("Did you go for a morning walk after waking up?")
-        self.total_points += walk
+        walk = ask_yes_no("Did you go for a morning walk after waking up?", self.ask, self.interactive)
+        points = SCORER.points_for("morning_walk", walk)
+        self.total_points += points
         if walk:
-            self.write_log(f"Morning Walk: Walk done👍 +{walk}")
+            self.write_log(f"Morning Walk: Walk done👍 +{points}")
         else:
             self.write_log(f"Morning Walk: None.")
 
     def track_breakfast(self):
-        healthy = ask_yes_no("Did you have a healty breakfast?") 
-        self.total_points += healthy
+        healthy = ask_yes_no("Did you have a healty breakfast?", self.ask, self.interactive)
+        points = SCORER.points_for("healthy_breakfast", healthy)
+        self.total_points += points
         if healthy:
-            self.write_log(f"Breakfast: Healthy👍 +{healthy}")
+            self.write_log(f"Breakfast: Healthy👍 +{points}")
         else:
             self.write_log(f"Breakfast: None.")
 
     def pomodoro_log(self):
-        pomodoro_done = get_number("How many Pomodoros did you complate today? ")
-        if pomodoro_done >= 8:
-            self.total_points += 2
-        elif pomodoro_done >=4:
-            self.total_points += 1
+        pomodoro_done = get_number("How many Pomodoros did you complate today? ", self.ask, self.interactive)
+        self.total_points += SCORER.points_for("pomodoro_done", pomodoro_done)
         total_minutes = pomodoro_done * 30
         hours, minutes = divmod(total_minutes, 60)
         self.write_log(f"Pomodoro/Work Done: {pomodoro_done} sessions = {hours}:{minutes:02d} hours of focused work.")
 
     def check_points(self):
+        # Same rules and maximum as the GUI (habit_scoring.py); this used to log "/5"
         total = self.total_points
-        if total == 7:
-            message = "Excellent! You hit all your goals today. 💯"
-        elif total >= 4:
-            message = "Great job! You're doing very well. 👍"
-        elif total >= 2:
-            message = "Keep building those habits."
-        else:
-            message = "Start again never give up!"
-        print(f"You got {total}/7 points today! - {message}")
-        self.write_log(f"Today's Points: {total}/5 - {message}")
+        message = SCORER.message(total)
+        if self.interactive:
+            print(f"You got {total}/{SCORER.max_points} points today! - {message}")
+        self.write_log(SCORER.points_line(total))
 
     
     def goodbye(self):
@@ -117,28 +130,79 @@ class HabitTracker:
 
 
     def junk_food_check(self):
-        junk = ask_yes_no("Did you eat junk food today? ")
+        junk = ask_yes_no("Did you eat junk food today? ", self.ask, self.interactive)
+        self.total_points += SCORER.points_for("junk_food", junk)
         if junk:
-            what = input("What was it? ")
+            what = self.ask("What was it? ")
             self.write_log(f"Junk Food: Yes: {what}")         
 
         else:
             self.write_log("Junk Food: No")
-            self.total_points += 1  
             
     def track_daily_steps(self):
-        steps = get_number("How many steps did you do today? ")
-        if steps >= 7000:
-            self.write_log(f"Steps Done:{steps} great!")
-            self.total_points += 2
-        elif steps >= 5000:
-            self.write_log(f"Steps Done: {steps} minimum!") 
-            self.total_points += 1
-        else:
-            self.write_log(f"Steps Done: {steps} Below average more steps need!")    
+        steps = get_number("How many steps did you do today? ", self.ask, self.interactive)
+        self.total_points += SCORER.points_for("daily_steps", steps)
+        self.write_log(f"Steps Done: {steps} {SCORER.label_for('daily_steps', steps)}")
 
         
 
 
 
-tracker = HabitTracker()
+def run_batch(source, log_store):
+    """
+    Logs many days without prompts. `source` yields the same answers you would type,
+    one per line and in the same order, each day preceded by its date (YYYY-MM-DD).
+    Blank lines between days are ignored; "What was it?" is only answered after a "yes".
+    All days are validated first and then saved in one write.
+    """
+    lines = (line.rstrip("\r\n") for line in source)
+    line_number = 0
+
+    def next_answer(prompt=""):
+        nonlocal line_number
+        line_number += 1
+        try:
+            return next(lines)
+        except StopIteration:
+            raise ValueError("Input ended in the middle of a day")
+
+    days = {}
+    while True:
+        try:
+            date_line = next(lines)
+        except StopIteration:
+            break
+        line_number += 1
+        if not date_line.strip():
+            continue
+        try:
+            day = datetime.date.fromisoformat(date_line.strip())
+            days[day] = HabitTracker(day, ask=next_answer).entries
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+    log_store.write_days(days)
+    return len(days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily habit tracker (terminal version).")
+    parser.add_argument("--batch", metavar="FILE", help="Read answers from FILE ('-' for stdin) instead of asking")
+    args = parser.parse_args()
+
+    log_store = LogStore(LOG_FILE)
+    if args.batch is None:
+        HabitTracker(log_store=log_store)
+        return
+    try:
+        if args.batch == "-":
+            logged = run_batch(sys.stdin, log_store)
+        else:
+            with open(args.batch, "r", encoding="utf-8") as source:
+                logged = run_batch(source, log_store)
+    except ValueError as e:
+        sys.exit(f"Batch stopped, nothing was saved. {e}")
+    print(f"Logged {logged} days to {LOG_FILE}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+# The GUI version's modules import each other by name, as they do when run from that folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GUI_Version"))
+
+from habit_log_parser import DayRecord  # noqa: E402
+from habit_scoring import SCORER  # noqa: E402
+
+
+def make_record(day, **answers):
+    """A finalized DayRecord (points scored) with a full set of answers, overridable by keyword."""
+    values = {"bed_time": "23:15", "wake_time": "07:05", "sleep_quality": "Good",
+              "morning_walk": 1, "healthy_breakfast": 0, "pomodoro_done": 4,
+              "junk_food": 0, "what_junk_food": None, "daily_steps": 6000}
+    values.update(answers)
+    record = DayRecord(day)
+    for field, value in values.items():
+        setattr(record, field, value)
+    record.points = SCORER.score(record)
+    record.max_points = SCORER.max_points
+    return record
+
+
+@pytest.fixture
+def start_day():
+    return datetime.date(2025, 3, 1)
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+from conftest import make_record
+from habit_log_parser import format_day_lines
+from habit_log_store import LogStore
+from habit_streaks import HabitStats
+from habit_tracker_logic import HabitTrackerLogic
+
+BACKENDS = ("text", "sqlite", "segmented")
+
+
+@pytest.fixture
+def existing_log(tmp_path, start_day):
+    """A habit_log.txt with ten days, as the app wrote it before a backend was chosen."""
+    records = [make_record(start_day + datetime.timedelta(days=i), pomodoro_done=i) for i in range(10)]
+    LogStore(str(tmp_path / "habit_log.txt")).write_days({record.day: format_day_lines(record) for record in records})
+    return records
+
+
+def _open(tmp_path, backend):
+    logic = HabitTrackerLogic(backend=backend, log_dir=str(tmp_path))
+    assert logic.get_log_file_path() == str(tmp_path / "habit_log.txt")
+    return logic
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_existing_log_is_carried_over(tmp_path, existing_log, backend):
+    logic = _open(tmp_path, backend)
+    assert logic.log_store.day_count() == len(existing_log)
+    for record in existing_log:
+        assert logic.log_store.get_day(record.day).row() == record.row()
+    assert _open(tmp_path, backend).log_store.day_count() == len(existing_log) # Imported once, not again
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_tracking_and_saving_a_day(tmp_path, existing_log, backend):
+    day = existing_log[-1].day + datetime.timedelta(days=1)
+    logic = HabitTrackerLogic(day=day, backend=backend, log_dir=str(tmp_path))
+    logic.process_sleep_data("23:00", "07:00", "Slept well")
+    logic.process_morning_walk(1)
+    logic.process_breakfast_data(1)
+    logic.process_pomodoro_data(8)
+    logic.process_junk_food_data(0)
+    logic.process_daily_steps_data(7000)
+    assert logic.get_final_points().startswith("You got 7/7 points today!")
+    assert logic.write_final_log_to_file()
+
+    stored = logic.log_store.get_day(day)
+    assert stored.row() == logic.record.row()
+    assert logic.get_stats().current_streaks()["morning_walk"] == len(existing_log) + 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_editing_a_past_day(tmp_path, existing_log, backend):
+    logic = _open(tmp_path, backend)
+    logic.get_stats()
+    edited = existing_log[4]
+    assert logic.open_day(edited.day)
+    assert logic.record.row() == edited.row()
+
+    logic.process_morning_walk(0) # Breaks the walking streak in the middle
+    logic.get_final_points()
+    assert logic.write_final_log_to_file()
+
+    assert logic.log_store.get_day(edited.day).morning_walk == 0
+    assert logic.log_store.day_count() == len(existing_log)
+    rebuilt = HabitStats.from_records(logic.log_store.iter_records())
+    assert logic.get_stats().longest == rebuilt.longest
+    assert logic.get_stats().current == rebuilt.current
+    assert logic.get_stats().longest["morning_walk"] == 5
+
+    assert not logic.open_day(existing_log[0].day - datetime.timedelta(days=1)) # Not logged: starts empty
+    assert logic.record.morning_walk is None
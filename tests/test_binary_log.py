@@ -0,0 +1,80 @@
+import datetime
+import random
+
+import pytest
+
+pytest.importorskip("numpy") # BinaryDayLog.write sorts the records with NumPy
+
+from conftest import make_record
+from habit_binary_log import BinaryDayLog, StringTable, binary_to_text, text_to_binary
+from habit_log_parser import format_day_lines, iter_day_records
+from habit_log_store import LogStore
+
+
+def _random_records(start_day, count, seed):
+    random.seed(seed)
+    records = []
+    for i in range(count):
+        junk = random.choice((0, 1))
+        records.append(make_record(
+            start_day + datetime.timedelta(days=i),
+            bed_time=random.choice(("22:45", "00:10", "01:20")), wake_time=random.choice(("06:30", "08:05")),
+            sleep_quality=random.choice(("Good", "Restless, woke up twice", "Çok iyi")),
+            morning_walk=random.choice((0, 1)), healthy_breakfast=random.choice((0, 1)),
+            pomodoro_done=random.choice((0, 4, 9)), junk_food=junk,
+            what_junk_food=random.choice(("chips", "cake")) if junk else None,
+            daily_steps=random.choice((0, 5000, 12000))))
+    return records
+
+
+def test_text_to_binary_to_text_round_trip(tmp_path, start_day):
+    records = _random_records(start_day, 200, seed=3)
+    log_path = str(tmp_path / "habit_log.txt")
+    store = LogStore(log_path)
+    store.write_days({record.day: format_day_lines(record) for record in reversed(records)}) # Out of order on purpose
+
+    assert text_to_binary(log_path, str(tmp_path / "habit_log.bin")) == len(records)
+    binary_log = BinaryDayLog(str(tmp_path / "habit_log.bin"))
+    assert [record.row() for record in binary_log] == [record.row() for record in records] # Sorted by date
+
+    copy_path = str(tmp_path / "copy.txt")
+    assert binary_to_text(str(tmp_path / "habit_log.bin"), copy_path) == len(records)
+    assert [record.row() for record in iter_day_records(copy_path)] == [record.row() for record in records]
+
+
+def test_put_keeps_the_records_sorted(tmp_path, start_day):
+    binary_log = BinaryDayLog(str(tmp_path / "habit_log.bin"))
+    records = _random_records(start_day, 30, seed=5)
+    order = list(range(len(records)))
+    random.shuffle(order) # Appends, back-dated inserts and replacements
+    for i in order + order[:10]:
+        binary_log.put(records[i])
+
+    assert len(binary_log) == len(records)
+    assert [record.row() for record in binary_log] == [record.row() for record in records]
+    assert binary_log.get_day(records[7].day).row() == records[7].row()
+    assert binary_log.get_day(start_day - datetime.timedelta(days=1)) is None
+
+
+def test_to_text_merges_into_an_existing_log(tmp_path, start_day):
+    records = _random_records(start_day, 40, seed=8)
+    BinaryDayLog(str(tmp_path / "habit_log.bin")).write(records[10:])
+    log_path = str(tmp_path / "habit_log.txt")
+    LogStore(log_path).write_days({record.day: format_day_lines(record) for record in records[:20]})
+
+    assert binary_to_text(str(tmp_path / "habit_log.bin"), log_path, chunk_days=7) == 30
+    assert [record.row() for record in iter_day_records(log_path)] == [record.row() for record in records]
+    assert LogStore(log_path).get_day(records[15].day).row() == records[15].row()
+
+
+def test_put_saves_the_string_table_only_for_new_text(tmp_path, start_day, monkeypatch):
+    saved = []
+    original_save = StringTable.save
+    monkeypatch.setattr(StringTable, "save", lambda table, path: saved.append(path) or original_save(table, path))
+    binary_log = BinaryDayLog(str(tmp_path / "habit_log.bin"))
+    for i, text in enumerate(("Good", "Good", "Tired", "Good")):
+        binary_log.put(make_record(start_day + datetime.timedelta(days=i), sleep_quality=text))
+    assert len(saved) == 2 # "Good" and "Tired"
+
+    reopened = BinaryDayLog(str(tmp_path / "habit_log.bin"))
+    assert [record.sleep_quality for record in reopened] == ["Good", "Good", "Tired", "Good"]
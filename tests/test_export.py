@@ -0,0 +1,89 @@
+import csv
+import datetime
+import json
+
+import pytest
+
+from habit_export import EXPORT_FIELDS, TEXT_FIELDS, export_log, resolve_format
+from habit_import import import_days, read_day_rows
+from habit_log_parser import DayRecord, format_day_lines
+from habit_log_store import LogStore
+from habit_scoring import SCORER
+
+DAY = datetime.date(2025, 1, 30)
+
+
+@pytest.fixture
+def log_store(tmp_path):
+    """Seven days with every kind of value: full days, junk food, a day cut short."""
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    days = {}
+    for i in range(7):
+        day = DAY + datetime.timedelta(days=i)
+        if i == 3:
+            record = DayRecord(day, morning_walk=1, pomodoro_done=2) # Only two steps answered
+        else:
+            record = DayRecord(day, "22:30", "06:45", "Ünlü, iyi" if i % 2 else "Good", i % 2, 1, i, i % 3 == 0,
+                               "Ice cream" if i % 3 == 0 else None, 1000 * i)
+            record.junk_food = int(record.junk_food)
+            record.points, record.max_points = SCORER.score(record), SCORER.max_points # As the app scores it
+        days[day] = format_day_lines(record)
+    store.write_days(days)
+    return store
+
+
+def test_csv_schema_and_import_round_trip(tmp_path, log_store):
+    path = str(tmp_path / "export.csv")
+    assert export_log(log_store, path, chunk_days=3) == (7, path)
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == EXPORT_FIELDS
+    assert rows[4][:7] == ["2025-02-02", "", "", "", "1", "", "2"] # Missing values are empty cells
+    assert len(rows) == 8
+
+    full_days = [row for row in read_day_rows(path) if row["date"] != "2025-02-02"]
+    copy = LogStore(str(tmp_path / "copy.txt"))
+    assert import_days(full_days, copy) == (6, [])
+    for row in full_days:
+        day = datetime.date.fromisoformat(row["date"])
+        assert copy.get_day(day) == log_store.get_day(day)
+
+
+def test_json_lines_schema(tmp_path, log_store):
+    path = str(tmp_path / "export.jsonl")
+    export_log(log_store, path, chunk_days=2)
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [list(line) for line in lines] == [list(EXPORT_FIELDS)] * 7
+    assert lines[0]["date"] == "2025-01-30" and lines[0]["what_junk_food"] == "Ice cream"
+    assert lines[3]["bed_time"] is None and lines[3]["morning_walk"] == 1
+    assert lines[1]["sleep_quality"] == "Ünlü, iyi"
+
+
+def test_npz_columns(tmp_path, log_store):
+    np = pytest.importorskip("numpy")
+    count, path = export_log(log_store, str(tmp_path / "export.npz"), chunk_days=4)
+    with np.load(path) as data:
+        assert set(data.files) == set(EXPORT_FIELDS) | {f"{field}_values" for field in TEXT_FIELDS}
+        assert data["date"].dtype == np.dtype("<M8[D]") and len(data["date"]) == count == 7
+        assert str(data["date"][6]) == "2025-02-05"
+        assert data["daily_steps"].dtype == np.int64 and data["daily_steps"][3] == -1
+        quality = data["sleep_quality"]
+        assert quality.dtype == np.int32 and quality[3] == -1
+        assert [data["sleep_quality_values"][code] for code in quality[:3]] == ["Good", "Ünlü, iyi", "Good"]
+
+
+def test_parquet_schema(tmp_path, log_store):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _, path = export_log(log_store, str(tmp_path / "export.parquet"), chunk_days=3)
+    table = pq.read_table(path)
+    assert table.schema.names == list(EXPORT_FIELDS)
+    assert table.column("date").to_pylist()[0] == DAY
+    assert table.num_rows == 7
+
+
+def test_format_from_the_extension(tmp_path):
+    assert resolve_format("a.JSON") == ("jsonl", "a.JSON")
+    assert resolve_format("a.npz") == ("npz", "a.npz")
+    with pytest.raises(ValueError):
+        resolve_format("a.txt")
@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+from conftest import make_record
+from habit_import import import_days, read_day_rows, validate_day_row
+from habit_log_parser import format_day_lines
+from habit_log_store import LogStore
+
+
+def _row(day, **changes):
+    row = {"date": day.isoformat(), "bed_time": "2330", "wake_time": "7", "sleep_quality": "Fine",
+           "morning_walk": "yes", "healthy_breakfast": "no", "pomodoro_done": "4", "junk_food": "0",
+           "what_junk_food": "", "daily_steps": "7000"}
+    row.update(changes)
+    return row
+
+
+@pytest.mark.parametrize("changes, message", [
+    ({"date": "2025-02-30"}, "Invalid date. Use YYYY-MM-DD."),
+    ({"bed_time": "25:00"}, "Invalid bedtime. Use HH:MM or HH."),
+    ({"wake_time": ""}, "Invalid wake time. Use HH:MM or HH."),
+    ({"sleep_quality": "  "}, "Please comment on your sleep quality."),
+    ({"morning_walk": "maybe"}, "Please answer yes or no for morning_walk."),
+    ({"daily_steps": "-5"}, "Please enter a valid positive number for daily_steps."),
+    ({"junk_food": "yes", "what_junk_food": ""}, "Please specify what junk food you ate."),
+])
+def test_invalid_rows_are_reported_and_skipped(tmp_path, start_day, changes, message):
+    assert validate_day_row(_row(start_day, **changes))["message"] == message
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    rows = [_row(start_day), _row(start_day + datetime.timedelta(days=1), **changes)]
+    assert import_days(rows, store) == (1, [(2, message)])
+    assert store.day_count() == 1
+
+
+def test_times_are_cleaned_like_the_gui(start_day):
+    cleaned = validate_day_row(_row(start_day))["cleaned_data"]
+    assert (cleaned["bed_time"], cleaned["wake_time"]) == ("23:30", "07:00")
+    assert validate_day_row(_row(start_day), times=("22:00", "06:00"))["cleaned_data"]["bed_time"] == "22:00"
+
+
+def test_merge_into_an_existing_log(tmp_path, start_day):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    existing = [make_record(start_day + datetime.timedelta(days=i), pomodoro_done=1) for i in range(5)]
+    store.write_days({record.day: format_day_lines(record) for record in existing})
+
+    replaced = start_day + datetime.timedelta(days=2)
+    added = start_day + datetime.timedelta(days=7)
+    rows = [_row(added), _row(replaced, pomodoro_done="9"), _row(replaced, pomodoro_done="3")]
+    assert import_days(rows, store) == (2, [(3, f"{replaced} is already imported from an earlier row.")])
+
+    reopened = LogStore(store.log_path)
+    assert reopened.day_count() == 6
+    assert reopened.get_day(replaced).pomodoro_done == 9 # The first row for a date wins
+    assert reopened.get_day(start_day).pomodoro_done == 1 # Days not in the import are kept
+    assert reopened.get_day(added).daily_steps == 7000
+
+
+def test_csv_and_json_lines_rows(tmp_path, start_day):
+    csv_path = tmp_path / "days.csv"
+    csv_path.write_text("date,bed_time,wake_time\n" + f"{start_day},23,7\n", encoding="utf-8")
+    jsonl_path = tmp_path / "days.jsonl"
+    jsonl_path.write_text('{"date": "%s", "daily_steps": 5000}\n\n' % start_day, encoding="utf-8")
+    assert list(read_day_rows(str(csv_path))) == [{"date": str(start_day), "bed_time": "23", "wake_time": "7"}]
+    assert list(read_day_rows(str(jsonl_path))) == [{"date": str(start_day), "daily_steps": 5000}]
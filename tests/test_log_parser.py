@@ -0,0 +1,48 @@
+import datetime
+import gzip
+
+import pytest
+
+import habit_log_parser
+from habit_log_parser import DayRecord, format_day_lines, iter_day_records, iter_day_rows, parse_day_lines
+
+DAY = datetime.date(2024, 12, 30)
+
+RECORDS = [
+    DayRecord(DAY, "23:40", "07:10", "Good", 1, 1, 6, 0, None, 8000, 7, 7),
+    DayRecord(DAY + datetime.timedelta(days=1), "01:05", "09:30", "Woke up twice | noisy", 0, 0, 0, 1, "Pizza, cola",
+              1200, 0, 7),
+    DayRecord(DAY + datetime.timedelta(days=2), morning_walk=1, pomodoro_done=3), # Closed before finishing
+    DayRecord(DAY + datetime.timedelta(days=3), "22:00", "06:00", "Çok iyi 😴", 1, 0, 12, 0, None, 0, 3, 5), # Terminal log
+    DayRecord(DAY + datetime.timedelta(days=5)), # A header with nothing under it
+]
+
+
+def _log_text(records):
+    return "".join(f"\n=== {record.day} ===\n" + "".join(line + "\n" for line in format_day_lines(record))
+                   for record in records)
+
+
+def test_format_and_parse_day_lines_round_trip():
+    for record in RECORDS:
+        assert parse_day_lines(record.day, format_day_lines(record)) == record
+
+
+@pytest.mark.parametrize("read_chars", [7, 64, 1 << 16]) # Chunks that cut blocks and lines anywhere
+def test_reading_a_log_file_round_trip(tmp_path, monkeypatch, read_chars):
+    monkeypatch.setattr(habit_log_parser, "READ_CHARS", read_chars)
+    path = tmp_path / "habit_log.txt"
+    path.write_text("Notes written before the first day\n" + _log_text(RECORDS), encoding="utf-8")
+    assert list(iter_day_records(str(path))) == RECORDS
+    assert list(iter_day_rows(str(path))) == [record.row() for record in RECORDS]
+
+
+def test_lines_gzip_and_unknown_lines(tmp_path):
+    text = _log_text(RECORDS[:2]).replace("Breakfast:", "Mood: great\nBreakfast:", 1)
+    text += "=== 2025-02-30 ===\n" # Not a real date: read as a line of the day before
+    assert list(iter_day_records(text.splitlines(keepends=True))) == RECORDS[:2]
+
+    gz_path = tmp_path / "habit_log.txt.gz"
+    with gzip.open(gz_path, "wt", encoding="utf-8") as f:
+        f.write(text)
+    assert list(iter_day_records(str(gz_path))) == RECORDS[:2]
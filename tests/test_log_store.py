@@ -0,0 +1,84 @@
+import datetime
+import random
+
+from habit_log_store import LogStore, scan_day_offsets
+
+
+def _lines(tag, count):
+    return [f"Note: {tag} {i}" for i in range(count)]
+
+
+def _assert_index_matches_log(store):
+    """The in-memory index, the sidecar file and a fresh scan of the log all agree."""
+    dates, offsets = scan_day_offsets(store.log_path)
+    assert store.dates == dates
+    assert store.offsets == offsets
+    reloaded = LogStore(store.log_path)
+    reloaded.load_index()
+    assert (reloaded.dates, reloaded.offsets) == (dates, offsets)
+
+
+def test_append_and_replace_last_day(tmp_path, start_day):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    store.write_day(start_day, _lines("first", 2))
+    store.write_day(start_day + datetime.timedelta(days=1), _lines("second", 2))
+    store.write_day(start_day + datetime.timedelta(days=1), _lines("second again", 5))
+
+    assert store.read_day(start_day) == _lines("first", 2)
+    assert store.read_day(start_day + datetime.timedelta(days=1)) == _lines("second again", 5)
+    assert store.day_count() == 2
+    _assert_index_matches_log(store)
+
+
+def test_editing_a_past_day_keeps_date_order_without_padding(tmp_path, start_day):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    days = [start_day + datetime.timedelta(days=i) for i in range(5)]
+    for day in days:
+        store.write_day(day, _lines(day, 2))
+
+    store.write_day(days[1], _lines("longer", 6)) # Grows: the later blocks move down
+    store.write_day(days[2], _lines("shorter", 1)) # Shrinks: the later blocks move up
+
+    assert store.day_labels() == [str(day) for day in days]
+    assert store.read_day(days[1]) == _lines("longer", 6)
+    assert store.read_day(days[2]) == _lines("shorter", 1)
+    assert store.read_day(days[4]) == _lines(days[4], 2)
+    with open(store.log_path, encoding="utf-8") as f:
+        assert "\n\n\n" not in f.read()
+    _assert_index_matches_log(store)
+
+
+def test_random_edits_match_a_fresh_parse(tmp_path, start_day):
+    random.seed(7)
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    expected = {}
+    for step in range(300):
+        day = start_day + datetime.timedelta(days=random.randrange(40))
+        lines = _lines(f"edit {step} " + "x" * random.randrange(200), random.randint(1, 5))
+        store.write_day(day, lines)
+        expected[day] = lines
+
+    _assert_index_matches_log(store)
+    fresh = LogStore(store.log_path)
+    fresh.rebuild_index()
+    for day, lines in expected.items():
+        assert fresh.read_day(day) == lines
+        assert store.get_day(day).day == day
+    assert [record.day for record in store.get_range(start_day, start_day + datetime.timedelta(days=40))] == sorted(expected)
+
+
+def test_rebuild_index_after_the_log_changed_outside(tmp_path, start_day):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    store.write_day(start_day, _lines("app", 2))
+    with open(store.log_path, "a", encoding="utf-8") as f:
+        f.write(f"\n=== {start_day + datetime.timedelta(days=1)} ===\nNote: edited by hand\n")
+
+    assert store.read_day(start_day + datetime.timedelta(days=1)) == ["Note: edited by hand"]
+    _assert_index_matches_log(store)
+
+
+def test_get_day_of_a_day_that_is_not_logged(tmp_path, start_day):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    assert store.get_day(start_day) is None
+    store.write_day(start_day, _lines("only", 1))
+    assert store.get_day(start_day + datetime.timedelta(days=1)) is None
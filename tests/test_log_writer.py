@@ -0,0 +1,50 @@
+import threading
+
+from habit_log_writer import BackgroundLogWriter
+
+
+def _drain(writer):
+    writer.close(timeout=5)
+    writer.poll()
+
+
+def test_jobs_run_in_order_and_results_arrive_on_poll():
+    writer = BackgroundLogWriter()
+    ran = []
+    delivered = []
+    for key in ("2025-01-01", "2025-01-02", "2025-01-03"):
+        writer.submit(key, lambda key=key: ran.append(key) or key.upper(),
+                      lambda result, error: delivered.append((result, error, threading.current_thread().name)))
+    _drain(writer)
+    assert ran == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert delivered == [(key, None, threading.current_thread().name) for key in ("2025-01-01", "2025-01-02", "2025-01-03")]
+    assert not writer.is_busy()
+
+
+def test_waiting_job_for_the_same_day_is_replaced():
+    writer = BackgroundLogWriter()
+    started = threading.Event()
+    release = threading.Event()
+    saved = []
+    writer.submit("blocker", lambda: started.set() or release.wait(5))
+    started.wait(5)
+    for version in range(3):
+        writer.submit("2025-01-01", lambda version=version: saved.append(version))
+    writer.submit("2025-01-02", lambda: saved.append("next day"))
+    assert writer.is_busy()
+    release.set()
+    _drain(writer)
+    assert saved == [2, "next day"] # Only the latest version, still before the later day
+
+
+def test_errors_go_to_the_callback_and_close_flushes_pending_jobs():
+    writer = BackgroundLogWriter()
+    results = []
+    def fail():
+        raise OSError("disk full")
+    writer.submit("a", fail, lambda result, error: results.append((result, str(error))))
+    writer.submit("b", lambda: "saved", lambda result, error: results.append((result, error)))
+    writer.close(timeout=5) # Waits for both jobs before the worker stops
+    assert not writer.thread.is_alive()
+    writer.poll()
+    assert results == [(None, "disk full"), ("saved", None)]
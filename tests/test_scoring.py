@@ -0,0 +1,70 @@
+import itertools
+
+import pytest
+
+from conftest import make_record
+from habit_scoring import SCORER
+from habit_streaks import STREAK_HABITS
+
+
+def legacy_score(answers):
+    """The points and "Today's Points" line the original process_* methods produced."""
+    total = 0
+    total += 1 if answers["morning_walk"] == 1 else 0
+    total += 1 if answers["healthy_breakfast"] == 1 else 0
+    if answers["pomodoro_done"] >= 8:
+        total += 2
+    elif answers["pomodoro_done"] >= 4:
+        total += 1
+    total += 1 if answers["junk_food"] != 1 else 0
+    if answers["daily_steps"] >= 7000:
+        total += 2
+    elif answers["daily_steps"] >= 5000:
+        total += 1
+    if total == 7:
+        message = "Excellent! You hit all your goals today. 💯"
+    elif total >= 4:
+        message = "Great job! You're doing very well. 👍"
+    elif total >= 2:
+        message = "Keep building those habits."
+    else:
+        message = "Start again never give up!"
+    return total, f"Today's Points: {total}/7 - {message}"
+
+
+ANSWERS = [dict(zip(("morning_walk", "healthy_breakfast", "junk_food", "pomodoro_done", "daily_steps"), values))
+           for values in itertools.product((0, 1), (0, 1), (0, 1), (0, 3, 4, 7, 8, 12), (0, 4999, 5000, 6999, 7000))]
+
+
+def test_max_points_match_the_legacy_maximum():
+    assert SCORER.max_points == 7
+
+
+@pytest.mark.parametrize("answers", ANSWERS)
+def test_scorer_matches_legacy_scoring(answers):
+    total, points_line = legacy_score(answers)
+    assert SCORER.score(answers) == total
+    assert SCORER.score(make_record(None, **answers)) == total
+    assert SCORER.points_line(total) == points_line
+
+
+def test_step_labels_match_legacy_wording():
+    assert SCORER.label_for("daily_steps", 7000) == "great!"
+    assert SCORER.label_for("daily_steps", 5000) == "minimum!"
+    assert SCORER.label_for("daily_steps", 4999) == "Below average more steps need!"
+
+
+def test_score_columns_matches_score():
+    np = pytest.importorskip("numpy")
+    columns = {field: np.array([answers[field] for answers in ANSWERS] + [-1]) for field in SCORER.rules}
+    totals = SCORER.score_columns(columns)
+    assert totals[:-1].tolist() == [legacy_score(answers)[0] for answers in ANSWERS]
+    assert totals[-1] == 0 # A day without any answers
+
+
+def test_streak_habits_follow_the_rules():
+    for answers in ANSWERS:
+        record = make_record(None, **answers)
+        assert STREAK_HABITS["pomodoro"](record) == (SCORER.points_for("pomodoro_done", answers["pomodoro_done"]) > 0)
+        assert STREAK_HABITS["daily_steps"](record) == (answers["daily_steps"] >= 5000)
+        assert STREAK_HABITS["no_junk_food"](record) == (answers["junk_food"] == 0)
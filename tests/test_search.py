@@ -0,0 +1,66 @@
+import datetime
+import random
+import threading
+
+from conftest import make_record
+from habit_search import SEARCH_FIELDS, SearchIndex, tokenize
+from habit_tracker_logic import HabitTrackerLogic
+
+NOTES = ("Restless, woke up twice", "slept well", "Chips and cake", "chips", "chocolate", "", None, "Rested well")
+
+
+def _brute_force(days, query):
+    """What search() should return, by reading every day's text."""
+    query_words = tokenize(query)
+    return {field: sorted(day for day, record in days.items()
+                          if query_words and all(any(word.startswith(q) for word in tokenize(getattr(record, field)))
+                                                 for q in query_words))
+            for field in SEARCH_FIELDS}
+
+
+def test_prefix_search_and_resaved_days(start_day):
+    random.seed(7)
+    index = SearchIndex()
+    days = {}
+    for _ in range(400):
+        day = start_day + datetime.timedelta(days=random.randrange(60))
+        days[day] = make_record(day, sleep_quality=random.choice(NOTES), what_junk_food=random.choice(NOTES))
+        index.add_day(days[day])
+    for query in ("chip", "chips", "ch", "rest", "well slept", "c w", "twice", "zzz", ""):
+        assert index.search(query) == _brute_force(days, query), query
+    assert sorted(index.sorted_words["sleep_quality"]) == index.sorted_words["sleep_quality"]
+    assert set(index.sorted_words["sleep_quality"]) == set(index.postings["sleep_quality"])
+
+
+def test_save_and_load_with_journal(tmp_path, start_day):
+    path = str(tmp_path / "habit_log.txt.search.json")
+    index = SearchIndex.from_records(make_record(start_day + datetime.timedelta(days=i), sleep_quality=NOTES[i % 3])
+                                     for i in range(20))
+    index.save(path, (100, 1))
+    changed = make_record(start_day + datetime.timedelta(days=4), sleep_quality="Nightmares")
+    index.add_day(changed)
+    index.save_day(path, changed, (110, 2))
+
+    assert SearchIndex.load(path, (100, 1)) is None # The journal moved it past that signature
+    loaded = SearchIndex.load(path, (110, 2))
+    assert loaded.journal_lines == 1
+    for query in ("nightmares", "restless", "slept", "chips"):
+        assert loaded.search(query) == index.search(query)
+    loaded.add_day(make_record(changed.day, sleep_quality="Slept well")) # Re-saving after a load still replaces
+    assert loaded.search("nightmares")["sleep_quality"] == []
+
+
+def test_concurrent_first_use_builds_one_index(tmp_path, start_day):
+    logic = HabitTrackerLogic(day=start_day, backend="text", log_dir=str(tmp_path))
+    logic.process_sleep_data("23:00", "07:00", "Restless")
+    logic.get_final_points()
+    assert logic.write_final_log_to_file()
+    fresh = HabitTrackerLogic(backend="text", log_dir=str(tmp_path))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fresh.get_search_index())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(index is results[0] for index in results)
+    assert fresh.search_notes("rest")["sleep_quality"] == [start_day]
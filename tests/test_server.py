@@ -0,0 +1,120 @@
+import asyncio
+import datetime
+import json
+
+import pytest
+
+from habit_tracker_server import MAX_BODY_SIZE, HabitTrackerServer
+
+
+def _run(tmp_path, client, server=None):
+    """Starts a server on a free port, runs client(server, port) against it and stops it."""
+    server = server or HabitTrackerServer(str(tmp_path), io_workers=2)
+
+    async def main():
+        ready = asyncio.Event()
+        serving = asyncio.ensure_future(server.serve("127.0.0.1", 0, ready))
+        await ready.wait()
+        try:
+            return await client(server, server.port)
+        finally:
+            serving.cancel()
+            server.executor.shutdown(wait=True)
+
+    return asyncio.run(main())
+
+
+async def _exchange(port, raw):
+    """Sends raw request bytes on a new connection; returns (status, JSON body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    return int(status_line.split()[1]), json.loads(body)
+
+
+def _request(method, path, payload=None, close=True):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    return (f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+            f"{'Connection: close' if close else 'X-Keep: 1'}\r\n\r\n").encode("latin-1") + body
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GARBAGE\r\n\r\n", 400), # Malformed request line
+    (b"GET /health HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /users/ann/daily_steps HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY_SIZE + 1), 413),
+    (b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n", 400), # Longer than the stream's line limit
+    (b"POST /users/ann/daily_steps HTTP/1.1\r\nContent-Length: 50\r\n\r\n{}", 400), # Client stopped sending
+], ids=["request line", "content length", "body too large", "line too long", "body cut short"])
+def test_bad_requests_get_an_error_and_a_closed_connection(tmp_path, raw, status):
+    async def client(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        if raw.endswith(b"{}"):
+            writer.write_eof() # The body ends early
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+    response = _run(tmp_path, client)
+    assert response.startswith(b"HTTP/1.1 %d " % status)
+    assert b"Connection: close" in response
+
+
+def test_status_codes(tmp_path):
+    async def client(server, port):
+        results = {}
+        for name, raw in (
+            ("health", _request("GET", "/health")),
+            ("unknown path", _request("GET", "/nothing")),
+            ("bad user", _request("GET", "/users/a%20b")),
+            ("wrong method", _request("POST", "/users/ann")),
+            ("unknown step", _request("POST", "/users/ann/dance", {})),
+            ("not json", b"POST /users/ann/daily_steps HTTP/1.1\r\nContent-Length: 3\r\nConnection: close\r\n\r\nabc"),
+            ("invalid steps", _request("POST", "/users/ann/daily_steps", {"steps": -3})),
+            ("steps", _request("POST", "/users/ann/daily_steps", {"steps": 8000})),
+            ("steps again", _request("POST", "/users/ann/daily_steps", {"steps": 9000})),
+        ):
+            results[name] = (await _exchange(port, raw))[0]
+        return results
+    assert _run(tmp_path, client) == {"health": 200, "unknown path": 404, "bad user": 400, "wrong method": 405,
+                                      "unknown step": 404, "not json": 400, "invalid steps": 400,
+                                      "steps": 200, "steps again": 409}
+
+
+def test_keep_alive_connection_serves_several_requests(tmp_path):
+    async def client(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(_request("GET", "/health", close=False) + _request("GET", "/users/ann"))
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+    assert _run(tmp_path, client).count(b"HTTP/1.1 200 OK") == 2
+
+
+def test_session_rolls_over_to_the_new_day(tmp_path):
+    day = datetime.date(2025, 5, 1)
+    server = HabitTrackerServer(str(tmp_path), io_workers=2)
+    server.current_day = lambda: day
+
+    async def client(server, port):
+        nonlocal day
+        await _exchange(port, _request("POST", "/users/ann/daily_steps", {"steps": 8000}))
+        finished = await _exchange(port, _request("POST", "/users/ann/points"))
+        day += datetime.timedelta(days=1) # Midnight passes
+        next_day = await _exchange(port, _request("POST", "/users/ann/daily_steps", {"steps": 500}))
+        return finished[1], next_day
+    finished, (status, state) = _run(tmp_path, client, server)
+    assert finished["finished"] and finished["date"] == "2025-05-01"
+    assert status == 200
+    assert state["date"] == "2025-05-02" and state["answers"] == {"daily_steps": 500} and not state["finished"]
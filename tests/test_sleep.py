@@ -0,0 +1,60 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from habit_history import HabitHistory  # noqa: E402
+from habit_log_parser import DayRecord  # noqa: E402
+from habit_sleep import SleepAnalysis  # noqa: E402
+
+DAY = datetime.date(2025, 9, 1)
+
+
+def _analysis(nights, **metrics):
+    """nights[i] is (bed_time, wake_time) of day i, or None for a day without a sleep line."""
+    records = []
+    for i, night in enumerate(nights):
+        record = DayRecord(DAY + datetime.timedelta(days=i))
+        if night is not None:
+            record.bed_time, record.wake_time = night
+        for metric, values in metrics.items():
+            setattr(record, metric, values[i])
+        records.append(record)
+    return SleepAnalysis(HabitHistory.from_records(reversed(records))) # Sorted by date again
+
+
+def test_no_usable_nights():
+    analysis = _analysis([None, ("23:00", None), (None, "07:00"), ("07:00", "07:00")])
+    assert len(analysis) == 0
+    assert analysis.mean_duration() is None and analysis.mean_bedtime() is None
+    assert analysis.bedtime_drift() is None and analysis.regularity() is None
+    assert analysis.summary_lines() == []
+
+
+def test_missing_and_implausible_nights_are_left_out():
+    analysis = _analysis([("23:00", "06:00"), ("23:00", None), None, ("01:00", "08:30"), ("12:00", "11:00")])
+    assert len(analysis) == 2 # 23 hours asleep is taken for a typo
+    assert analysis.mean_duration() == (7 * 60 + 7.5 * 60) / 2
+    assert analysis.summary_lines() == ["Sleep: 7:15 on average (7:15 over the last 30 days), bedtime 00:00"]
+
+
+def test_drift_and_regularity_skip_the_gaps():
+    nights = [(f"23:{i:02d}", f"07:{i:02d}") if i % 4 else None for i in range(28)] # A minute later every day
+    analysis = _analysis(nights)
+    assert analysis.bedtime_drift() == pytest.approx(7.0)
+    assert analysis.regularity() == pytest.approx(100 - 200 * 2 / (24 * 60), abs=1e-9) # Two minutes shifted per pair
+    same = _analysis([("22:30", "06:30")] * 10)
+    assert same.regularity() == 100.0 and same.bedtime_drift() == 0.0
+
+
+def test_next_day_correlations_ignore_days_without_the_metric():
+    nights = [("23:00", f"0{5 + i % 3}:00") for i in range(12)]
+    steps = [None if i % 5 == 0 else 1000 * (i % 3) for i in range(12)]
+    correlations = _analysis(nights, daily_steps=steps, points=[None] * 12).next_day_correlations()
+    assert correlations["points"] is None # Never logged
+    assert correlations["pomodoro_done"] is None
+    pairs = [(nights[i], steps[i + 1]) for i in range(11) if steps[i + 1] is not None]
+    durations = [(int(wake[:2]) + 24 - 23) * 60 for (_, wake), _ in pairs]
+    expected = np.corrcoef(durations, [next_steps for _, next_steps in pairs])[0, 1]
+    assert correlations["daily_steps"] == pytest.approx(expected)
@@ -0,0 +1,49 @@
+import datetime
+import random
+
+from conftest import make_record
+from habit_streaks import HabitStats
+
+
+def _random_record(day):
+    junk = random.choice((0, 0, 1))
+    return make_record(day, morning_walk=random.choice((0, 1, 1, 1)), healthy_breakfast=random.choice((0, 1)),
+                       pomodoro_done=random.choice((2, 4, 8)), junk_food=junk,
+                       what_junk_food="chips" if junk else None, daily_steps=random.choice((3000, 6000)))
+
+
+def _assert_same(stats, rebuilt):
+    assert stats.current == rebuilt.current
+    assert stats.longest == rebuilt.longest
+    assert stats.runs == rebuilt.runs
+    for key, window in stats.windows.items():
+        assert list(window) == list(rebuilt.windows[key])
+        assert stats.sums[key] == rebuilt.sums[key]
+
+
+def test_replacing_past_days_matches_a_rebuild(start_day):
+    random.seed(11)
+    days = {}
+    for i in range(120):
+        if random.random() < 0.1:
+            continue # A missed day breaks the streaks
+        day = start_day + datetime.timedelta(days=i)
+        days[day] = _random_record(day)
+    stats = HabitStats.from_records(days.values())
+
+    for _ in range(300):
+        day = start_day + datetime.timedelta(days=random.randrange(120))
+        record = _random_record(day)
+        old_record = days.get(day)
+        days[day] = record
+        if not stats.add_day(record):
+            stats.replace_day(record, old_record, days.get)
+        _assert_same(stats, HabitStats.from_records(days.values()))
+
+
+def test_snapshot_round_trip(tmp_path, start_day):
+    stats = HabitStats.from_records(make_record(start_day + datetime.timedelta(days=i)) for i in range(40))
+    path = str(tmp_path / "stats.json")
+    stats.save(path, (1, 2))
+    assert HabitStats.load(path, (1, 3)) is None # Doesn't match the log any more
+    _assert_same(HabitStats.load(path, (1, 2)), stats)
@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from habit_log_store import LogStore
+from habit_tracker_logic import HabitTrackerLogic
+
+FIRST_DAY = datetime.date(2025, 6, 1)
+
+
+def _write_log(log_dir, days=30):
+    """A plain log written the way the app writes it: one block per day, 6000 steps each."""
+    store = LogStore(str(log_dir / "habit_log.txt"))
+    store.write_days({FIRST_DAY + datetime.timedelta(days=i): [
+        "Sleep log: Bedtime -- 23:00 | Wake Time -- 07:00 | Sleep Quality -- Fine",
+        "Steps Done:6000 minimum!",
+        "Today's Points: 1/7 - Start again never give up!",
+    ] for i in range(days)})
+
+
+def _history_value(logic, day, column):
+    history = logic.get_history()
+    return int(history.column(column)[history.rows[day.toordinal()]])
+
+
+def test_past_day_edit_reaches_the_next_sessions_history(tmp_path):
+    _write_log(tmp_path)
+    HabitTrackerLogic(backend="text", log_dir=str(tmp_path)).get_history() # Saves the cache
+
+    editing = HabitTrackerLogic(backend="text", log_dir=str(tmp_path)) # A new session, cache not loaded yet
+    day = FIRST_DAY + datetime.timedelta(days=2)
+    assert editing.open_day(day)
+    editing.process_daily_steps_data(6500) # Same length as 6000: the block keeps its size
+    editing.process_sleep_data("22:10", "07:00", "Fine")
+    editing.get_final_points()
+    assert editing.write_final_log_to_file()
+
+    later = HabitTrackerLogic(backend="text", log_dir=str(tmp_path))
+    assert later.log_store.get_day(day).daily_steps == 6500
+    assert _history_value(later, day, "daily_steps") == 6500
+    assert _history_value(later, day, "bed_minutes") == 22 * 60 + 10
+
+
+def test_lines_appended_by_hand_update_the_cache_without_a_rebuild(tmp_path, monkeypatch):
+    _write_log(tmp_path)
+    HabitTrackerLogic(backend="text", log_dir=str(tmp_path)).get_history()
+    day = FIRST_DAY + datetime.timedelta(days=30)
+    with open(tmp_path / "habit_log.txt", "a", encoding="utf-8") as f:
+        f.write(f"\n=== {day.isoformat()} ===\nSteps Done:9000 minimum!\n")
+
+    from habit_summary_cache import SummaryCache
+    def no_rebuild(*args, **kwargs):
+        raise AssertionError("the whole log was parsed again")
+    monkeypatch.setattr(SummaryCache, "build", classmethod(no_rebuild))
+    logic = HabitTrackerLogic(backend="text", log_dir=str(tmp_path))
+    assert _history_value(logic, day, "daily_steps") == 9000
+    assert _history_value(logic, FIRST_DAY, "daily_steps") == 6000
+
+
+def test_same_size_hand_edit_of_an_old_day_rebuilds_the_cache(tmp_path):
+    _write_log(tmp_path)
+    HabitTrackerLogic(backend="text", log_dir=str(tmp_path)).get_history()
+    log_path = tmp_path / "habit_log.txt"
+    text = log_path.read_text(encoding="utf-8")
+    # The first day is far outside the tail blocks the cache checks first
+    log_path.write_text(text.replace("Steps Done:6000", "Steps Done:4321", 1), encoding="utf-8")
+
+    logic = HabitTrackerLogic(backend="text", log_dir=str(tmp_path))
+    assert _history_value(logic, FIRST_DAY, "daily_steps") == 4321
+    assert _history_value(logic, FIRST_DAY + datetime.timedelta(days=1), "daily_steps") == 6000
+
+
+def test_import_discards_the_cache(tmp_path):
+    from habit_import import import_days
+    from habit_summary_cache import cache_path
+    _write_log(tmp_path)
+    logic = HabitTrackerLogic(backend="text", log_dir=str(tmp_path))
+    logic.get_history()
+    assert (tmp_path / "habit_log.txt.summary.npz").exists()
+    row = {"date": FIRST_DAY.isoformat(), "bed_time": "23:00", "wake_time": "07:00", "sleep_quality": "Fine",
+           "morning_walk": "no", "healthy_breakfast": "no", "junk_food": "no", "pomodoro_done": "0", "daily_steps": "6500"}
+    assert import_days([row], logic.log_store) == (1, [])
+    assert not (tmp_path / "habit_log.txt.summary.npz").exists()
+    assert cache_path(logic.log_path) == str(tmp_path / "habit_log.txt.summary.npz")
@@ -0,0 +1,55 @@
+import datetime
+
+import habit_team
+from habit_log_parser import DayRecord, format_day_lines
+from habit_log_store import LogStore
+from habit_team import discover_logs, leaderboard, summarize_team
+
+DAY = datetime.date(2025, 4, 1)
+
+
+def _write_log(path, walks, points=5):
+    """A log of consecutive days; `walks` is the morning walk answer of each day."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    LogStore(str(path)).write_days({DAY + datetime.timedelta(days=i): format_day_lines(
+        DayRecord(DAY + datetime.timedelta(days=i), morning_walk=walk, points=points, max_points=7))
+        for i, walk in enumerate(walks)})
+
+
+def test_discovery(tmp_path):
+    _write_log(tmp_path / "alice.txt", [1])
+    _write_log(tmp_path / "bob" / "habit_log.txt", [1])
+    _write_log(tmp_path / "teams" / "north" / "cem" / "habit_log.txt", [1])
+    (tmp_path / "bob" / "notes.txt").write_text("Not a log", encoding="utf-8")
+    (tmp_path / "bob" / "habit_log_segments").mkdir()
+    (tmp_path / "bob" / "habit_log_segments" / "2025.txt").write_text("", encoding="utf-8")
+    (tmp_path / ".trash").mkdir()
+    (tmp_path / ".trash" / "habit_log.txt").write_text("", encoding="utf-8")
+    (tmp_path / "readme.md").write_text("", encoding="utf-8")
+
+    assert discover_logs(str(tmp_path)) == {
+        "alice": str(tmp_path / "alice.txt"),
+        "bob": str(tmp_path / "bob" / "habit_log.txt"),
+        "teams/north/cem": str(tmp_path / "teams" / "north" / "cem" / "habit_log.txt"),
+    }
+
+
+def test_summaries_are_cached_and_ranked(tmp_path, monkeypatch):
+    _write_log(tmp_path / "alice.txt", [1, 1, 1], points=6)
+    _write_log(tmp_path / "bob" / "habit_log.txt", [1, 0], points=3)
+    summaries, errors = summarize_team(str(tmp_path), workers=2)
+    assert errors == []
+    assert summaries["alice"]["days"] == 3 and summaries["alice"]["current_streaks"]["morning_walk"] == 3
+
+    _write_log(tmp_path / "bob" / "habit_log.txt", [1, 1, 1, 1], points=7)
+    parsed = []
+    summarize_log = habit_team.summarize_log
+    monkeypatch.setattr(habit_team, "summarize_log", lambda path: parsed.append(path) or summarize_log(path))
+    again, _ = summarize_team(str(tmp_path), workers=1)
+    assert parsed == [str(tmp_path / "bob" / "habit_log.txt")] # Alice's summary came from the cache
+    assert again["alice"] == summaries["alice"]
+    rows = leaderboard(again)
+    assert [row[0] for row in rows] == ["bob", "alice"]
+    assert rows[0][1:4] == (4, 7.0, 4)
+    stale = leaderboard(again, as_of_ordinal=(DAY + datetime.timedelta(days=10)).toordinal())
+    assert [row[3] for row in stale] == [0, 0] # Nobody logged for a week: no current streaks
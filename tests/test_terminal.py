@@ -0,0 +1,52 @@
+import datetime
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Terminal_Version"))
+
+from habit_log_store import LogStore  # noqa: E402
+from habit_scoring import SCORER  # noqa: E402
+from habit_tracker_terminal import HabitTracker, run_batch  # noqa: E402
+
+DAY = datetime.date(2025, 8, 4)
+# bed, wake, sleep quality, walk, breakfast, pomodoros, junk food, (what), steps
+GOOD_DAY = ["2330", "7", "Rested", "yes", "yes", "8", "no", "9000"]
+JUNK_DAY = ["1", "9:15", "Short", "no", "yes", "2", "yes", "Fries", "1500"]
+
+
+def _answers(values):
+    values = iter(values)
+    return lambda prompt="": next(values)
+
+
+def test_a_day_is_saved_once_and_replaced_when_logged_again(tmp_path):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    HabitTracker(DAY, ask=_answers(GOOD_DAY), log_store=store)
+    HabitTracker(DAY, ask=_answers(JUNK_DAY), log_store=store)
+
+    reopened = LogStore(store.log_path)
+    assert reopened.day_count() == 1
+    record = reopened.get_day(DAY)
+    assert (record.bed_time, record.wake_time, record.what_junk_food, record.daily_steps) == ("01:00", "09:15", "Fries", 1500)
+    assert record.points == SCORER.score(record)
+    assert record.max_points == SCORER.max_points
+
+
+def test_batch_saves_every_day_in_one_write(tmp_path):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    source = io.StringIO("\n".join([str(DAY)] + GOOD_DAY + ["", str(DAY + datetime.timedelta(days=1))] + JUNK_DAY) + "\n")
+    assert run_batch(source, store) == 2
+    assert store.get_day(DAY).morning_walk == 1
+    assert store.get_day(DAY + datetime.timedelta(days=1)).junk_food == 1
+
+
+def test_batch_with_a_bad_answer_saves_nothing(tmp_path):
+    store = LogStore(str(tmp_path / "habit_log.txt"))
+    bad_day = GOOD_DAY[:5] + ["many"] + GOOD_DAY[6:]
+    source = io.StringIO("\n".join([str(DAY)] + GOOD_DAY + [str(DAY + datetime.timedelta(days=1))] + bad_day))
+    with pytest.raises(ValueError, match="Line 16: Expected a number, got 'many'"):
+        run_batch(source, store)
+    assert not os.path.exists(store.log_path)
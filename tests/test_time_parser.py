@@ -0,0 +1,41 @@
+import itertools
+
+import pytest
+
+from habit_benchmark import legacy_get_clean_time
+from habit_time_parser import MISSING_MINUTES, clean_time, clean_times, time_to_minutes
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2311", "23:11"),
+    ("0705", "07:05"),
+    ("2400", None),
+    ("2360", None),
+    ("23", "23:00"),
+    ("24", None),
+    ("7", "07:00"),
+    ("7:5", "07:05"),
+    ("7.30", "07:30"),
+    (" 23:30 ", "23:30"),
+    ("12:60", None),
+    ("1:2:3", None),
+    ("23:", None),
+    ("", None),
+    ("   ", None),
+    ("abc", None),
+])
+def test_clean_time(text, expected):
+    assert clean_time(text) == expected
+
+
+def test_same_answers_as_the_old_strptime_loop():
+    pieces = ("", "0", "7", "07", "23", "24", "99", ":", ".", "5", "59", "60", " ", "a")
+    for parts in itertools.product(pieces, repeat=3):
+        text = "".join(parts)
+        assert clean_time(text) == legacy_get_clean_time(text), repr(text)
+
+
+def test_clean_times_and_minutes():
+    assert clean_times(["23", "bad", "23", "7:5"]) == ["23:00", None, "23:00", "07:05"]
+    assert time_to_minutes("07:05") == 425
+    assert time_to_minutes(None) == MISSING_MINUTES